@@ -0,0 +1,48 @@
+"""Wall time of ``import cubexpress`` and of first touching a public name.
+
+Run with ``python benchmarks/import_time.py [repeats]``. Each measurement is a
+fresh interpreter, so no module is cached between runs; the best of
+*repeats* is reported.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+SNIPPETS = {
+    "import cubexpress": "import cubexpress",
+    "+ cubexpress.lonlat2rt": "import cubexpress; cubexpress.lonlat2rt",
+    "+ cubexpress.get_cube": "import cubexpress; cubexpress.get_cube",
+}
+
+_TIMER = """
+import time
+t0 = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - t0
+import sys
+heavy = [m for m in ("ee", "rasterio", "pyproj", "pandas") if m in sys.modules]
+print(elapsed, ",".join(heavy) or "-")
+"""
+
+
+def _run(code: str) -> tuple[float, str]:
+    out = subprocess.run(
+        [sys.executable, "-c", _TIMER.format(code=code)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return float(out[0]), out[1]
+
+
+def main(repeats: int) -> None:
+    for label, code in SNIPPETS.items():
+        runs = [_run(code) for _ in range(repeats)]
+        best = min(t for t, _ in runs)
+        print(f"{label:<26} {best * 1e3:9.2f} ms   loaded: {runs[0][1]}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
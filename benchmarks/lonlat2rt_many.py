@@ -0,0 +1,41 @@
+"""Scalar ``lonlat2rt`` loop vs. the batched ``lonlat2rt_many``.
+
+Run with ``python benchmarks/lonlat2rt_many.py [n_points]``. The scalar loop
+is timed on a 10k-point sample and extrapolated.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from cubexpress import lonlat2rt, lonlat2rt_many
+
+SAMPLE = 10_000
+
+
+def main(n: int) -> None:
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-180, 180, n)
+    lat = rng.uniform(-80, 84, n)
+
+    k = min(n, SAMPLE)
+    t0 = time.perf_counter()
+    for x, y in zip(lon[:k], lat[:k]):
+        lonlat2rt(x, y, 256, 10)
+    scalar = (time.perf_counter() - t0) * n / k
+
+    t0 = time.perf_counter()
+    table = lonlat2rt_many(lon, lat, 256, 10)
+    batched = time.perf_counter() - t0
+
+    print(f"{n} points, {table['crs'].nunique()} UTM zones")
+    print(f"  lonlat2rt loop : {scalar:8.2f} s (extrapolated from {k})")
+    print(f"  lonlat2rt_many : {batched:8.2f} s   ({scalar / batched:.0f}x)")
+    print(f"  transform table: {table.memory_usage(deep=True).sum() / n:.0f} B/point")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
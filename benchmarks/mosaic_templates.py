@@ -0,0 +1,66 @@
+"""Mosaic expressions: per-day graph serialization vs. the template fast path.
+
+Run with ``python benchmarks/mosaic_templates.py [n_days]``. Building the
+graphs needs an initialised Earth Engine client (``ee.Initialize`` is called
+with the project in ``$EE_PROJECT`` if set); no request is sent to the server.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import ee
+import pandas as pd
+
+from cubexpress import table_to_requestset
+
+COLLECTION = "COPERNICUS/S2_HARMONIZED"
+TILES = ("T18LVN", "T18LVM", "T18LWN")
+
+
+def _table(n_days: int) -> pd.DataFrame:
+    rows = []
+    for day in pd.date_range("2017-01-01", periods=n_days, freq="D"):
+        stamp = day.strftime("%Y%m%dT153621")
+        for tile in TILES:
+            rows.append(
+                {
+                    "id": f"{stamp}_{stamp}_{tile}",
+                    "cs_cdf": 0.8,
+                    "date": day.strftime("%Y-%m-%d"),
+                }
+            )
+    table = pd.DataFrame(rows)
+    table.attrs.update(
+        lon=-76.5,
+        lat=-9.2,
+        edge_size=512,
+        scale=10,
+        bands=["B2", "B3", "B4"],
+        collection=COLLECTION,
+    )
+    return table
+
+
+def main(n_days: int) -> None:
+    ee.Initialize(project=os.environ.get("EE_PROJECT"))
+    table = _table(n_days)
+
+    timings = {}
+    frames = {}
+    for template in (False, True):
+        t0 = time.perf_counter()
+        requests = table_to_requestset(table, mosaic=True, template=template)
+        timings[template] = time.perf_counter() - t0
+        frames[template] = requests._dataframe["manifest"].tolist()
+
+    print(f"{n_days} days x {len(TILES)} images")
+    print(f"  graph per day : {timings[False]:8.3f} s")
+    print(f"  template      : {timings[True]:8.3f} s   ({timings[False] / timings[True]:.1f}x)")
+    print(f"  identical manifests: {frames[False] == frames[True]}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
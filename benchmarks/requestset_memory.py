@@ -0,0 +1,80 @@
+"""Memory per request of the model-list and columnar RequestSet backends.
+
+Run with ``python benchmarks/requestset_memory.py [n_requests]``. No Earth
+Engine access is needed: requests point at dummy asset ids.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+
+import pyarrow as pa
+
+from cubexpress import Request, RequestSet, lonlat2rt
+
+BANDS = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8", "B8A", "B9", "B10", "B11", "B12"]
+
+
+def _ids(n: int) -> list[str]:
+    return [f"2020-01-01_6q3ee_18LVN_{i:07d}_{i % 100}" for i in range(n)]
+
+
+def _measure(label: str, n: int, build) -> None:
+    gc.collect()
+    # Arrow buffers live outside the Python allocator; count them separately
+    arrow0 = pa.total_allocated_bytes()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow = pa.total_allocated_bytes() - arrow0
+    current, peak = current + arrow, peak + arrow
+    print(
+        f"{label:<32} {elapsed:8.2f} s   {current / n:9.0f} B/request held"
+        f"   {peak / n:9.0f} B/request peak"
+    )
+    del obj
+
+
+def main(n: int) -> None:
+    rt = lonlat2rt(-76.5, -9.2, 128, 10)
+    ids = _ids(n)
+    images = [f"COPERNICUS/S2_HARMONIZED/{i}" for i in ids]
+
+    print(f"{n} requests")
+
+    def models() -> RequestSet:
+        reqs = [
+            Request(id=i, raster_transform=rt, image=img, bands=BANDS)
+            for i, img in zip(ids, images)
+        ]
+        return RequestSet(requestset=reqs, validate="fast")
+
+    def columns() -> RequestSet:
+        return RequestSet.from_columns(
+            ids=ids,
+            crs=rt.crs,
+            width=rt.width,
+            height=rt.height,
+            geotransform=rt.geotransform,
+            images=images,
+            bands=BANDS,
+            validate="fast",
+        )
+
+    def columns_frame() -> tuple[RequestSet, object]:
+        requests = columns()
+        return requests, requests._dataframe
+
+    _measure("Request models + dataframe", n, models)
+    _measure("columnar", n, columns)
+    _measure("columnar + materialized frame", n, columns_frame)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
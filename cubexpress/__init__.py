@@ -1,25 +1,71 @@
-from cubexpress.conversion import lonlat2rt, geo2utm
-from cubexpress.geotyping import RasterTransform, Request, RequestSet
-from cubexpress.cloud_utils import s2_cloud_table
-from cubexpress.cube import get_cube
-from cubexpress.request import table_to_requestset
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING, Any
 
+# Public names and the module defining them. Modules are imported on first
+# attribute access, so ``import cubexpress`` does not pull in ee, rasterio,
+# pyproj or pandas.
+_EXPORTS = {
+    "async_get_cube": "cubexpress.aio",
+    "async_s2_cloud_table": "cubexpress.aio",
+    "lonlat2rt": "cubexpress.conversion",
+    "lonlat2rt_many": "cubexpress.conversion",
+    "recompress_geotiffs": "cubexpress.downloader",
+    "RasterTransform": "cubexpress.geotyping",
+    "Request": "cubexpress.geotyping",
+    "RequestSet": "cubexpress.geotyping",
+    "geo2utm": "cubexpress.conversion",
+    "geo2utm_many": "cubexpress.conversion",
+    "get_cube": "cubexpress.cube",
+    "s2_cloud_table": "cubexpress.cloud_utils",
+    "s2_cloud_tables": "cubexpress.cloud_utils",
+    "table_to_requestset": "cubexpress.request",
+    "ZarrStore": "cubexpress.zarrstore",
+}
+
+if TYPE_CHECKING:
+    from cubexpress.aio import async_get_cube, async_s2_cloud_table
+    from cubexpress.cloud_utils import s2_cloud_table, s2_cloud_tables
+    from cubexpress.conversion import geo2utm, geo2utm_many, lonlat2rt, lonlat2rt_many
+    from cubexpress.cube import get_cube
+    from cubexpress.downloader import recompress_geotiffs
+    from cubexpress.geotyping import RasterTransform, Request, RequestSet
+    from cubexpress.request import table_to_requestset
+    from cubexpress.zarrstore import ZarrStore
 
-# pyproj
-# Export the functions
 __all__ = [
+    "async_get_cube",
+    "async_s2_cloud_table",
     "lonlat2rt",
+    "lonlat2rt_many",
+    "recompress_geotiffs",
     "RasterTransform",
     "Request",
     "RequestSet",
     "geo2utm",
+    "geo2utm_many",
     "get_cube",
     "s2_cloud_table",
-    "table_to_requestset"
+    "s2_cloud_tables",
+    "table_to_requestset",
+    "ZarrStore",
 ]
 
-# Dynamic version import
-import importlib.metadata
 
-__version__ = importlib.metadata.version("cubexpress")
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    elif name == "__version__":
+        # Dynamic version import
+        from importlib import metadata
+
+        value = metadata.version("cubexpress")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_EXPORTS, "__version__"})
@@ -0,0 +1,396 @@
+"""Asyncio front-end for metadata queries and cube downloads.
+
+The coroutines mirror their blocking counterparts:
+
+* :func:`async_s2_cloud_table` – :func:`cubexpress.cloud_utils.s2_cloud_table`.
+* :func:`async_get_cube` – :func:`cubexpress.cube.get_cube`.
+
+Every network round-trip goes through a *transport* (see :class:`Transport`).
+The default :class:`EETransport` wraps the synchronous ``earthengine-api``
+calls and bounds how many of them run at once with a semaphore, so thousands
+of requests can be awaited while only *max_concurrency* worker threads talk
+to Earth Engine.  Any object implementing the protocol – e.g. a local fake
+backend in tests – can be passed instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import pathlib
+import tempfile
+import weakref
+from typing import Any, Dict, Protocol
+
+import ee
+import pandas as pd
+from rasterio.windows import Window
+
+from cubexpress.cache import (
+    CacheKey,
+    MetadataStore,
+    _cache_key,
+    _metadata_store,
+    _missing_intervals,
+    _snap,
+)
+from cubexpress.cloud_utils import (
+    _S2_COLLECTION,
+    _cloud_scores_adaptive,
+    _date_chunks,
+    _empty_scores,
+    _finish_table,
+)
+from cubexpress.downloader import (
+    _TileWriter,
+    _check_join,
+    _join_mode,
+    _join_tiles,
+    _read_pixels,
+    _request_pixels,
+    _save_pixels,
+    _write_vrt,
+)
+from cubexpress.geospatial import calculate_cell_size, quadsplit_manifest
+from cubexpress.request import table_to_requestset
+
+
+class Transport(Protocol):
+    """Backend answering the two kinds of request cubexpress issues."""
+
+    async def cloud_scores(
+        self, lon: float, lat: float, edge_size: int, start: str, end: str
+    ) -> pd.DataFrame:
+        """Return the per-image table (``id``, ``cs_cdf``, ``date``, ``null_flag``) for ``[start, end)``."""
+        ...
+
+    async def pixels(self, manifest: Dict[str, Any]) -> bytes:
+        """Return the GeoTIFF bytes of *manifest*."""
+        ...
+
+
+class EETransport:
+    """Earth Engine transport running the blocking client in worker threads.
+
+    Parameters
+    ----------
+    max_concurrency
+        Maximum number of Earth Engine calls in flight; default **8**.
+    """
+
+    def __init__(self, max_concurrency: int = 8) -> None:
+        self.max_concurrency = max_concurrency
+        # asyncio primitives are bound to one loop – keep a semaphore per loop
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    async def _call(self, fn, *args):
+        async with self._semaphore():
+            return await asyncio.to_thread(fn, *args)
+
+    async def cloud_scores(
+        self, lon: float, lat: float, edge_size: int, start: str, end: str
+    ) -> pd.DataFrame:
+        return await self._call(_cloud_scores_adaptive, lon, lat, edge_size, start, end)
+
+    async def pixels(self, manifest: Dict[str, Any]) -> bytes:
+        return await self._call(_request_pixels, manifest)
+
+
+_DEFAULT_TRANSPORT = EETransport()
+
+# Decoded tiles of one split request waiting for its writer thread
+_WRITER_QUEUE = 4
+
+# Polling interval while another process holds a key's file lock (seconds)
+_LOCK_POLL = 0.05
+
+# loop -> cache digest -> lock queueing same-key fills of that loop
+_KEY_LOCKS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, weakref.WeakValueDictionary[str, asyncio.Lock]
+] = weakref.WeakKeyDictionary()
+
+
+def _key_lock(digest: str) -> asyncio.Lock:
+    """Return the :class:`asyncio.Lock` of *digest* for the running loop."""
+    loop = asyncio.get_running_loop()
+    locks = _KEY_LOCKS.get(loop)
+    if locks is None:
+        locks = _KEY_LOCKS[loop] = weakref.WeakValueDictionary()
+    lock = locks.get(digest)
+    if lock is None:
+        lock = locks[digest] = asyncio.Lock()
+    return lock
+
+
+async def _acquire_file_lock(store: MetadataStore, key: CacheKey) -> contextlib.ExitStack:
+    """Take the cross-process fill lock of *key* without blocking a thread.
+
+    The lock is tried without waiting and retried every ``_LOCK_POLL``
+    seconds, so waiters never occupy the executor threads that the lock
+    holder needs to finish.
+    """
+    while True:
+        held = store.try_lock([key])
+        if held is not None:
+            return held
+        await asyncio.sleep(_LOCK_POLL)
+
+
+async def async_s2_cloud_table(
+    lon: float,
+    lat: float,
+    edge_size: int,
+    start: str,
+    end: str,
+    max_cscore: float = 1.0,
+    min_cscore: float = 0.0,
+    cache: bool = False,
+    verbose: bool = True,
+    snap: int | None = None,
+    chunk: str | int | None = "year",
+    transport: Transport | None = None,
+) -> pd.DataFrame:
+    """Awaitable version of :func:`cubexpress.cloud_utils.s2_cloud_table`.
+
+    Missing date intervals are split into *chunk* windows which are requested
+    concurrently through *transport*; cache reads and writes run in worker
+    threads so the event loop is never blocked on disk.
+
+    Parameters
+    ----------
+    lon, lat, edge_size, start, end, max_cscore, min_cscore, cache, verbose, snap
+        See :func:`cubexpress.cloud_utils.s2_cloud_table`.
+    chunk
+        Window size used to split each gap (``"year"``, a number of days or
+        *None* for a single request).
+    transport
+        Backend serving the queries; defaults to a shared :class:`EETransport`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Filtered cloud table with ``.attrs`` containing the call parameters.
+    """
+    transport = _DEFAULT_TRANSPORT if transport is None else transport
+    key = _cache_key(lon, lat, edge_size, 10, _S2_COLLECTION, snap)
+    q_lon, q_lat = (lon, lat) if snap is None else _snap(lon, lat, snap)[:2]
+    # the store creates its folder and index: leave it alone when caching is off
+    store = _metadata_store() if cache else None
+
+    async def _gaps() -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+        if not cache:
+            return [], _missing_intervals([], start, end)
+        covered = (await asyncio.to_thread(store.coverage, [key])).get(key.digest, [])
+        return covered, _missing_intervals(covered, start, end)
+
+    # ─── 1. Look up which dates the cache already covers ───────────────────
+    covered, gaps = await _gaps()
+
+    # ─── 2. Fetch never-queried intervals, one caller per key at a time ────
+    df_new = None
+    if gaps:
+        async with contextlib.AsyncExitStack() as stack:
+            if cache:
+                # same-key callers of this loop queue here without holding a
+                # thread; only one of them then waits for the file lock
+                await stack.enter_async_context(_key_lock(key.digest))
+                stack.push(await _acquire_file_lock(store, key))
+                # a concurrent caller may have filled the gaps while we waited
+                covered, gaps = await _gaps()
+            if gaps:
+                if verbose:
+                    msg = "Fetching missing dates…" if covered else (
+                        "Generating metadata (no cache found)…" if cache else "Generating metadata…"
+                    )
+                    print("⏳", msg)
+                windows = [w for a, b in gaps for w in _date_chunks(a, b, chunk)]
+                parts = await asyncio.gather(
+                    *(transport.cloud_scores(q_lon, q_lat, edge_size, a, b) for a, b in windows)
+                )
+                df_new = pd.concat(parts, ignore_index=True)
+                if cache:
+                    await asyncio.to_thread(store.append, [(key, df_new, gaps)])
+
+    if cache:
+        await asyncio.to_thread(store.index.touch, [key.digest], df_new is None)
+        if verbose:
+            print("✅  Served entirely from metadata." if df_new is None else "📂  Loading cached metadata …")
+        df_full = (await asyncio.to_thread(store.read, [key], start, end)).drop(columns="key")
+    elif df_new is None:
+        # empty window (start >= end): nothing was queried
+        df_full = _empty_scores()
+    else:
+        df_full = df_new.sort_values("date", kind="mergesort").reset_index(drop=True)
+
+    # ─── 3. Filter by cloud cover and requested date window ────────────────
+    return _finish_table(df_full, lon, lat, edge_size, start, end, min_cscore, max_cscore)
+
+
+async def _async_tiles(
+    tiles: list[Dict[str, Any]],
+    folder: pathlib.Path,
+    transport: Transport,
+    recompress: bool,
+    reuse: bool = False,
+) -> list[int]:
+    """Awaitable version of :func:`cubexpress.downloader._download_tiles`."""
+    folder.mkdir(parents=True, exist_ok=True)
+
+    async def _tile(index: int, tile: Dict[str, Any]) -> None:
+        path = folder / f"{index:06d}.tif"
+        if reuse and path.exists():
+            return
+        data = await transport.pixels(tile)
+        await asyncio.to_thread(_save_pixels, data, path, recompress)
+
+    results = await asyncio.gather(
+        *(_tile(i, t) for i, t in enumerate(tiles)), return_exceptions=True
+    )
+    done = []
+    for index, exc in enumerate(results):
+        if isinstance(exc, BaseException):
+            print(f"Error en una de las descargas: {exc}")  # noqa: T201
+        else:
+            done.append(index)
+    return done
+
+
+async def _async_assemble(
+    tiles: list[Dict[str, Any]],
+    windows: list[Window],
+    outname: pathlib.Path,
+    transport: Transport,
+) -> pathlib.Path:
+    """Awaitable version of :func:`cubexpress.downloader._assemble_tiles`.
+
+    Tiles are fetched as the transport allows and written into their windows
+    by a :class:`~cubexpress.downloader._TileWriter` thread.
+    """
+    writer = _TileWriter(tiles, windows, outname, _WRITER_QUEUE)
+
+    async def _tile(tile: Dict[str, Any], window: Window) -> None:
+        data = await asyncio.to_thread(_read_pixels, await transport.pixels(tile))
+        await asyncio.to_thread(writer.put, window, data)
+
+    try:
+        results = await asyncio.gather(
+            *(_tile(t, w) for t, w in zip(tiles, windows)), return_exceptions=True
+        )
+    except BaseException:
+        writer.close(publish=False)
+        raise
+    for exc in results:
+        if isinstance(exc, BaseException):
+            print(f"Error en una de las descargas: {exc}")  # noqa: T201
+            writer.fail(exc)
+    return await asyncio.to_thread(writer.close)
+
+
+async def _async_geotiff(
+    manifest: Dict[str, Any],
+    full_outname: pathlib.Path,
+    join: bool | str,
+    transport: Transport,
+    verbose: bool,
+    recompress: bool = True,
+) -> None:
+    """Awaitable version of :func:`cubexpress.cube.get_geotiff`."""
+    try:
+        data = await transport.pixels(manifest)
+        await asyncio.to_thread(_save_pixels, data, full_outname, recompress)
+    except ee.ee_exception.EEException as err:
+        size = manifest["grid"]["dimensions"]["width"]  # square images assumed
+        cell_w, cell_h, power = calculate_cell_size(str(err), size)
+        tiled = quadsplit_manifest(manifest, cell_w, cell_h, power)
+
+        mode, windows = _join_mode(join, tiled)
+        if mode == "window":
+            await _async_assemble(tiled, windows, full_outname, transport)
+        elif mode == "vrt":
+            folder = full_outname.parent / full_outname.stem
+            done = await _async_tiles(tiled, folder, transport, recompress, reuse=True)
+            await asyncio.to_thread(_write_vrt, tiled, windows, done, full_outname)
+        elif mode:
+            with tempfile.TemporaryDirectory(prefix="s2tmp_") as tmp_dir:
+                folder = pathlib.Path(tmp_dir) / full_outname.stem
+                await _async_tiles(tiled, folder, transport, recompress)
+                await asyncio.to_thread(_join_tiles, folder, full_outname)
+        else:
+            folder = full_outname.parent / full_outname.stem
+            await _async_tiles(tiled, folder, transport, recompress)
+            await asyncio.to_thread(_join_tiles, folder, full_outname)
+
+    if verbose:
+        print(f"Downloaded {full_outname}")
+
+
+async def async_get_cube(
+    table: pd.DataFrame,
+    outfolder: pathlib.Path | str,
+    mosaic: bool = True,
+    join: bool | str = True,
+    verbose: bool = True,
+    cache: bool = True,
+    transport: Transport | None = None,
+    recompress: bool = True,
+) -> pd.DataFrame:
+    """Awaitable version of :func:`cubexpress.cube.get_cube`.
+
+    All requests (and the tiles of requests too large for a single call) are
+    awaited together; *transport* decides how many actually run at once.
+
+    Parameters
+    ----------
+    table, outfolder, mosaic, join, verbose, cache, recompress
+        See :func:`cubexpress.cube.get_cube`.
+    transport
+        Backend serving the pixels; defaults to a shared :class:`EETransport`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``full_outname``, ``cs_cdf`` and ``date`` of every request.
+    """
+    _check_join(join)
+    transport = _DEFAULT_TRANSPORT if transport is None else transport
+    requests = await asyncio.to_thread(table_to_requestset, table=table, mosaic=mosaic)
+    outfolder = pathlib.Path(outfolder).expanduser().resolve()
+
+    table = requests.to_frame(manifests=False)
+
+    jobs = []
+    for index, request_id in enumerate(table["id"]):
+        outname = outfolder / f"{request_id}.tif"
+        if cache and (outname.exists() or outname.with_suffix(".vrt").exists()):
+            continue
+        outname.parent.mkdir(parents=True, exist_ok=True)
+        jobs.append(
+            _async_geotiff(
+                requests.manifest(index), outname, join, transport, verbose, recompress
+            )
+        )
+
+    for exc in await asyncio.gather(*jobs, return_exceptions=True):
+        if isinstance(exc, BaseException):
+            print(f"Download error: {exc}")
+
+    download_df = table[["outname", "cs_cdf", "date"]].copy()
+    download_df["outname"] = outfolder / table["outname"]
+    if join == "vrt":
+        # split requests were indexed by a VRT instead of a merged GeoTIFF
+        download_df["outname"] = [
+            vrt if (vrt := path.with_suffix(".vrt")).exists() else path
+            for path in download_df["outname"]
+        ]
+    download_df.rename(columns={"outname": "full_outname"}, inplace=True)
+
+    return download_df
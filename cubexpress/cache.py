@@ -1,18 +1,127 @@
-"""Simple file-based cache helpers for cloud_table results."""
+"""Partitioned, append-only metadata store for cloud_table results.
+
+Rows of every cached query live in a single Parquet dataset, partitioned by
+collection and geohash prefix::
+
+    $CUBEXPRESS_CACHE/
+        metadata/collection=<name>/geohash=<prefix>/part-<uuid>.parquet
+        coverage/collection=<name>/geohash=<prefix>/part-<uuid>.parquet
+
+``metadata`` holds the cloud-table rows tagged with their cache ``key``;
+``coverage`` holds the half-open date intervals ``[start, end)`` that have
+already been queried for each key, whether they returned scenes or not.
+
+Writes only ever add new fragments; reads open a single partition and push
+the key and date predicates down to Parquet. Partitions that accumulate too
+many fragments are compacted in a background thread.
+
+Fragments are written to a temporary file and atomically renamed into place.
+Fills of the same key are serialised across threads and processes with
+advisory file locks (see :func:`_key_locks`), so concurrent callers wait for
+the first one and then read its result instead of repeating the EE query.
+
+Recently used entries are also memoised in memory (see ``_MEMO_SIZE``), so
+repeated lookups within one process skip the Parquet decode; they are
+invalidated as soon as the fragments of their partition change on disk.
+
+A small SQLite index (``index.sqlite``) tracks every key with its query
+parameters, approximate size, last access and hit count, plus global
+hit/miss/byte counters. It drives the size-bounded LRU/TTL eviction; see
+:mod:`cubexpress.cache_manager` for the user-facing API.
+"""
 
 from __future__ import annotations
 
+import atexit
+import collections
+import contextlib
 import hashlib
 import json
 import os
 import pathlib
-from typing import Final
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Final, Iterable, Iterator, NamedTuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pygeohash as pgh
 
-# Folder where per-location parquet files are stored.
+try:
+    import fcntl
+except ImportError:  # pragma: no cover – Windows
+    fcntl = None
+    import msvcrt
+
+# Folder where the metadata dataset is stored.
 _CACHE_DIR: Final[pathlib.Path] = pathlib.Path(
     os.getenv("CUBEXPRESS_CACHE", "~/.cubexpress_cache")
 ).expanduser()
-_CACHE_DIR.mkdir(exist_ok=True)
+
+# Geohash precision of the spatial partitions (≈ 156 km cells).
+_PARTITION_PRECISION: Final[int] = 3
+
+# Fragments per partition that trigger a background compaction.
+_COMPACT_THRESHOLD: Final[int] = 16
+
+# Number of lock files keys are striped over (first hex digits of the digest).
+_LOCK_STRIPE_CHARS: Final[int] = 3
+
+# Decoded entries kept in memory per process (0 disables the memo tier).
+_MEMO_SIZE: Final[int] = int(os.getenv("CUBEXPRESS_MEMO_SIZE", 256))
+
+# Size budget (bytes) and optional time-to-live (seconds) of cache entries.
+_MAX_BYTES: Final[int] = int(os.getenv("CUBEXPRESS_CACHE_MAX_BYTES", 5 * 1024**3))
+_TTL: Final[float | None] = (
+    float(os.environ["CUBEXPRESS_CACHE_TTL"]) if "CUBEXPRESS_CACHE_TTL" in os.environ else None
+)
+
+# Seconds access times and hit counters may stay buffered in memory.
+_FLUSH_INTERVAL: Final[float] = 30.0
+
+_ROW_SCHEMA: Final[pa.Schema] = pa.schema(
+    [
+        ("key", pa.string()),
+        ("id", pa.string()),
+        ("cs_cdf", pa.float64()),
+        ("date", pa.string()),
+        ("null_flag", pa.int64()),
+    ]
+)
+
+_COVERAGE_SCHEMA: Final[pa.Schema] = pa.schema(
+    [
+        ("key", pa.string()),
+        ("start", pa.string()),
+        ("end", pa.string()),
+    ]
+)
+
+
+class CacheKey(NamedTuple):
+    """Identity of one cached query and the partition it belongs to."""
+
+    digest: str
+    geohash: str
+    collection: str
+    params: str = "[]"
+
+    @property
+    def partition(self) -> pathlib.Path:
+        """Relative hive-style partition folder of this key."""
+        name = self.collection.replace("/", "_")
+        return pathlib.Path(f"collection={name}") / f"geohash={self.geohash}"
+
+
+def _snap(lon: float, lat: float, precision: int) -> tuple[float, float, str]:
+    """Return the centre (lon, lat) and code of the geohash cell of a point."""
+    cell = pgh.encode(lat, lon, precision=precision)
+    lat_c, lon_c = pgh.decode_exactly(cell)[:2]
+    return float(lon_c), float(lat_c), cell
 
 
 def _cache_key(
@@ -21,12 +130,13 @@ def _cache_key(
     edge_size: int,
     scale: int,
     collection: str,
-) -> pathlib.Path:
-    """Return deterministic parquet path for the given query parameters.
+    snap: int | None = None,
+) -> CacheKey:
+    """Return the deterministic cache key for the given query parameters.
 
     A 128-bit MD5 hash of the rounded coordinates, edge size, scale and
-    collection is used as file name to avoid overly long paths and ensure
-    uniqueness.
+    collection identifies the entry; the geohash prefix of the location and
+    the collection select its partition.
 
     Parameters
     ----------
@@ -38,13 +148,709 @@ def _cache_key(
         Pixel size in metres.
     collection
         EE collection name (e.g. ``"COPERNICUS/S2_HARMONIZED"``).
+    snap
+        Optional geohash precision. When given, the coordinates are replaced
+        by the geohash cell they fall in, so every point of the cell shares
+        one entry (precision 7 ≈ 150 m, 6 ≈ 1.2 km).
 
     Returns
     -------
-    pathlib.Path
-        Absolute path ending in ``.parquet`` under ``_CACHE_DIR``.
+    CacheKey
+        Digest, geohash prefix, collection and JSON parameters of the entry.
     """
-    lon_r, lat_r = round(lon, 4), round(lat, 4)
-    raw = json.dumps([lon_r, lat_r, edge_size, scale, collection]).encode()
+    if snap is None:
+        lon_r, lat_r = round(lon, 4), round(lat, 4)
+        raw = json.dumps([lon_r, lat_r, edge_size, scale, collection]).encode()
+        geohash = pgh.encode(lat_r, lon_r, precision=_PARTITION_PRECISION)
+    else:
+        cell = pgh.encode(lat, lon, precision=snap)
+        raw = json.dumps(["geohash", cell, edge_size, scale, collection]).encode()
+        geohash = cell[:_PARTITION_PRECISION]
     digest = hashlib.md5(raw).hexdigest()  # noqa: S324 – non-cryptographic OK
-    return _CACHE_DIR / f"{digest}.parquet"
+    return CacheKey(digest, geohash, collection, raw.decode())
+
+
+def _merge_intervals(intervals: Iterable[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Sort half-open ISO date intervals and fuse overlapping/adjacent ones."""
+    merged: list[tuple[str, str]] = []
+    for a, b in sorted(tuple(i) for i in intervals):
+        if a >= b:
+            continue
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(b, merged[-1][1]))
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def _missing_intervals(
+    covered: Iterable[tuple[str, str]],
+    start: str,
+    end: str,
+) -> list[tuple[str, str]]:
+    """Return the sub-intervals of [*start*, *end*) not present in *covered*.
+
+    ISO-8601 dates compare correctly as strings, so no parsing is needed.
+    """
+    gaps: list[tuple[str, str]] = []
+    cursor = start
+    for a, b in _merge_intervals(covered):
+        if b <= cursor:
+            continue
+        if a >= end:
+            break
+        if a > cursor:
+            gaps.append((cursor, a))
+        cursor = max(cursor, b)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+@contextlib.contextmanager
+def _file_lock(path: pathlib.Path, blocking: bool = True) -> Iterator[None]:
+    """Hold an exclusive advisory lock on *path* for the duration of the block.
+
+    The lock is per open file, so it serialises threads of one process as
+    well as separate processes sharing the cache folder. With
+    ``blocking=False``, :class:`BlockingIOError` is raised instead of
+    waiting when the lock is held elsewhere.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as fh:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except OSError as err:
+                raise BlockingIOError(f"{path} is locked") from err
+        else:  # pragma: no cover – Windows
+            # LK_LOCK gives up after ~10 s, so poll with a capped backoff
+            delay = 0.005
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError as err:
+                    if not blocking:
+                        raise BlockingIOError(f"{path} is locked") from err
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover – Windows
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def _key_locks(keys: Iterable[CacheKey], root: pathlib.Path | None = None) -> Iterator[None]:
+    """Lock every key of *keys* until the block exits.
+
+    Keys are striped over a fixed set of lock files and acquired in sorted
+    order, so overlapping batches cannot deadlock.
+    """
+    root = _CACHE_DIR if root is None else root
+    stripes = sorted({key.digest[:_LOCK_STRIPE_CHARS] for key in keys})
+    with contextlib.ExitStack() as stack:
+        for stripe in stripes:
+            stack.enter_context(_file_lock(root / "locks" / f"key-{stripe}.lock"))
+        yield
+
+
+def _try_key_locks(
+    keys: Iterable[CacheKey], root: pathlib.Path | None = None
+) -> contextlib.ExitStack | None:
+    """Non-blocking :func:`_key_locks`.
+
+    Returns an :class:`~contextlib.ExitStack` holding every lock of *keys*
+    (close it to release them), or *None* without holding anything when one
+    of them is busy.
+    """
+    root = _CACHE_DIR if root is None else root
+    stripes = sorted({key.digest[:_LOCK_STRIPE_CHARS] for key in keys})
+    stack = contextlib.ExitStack()
+    try:
+        for stripe in stripes:
+            stack.enter_context(_file_lock(root / "locks" / f"key-{stripe}.lock", blocking=False))
+    except BlockingIOError:
+        stack.close()
+        return None
+    return stack
+
+
+class CacheIndex:
+    """SQLite index of cache entries and global counters.
+
+    Every operation opens its own short-lived connection, so the index can
+    be shared by threads and processes. Lookups (:meth:`touch`) are only
+    buffered in memory; they are written on the next write or read of the
+    index, every ``_FLUSH_INTERVAL`` seconds and at interpreter exit, so a
+    cache hit does not touch SQLite.
+
+    Parameters
+    ----------
+    path
+        Location of the SQLite database file.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = pathlib.Path(path)
+        with self._connect() as con:
+            con.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    params TEXT,
+                    partition TEXT,
+                    bytes INTEGER DEFAULT 0,
+                    rows INTEGER DEFAULT 0,
+                    created REAL,
+                    last_access REAL,
+                    hits INTEGER DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER DEFAULT 0
+                );
+                """
+            )
+        # digest -> [last access, hits] and counters not yet written
+        self._pending: dict[str, list[float | int]] = {}
+        self._pending_counters: collections.Counter[str] = collections.Counter()
+        self._pending_lock = threading.Lock()
+        self._flushed = time.time()
+        atexit.register(self.flush)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection that commits on success and is always closed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=30)
+        # counters and access times are advisory; skip the per-commit fsync
+        con.execute("PRAGMA synchronous = OFF")
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def bump(self, **counters: int) -> None:
+        """Increment the named global counters."""
+        with self._connect() as con:
+            con.executemany(
+                "INSERT INTO counters(name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [(name, int(value)) for name, value in counters.items() if value],
+            )
+
+    def touch(self, digests: Iterable[str], hit: bool) -> None:
+        """Record a lookup of *digests*; *hit* means no EE query was needed.
+
+        The lookup is buffered; see :meth:`flush`.
+        """
+        now = time.time()
+        with self._pending_lock:
+            count = 0
+            for digest in digests:
+                entry = self._pending.setdefault(digest, [now, 0])
+                entry[0] = now
+                entry[1] += int(hit)
+                count += 1
+            self._pending_counters["hits" if hit else "misses"] += count
+            due = now - self._flushed > _FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered lookups to the index."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            counters, self._pending_counters = self._pending_counters, collections.Counter()
+            self._flushed = time.time()
+        if pending:
+            with self._connect() as con:
+                con.executemany(
+                    "UPDATE entries SET last_access = MAX(last_access, ?), hits = hits + ? "
+                    "WHERE key = ?",
+                    [(when, hits, digest) for digest, (when, hits) in pending.items()],
+                )
+        if counters:
+            self.bump(**counters)
+
+    def record_write(self, sizes: dict[CacheKey, tuple[int, int]]) -> None:
+        """Add ``(bytes, rows)`` written for every key, creating missing entries."""
+        self.flush()
+        now = time.time()
+        with self._connect() as con:
+            con.executemany(
+                "INSERT INTO entries(key, params, partition, bytes, rows, created, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0) "
+                "ON CONFLICT(key) DO UPDATE SET bytes = bytes + excluded.bytes, "
+                "rows = rows + excluded.rows, last_access = excluded.last_access",
+                [
+                    (key.digest, key.params, key.partition.as_posix(), nbytes, nrows, now, now)
+                    for key, (nbytes, nrows) in sizes.items()
+                ],
+            )
+        self.bump(bytes_written=sum(nbytes for nbytes, _ in sizes.values()))
+
+    def set_sizes(self, sizes: dict[str, tuple[int, int]]) -> None:
+        """Overwrite ``(bytes, rows)`` of existing entries, e.g. after a compaction."""
+        with self._connect() as con:
+            con.executemany(
+                "UPDATE entries SET bytes = ?, rows = ? WHERE key = ?",
+                [(nbytes, nrows, digest) for digest, (nbytes, nrows) in sizes.items()],
+            )
+
+    def expire(self, before: float) -> list[tuple[str, str]]:
+        """Drop entries last accessed before *before* (epoch seconds).
+
+        Returns the ``(key, partition)`` of every dropped entry.
+        """
+        self.flush()
+        with self._connect() as con:
+            # select and delete in one write transaction so no touch slips in
+            con.execute("BEGIN IMMEDIATE")
+            expired = con.execute(
+                "SELECT key, partition FROM entries WHERE last_access < ?", (before,)
+            ).fetchall()
+            if expired:
+                con.execute("DELETE FROM entries WHERE last_access < ?", (before,))
+        if expired:
+            self.bump(evictions=len(expired))
+        return expired
+
+    def remove(self, digests: Iterable[str]) -> None:
+        """Drop *digests* from the index."""
+        digests = list(digests)
+        with self._connect() as con:
+            con.executemany("DELETE FROM entries WHERE key = ?", [(d,) for d in digests])
+        self.bump(evictions=len(digests))
+
+    def entries(self) -> pd.DataFrame:
+        """Return all entries, least recently used first."""
+        self.flush()
+        with self._connect() as con:
+            return pd.read_sql_query("SELECT * FROM entries ORDER BY last_access", con)
+
+    def counters(self) -> dict[str, int]:
+        """Return the global counters."""
+        self.flush()
+        with self._connect() as con:
+            return dict(con.execute("SELECT name, value FROM counters").fetchall())
+
+    def total_bytes(self) -> int:
+        """Return the summed size of all indexed entries."""
+        self.flush()
+        with self._connect() as con:
+            return int(con.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0])
+
+
+class MetadataStore:
+    """Append-only Parquet dataset holding cached cloud-table rows.
+
+    Parameters
+    ----------
+    root
+        Base folder; ``metadata`` and ``coverage`` datasets live below it.
+    """
+
+    def __init__(self, root: pathlib.Path) -> None:
+        self.root = pathlib.Path(root)
+        self.index = CacheIndex(self.root / "index.sqlite")
+        self._compacting: set[pathlib.Path] = set()
+        self._lock = threading.Lock()
+        # digest -> (partition stamp, covered intervals, rows)
+        self._memo: collections.OrderedDict[
+            str, tuple[tuple[str, ...], list[tuple[str, str]], pd.DataFrame]
+        ] = collections.OrderedDict()
+
+    def lock(self, keys: Iterable[CacheKey]) -> contextlib.AbstractContextManager[None]:
+        """Context manager holding the fill locks of *keys* (see :func:`_key_locks`)."""
+        return _key_locks(keys, self.root)
+
+    def try_lock(self, keys: Iterable[CacheKey]) -> contextlib.ExitStack | None:
+        """Take the fill locks of *keys* without waiting (see :func:`_try_key_locks`)."""
+        return _try_key_locks(keys, self.root)
+
+    # ─── reads ────────────────────────────────────────────────────────────
+    def _scan(
+        self,
+        dataset: str,
+        keys: Iterable[CacheKey],
+        schema: pa.Schema,
+        filter_: ds.Expression | None = None,
+    ) -> pa.Table:
+        """Scan the partitions of *keys* in *dataset* with pushed-down filters."""
+        by_partition: dict[pathlib.Path, set[str]] = {}
+        for key in keys:
+            by_partition.setdefault(key.partition, set()).add(key.digest)
+
+        tables = [schema.empty_table()]
+        for partition, digests in by_partition.items():
+            expr = ds.field("key").isin(sorted(digests))
+            if filter_ is not None:
+                expr = expr & filter_
+            # A concurrent compaction may remove fragments while we list them.
+            for attempt in range(3):
+                files = sorted(str(p) for p in (self.root / dataset / partition).glob("*.parquet"))
+                if not files:
+                    break
+                try:
+                    tables.append(
+                        ds.dataset(files, schema=schema, format="parquet").to_table(filter=expr)
+                    )
+                    break
+                except FileNotFoundError:
+                    if attempt == 2:
+                        raise
+        return pa.concat_tables(tables)
+
+    def _stamp(self, partition: pathlib.Path) -> tuple[str, ...]:
+        """Fragment names of *partition*; every write or compaction changes it."""
+        names: list[str] = []
+        for dataset in ("metadata", "coverage"):
+            try:
+                with os.scandir(self.root / dataset / partition) as it:
+                    names.extend(e.name for e in it if e.name.endswith(".parquet"))
+            except FileNotFoundError:
+                continue
+        return tuple(sorted(names))
+
+    def _memoised(
+        self, keys: list[CacheKey]
+    ) -> tuple[dict[str, tuple[list[tuple[str, str]], pd.DataFrame]], list[CacheKey]]:
+        """Return the in-memory entries of *keys* and the keys left to scan.
+
+        Stale or missing entries are loaded (all dates) and memoised when they
+        fit in the memo; larger batches are left to the caller, which then
+        scans with predicate pushdown instead.
+        """
+        stamps = {p: self._stamp(p) for p in {key.partition for key in keys}}
+        found: dict[str, tuple[list[tuple[str, str]], pd.DataFrame]] = {}
+        missed: list[CacheKey] = []
+        with self._lock:
+            for key in keys:
+                entry = self._memo.get(key.digest)
+                if entry is not None and entry[0] == stamps[key.partition]:
+                    self._memo.move_to_end(key.digest)
+                    found[key.digest] = entry[1:]
+                else:
+                    missed.append(key)
+
+        if not missed or len(missed) > _MEMO_SIZE:
+            return found, missed
+
+        covered = self._scan("coverage", missed, _COVERAGE_SCHEMA).to_pandas()
+        table = self._scan("metadata", missed, _ROW_SCHEMA)
+        self.index.bump(bytes_read=table.nbytes)
+        rows = (
+            table.to_pandas()
+            .drop_duplicates(["key", "id"], keep="last")
+            .sort_values(["key", "date"], kind="mergesort")
+        )
+        covered_by_key = dict(tuple(covered.groupby("key", sort=False)))
+        rows_by_key = dict(tuple(rows.groupby("key", sort=False)))
+        empty = rows.iloc[0:0]
+
+        with self._lock:
+            for key in missed:
+                cov = covered_by_key.get(key.digest)
+                intervals = [] if cov is None else _merge_intervals(zip(cov["start"], cov["end"]))
+                found[key.digest] = (intervals, rows_by_key.get(key.digest, empty))
+                self._memo[key.digest] = (stamps[key.partition], *found[key.digest])
+                self._memo.move_to_end(key.digest)
+            while len(self._memo) > _MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return found, []
+
+    def coverage(self, keys: Iterable[CacheKey]) -> dict[str, list[tuple[str, str]]]:
+        """Return the merged queried intervals of every key, by digest."""
+        found, missed = self._memoised(list(keys))
+        result = {digest: intervals for digest, (intervals, _) in found.items() if intervals}
+        if missed:
+            df = self._scan("coverage", missed, _COVERAGE_SCHEMA).to_pandas()
+            result.update(
+                (digest, _merge_intervals(zip(group["start"], group["end"])))
+                for digest, group in df.groupby("key", sort=False)
+            )
+        return result
+
+    def read(
+        self,
+        keys: Iterable[CacheKey],
+        start: str | None = None,
+        end: str | None = None,
+    ) -> pd.DataFrame:
+        """Return cached rows of *keys* with ``start <= date <= end``.
+
+        The returned frame keeps the ``key`` column so rows of several keys
+        can be told apart; duplicated ``(key, id)`` pairs are dropped.
+        """
+        found, missed = self._memoised(list(keys))
+        frames = [rows for _, rows in found.values()]
+
+        if missed:
+            filter_ = None
+            if start is not None:
+                filter_ = ds.field("date") >= start
+            if end is not None:
+                upper = ds.field("date") <= end
+                filter_ = upper if filter_ is None else filter_ & upper
+
+            table = self._scan("metadata", missed, _ROW_SCHEMA, filter_)
+            self.index.bump(bytes_read=table.nbytes)
+            frames.append(table.to_pandas())
+
+        if len(frames) == 1 and not missed:
+            # a single memoised entry: skip the concat copy
+            df = frames[0]
+        else:
+            df = pd.concat([_ROW_SCHEMA.empty_table().to_pandas(), *frames], ignore_index=True)
+        if start is not None or end is not None:
+            dates = df["date"].to_numpy(dtype=object)
+            df = df[(dates >= (start or "")) & (dates <= (end or "\uffff"))]
+        if missed:
+            # memoised entries are already deduplicated and sorted
+            df = df.drop_duplicates(["key", "id"], keep="last").sort_values(["key", "date"], kind="mergesort")
+        return df.reset_index(drop=True)
+
+    # ─── writes ───────────────────────────────────────────────────────────
+    def _write_fragment(self, folder: pathlib.Path, table: pa.Table) -> int:
+        """Write *table* as a new fragment of *folder* (temp file + rename).
+
+        Returns the size of the fragment in bytes.
+        """
+        folder.mkdir(parents=True, exist_ok=True)
+        name = f"part-{uuid.uuid4().hex}"
+        tmp = folder / f".{name}.tmp"
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, folder / f"{name}.parquet")
+        return (folder / f"{name}.parquet").stat().st_size
+
+    @staticmethod
+    def _share(sizes: dict[CacheKey, list[int]], owners: list[CacheKey], nbytes: int, count_rows: bool) -> None:
+        """Split *nbytes* of a fragment across the keys owning each of its rows."""
+        for key in owners:
+            entry = sizes[key]
+            entry[0] += nbytes // len(owners)
+            entry[1] += int(count_rows)
+
+    def append(
+        self,
+        entries: Iterable[tuple[CacheKey, pd.DataFrame, Iterable[tuple[str, str]]]],
+    ) -> None:
+        """Append new rows and newly queried intervals.
+
+        Parameters
+        ----------
+        entries
+            ``(key, rows, intervals)`` triples. *rows* must only contain rows
+            that are not cached yet; *intervals* are the date windows that
+            were queried to obtain them. One fragment is written per touched
+            partition, never rewriting existing data.
+        """
+        rows_by_part: dict[pathlib.Path, list[pd.DataFrame]] = {}
+        cover_by_part: dict[pathlib.Path, list[tuple[str, str, str]]] = {}
+        for key, rows, intervals in entries:
+            if not rows.empty:
+                rows_by_part.setdefault(key.partition, []).append(
+                    rows.assign(key=key.digest)
+                )
+            cover_by_part.setdefault(key.partition, []).extend(
+                (key.digest, a, b) for a, b in intervals
+            )
+
+        keys_by_digest = {key.digest: key for key, _, _ in entries}
+        for partition in sorted(set(rows_by_part) | set(cover_by_part)):
+            sizes = {key: [0, 0] for key in keys_by_digest.values() if key.partition == partition}
+            # a compaction rebasing the indexed sizes must see fragment and
+            # index update together
+            with self._partition_lock(partition):
+                if partition in rows_by_part:
+                    df = pd.concat(rows_by_part[partition], ignore_index=True)[_ROW_SCHEMA.names]
+                    table = pa.Table.from_pandas(df, schema=_ROW_SCHEMA, preserve_index=False)
+                    nbytes = self._write_fragment(self.root / "metadata" / partition, table)
+                    self._share(sizes, [keys_by_digest[d] for d in df["key"]], nbytes, count_rows=True)
+
+                triples = cover_by_part.get(partition)
+                if triples:
+                    table = pa.Table.from_pylist(
+                        [dict(zip(_COVERAGE_SCHEMA.names, t)) for t in triples],
+                        schema=_COVERAGE_SCHEMA,
+                    )
+                    nbytes = self._write_fragment(self.root / "coverage" / partition, table)
+                    self._share(sizes, [keys_by_digest[t[0]] for t in triples], nbytes, count_rows=False)
+
+                self.index.record_write({key: (nbytes, nrows) for key, (nbytes, nrows) in sizes.items()})
+
+        for partition in set(rows_by_part) | set(cover_by_part):
+            self._maybe_compact(partition)
+
+        # expiry is independent of the size budget
+        if _TTL is not None:
+            self.expire(_TTL)
+        if self.index.total_bytes() > _MAX_BYTES:
+            self.evict(int(_MAX_BYTES * 0.9))
+
+    # ─── compaction ───────────────────────────────────────────────────────
+    def _partition_lock(self, partition: pathlib.Path) -> contextlib.AbstractContextManager[None]:
+        """Lock serialising the writes and compactions of *partition*."""
+        return _file_lock(self.root / "locks" / f"partition-{'-'.join(partition.parts)}.lock")
+
+    def _maybe_compact(self, partition: pathlib.Path) -> None:
+        """Start a background compaction if *partition* is fragmented."""
+        folders = [self.root / "metadata" / partition, self.root / "coverage" / partition]
+        if all(len(list(f.glob("*.parquet"))) < _COMPACT_THRESHOLD for f in folders):
+            return
+        with self._lock:
+            if partition in self._compacting:
+                return
+            self._compacting.add(partition)
+        threading.Thread(target=self.compact, args=(partition,), daemon=True).start()
+
+    def compact(
+        self,
+        partition: pathlib.Path | None = None,
+        drop: Iterable[str] = (),
+    ) -> None:
+        """Merge the fragments of *partition* (or all partitions) into one.
+
+        Rows are deduplicated by ``(key, id)`` and intervals merged per key;
+        keys listed in *drop* are removed. The compacted fragment is written
+        before the old ones are removed, so readers never observe missing
+        data.
+        """
+        drop = set(drop)
+        if partition is None:
+            parts = {
+                p.relative_to(self.root / dataset)
+                for dataset in ("metadata", "coverage")
+                for p in (self.root / dataset).glob("collection=*/geohash=*")
+            }
+            for part in sorted(parts):
+                self.compact(part, drop)
+            return
+
+        try:
+            # one compaction per partition at a time, across processes, and
+            # no append in between: the sizes rebased below stay exact
+            with self._partition_lock(partition):
+                for dataset, schema in (("metadata", _ROW_SCHEMA), ("coverage", _COVERAGE_SCHEMA)):
+                    folder = self.root / dataset / partition
+                    files = sorted(folder.glob("*.parquet"))
+                    if len(files) < (1 if drop else 2):
+                        continue
+                    df = ds.dataset([str(f) for f in files], schema=schema, format="parquet").to_table().to_pandas()
+                    df = df[~df["key"].isin(drop)]
+                    if dataset == "metadata":
+                        df = df.drop_duplicates(["key", "id"], keep="last").sort_values(["key", "date"], kind="mergesort")
+                    else:
+                        df = pd.DataFrame(
+                            [
+                                (digest, a, b)
+                                for digest, group in df.groupby("key", sort=True)
+                                for a, b in _merge_intervals(zip(group["start"], group["end"]))
+                            ],
+                            columns=schema.names,
+                        )
+                    if not df.empty:
+                        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+                        self._write_fragment(folder, table)
+                    for f in files:
+                        f.unlink(missing_ok=True)
+                # appends only ever add to the indexed sizes; rebase them on
+                # the fragments left after deduplication
+                self.index.set_sizes(self._partition_sizes(partition))
+        finally:
+            with self._lock:
+                self._compacting.discard(partition)
+
+    def _partition_sizes(self, partition: pathlib.Path) -> dict[str, tuple[int, int]]:
+        """Return ``(bytes, rows)`` per key of *partition*, as stored on disk.
+
+        Each fragment's size is split evenly over its rows, as in
+        :meth:`append`; only the ``key`` column is read.
+        """
+        sizes: dict[str, list[int]] = {}
+        for dataset in ("metadata", "coverage"):
+            for f in (self.root / dataset / partition).glob("*.parquet"):
+                try:
+                    keys = pq.read_table(f, columns=["key"]).column("key").to_pandas()
+                    nbytes = f.stat().st_size
+                except FileNotFoundError:  # removed by a concurrent compaction
+                    continue
+                if keys.empty:
+                    continue
+                for digest, count in keys.value_counts().items():
+                    entry = sizes.setdefault(digest, [0, 0])
+                    entry[0] += nbytes * count // len(keys)
+                    if dataset == "metadata":
+                        entry[1] += int(count)
+        return {digest: (nbytes, nrows) for digest, (nbytes, nrows) in sizes.items()}
+
+    # ─── eviction ─────────────────────────────────────────────────────────
+    def expire(self, ttl: float) -> list[str]:
+        """Remove every key not accessed during the last *ttl* seconds.
+
+        Unlike :meth:`evict`, only the expired entries are read from the
+        index, so this is cheap enough to run on every append.
+
+        Returns
+        -------
+        list[str]
+            Digests of the expired keys.
+        """
+        expired = self.index.expire(time.time() - ttl)
+        by_partition: dict[str, list[str]] = {}
+        for digest, partition in expired:
+            by_partition.setdefault(partition, []).append(digest)
+        for partition, digests in by_partition.items():
+            self.compact(pathlib.Path(partition), drop=digests)
+        return [digest for digest, _ in expired]
+
+    def evict(self, max_bytes: int | None = None, ttl: float | None = None) -> list[str]:
+        """Remove expired and least recently used entries.
+
+        Parameters
+        ----------
+        max_bytes
+            Evict least recently used keys until the indexed size fits.
+        ttl
+            Evict every key not accessed during the last *ttl* seconds.
+
+        Returns
+        -------
+        list[str]
+            Digests of the evicted keys.
+        """
+        entries = self.index.entries()
+        victims = pd.Series(False, index=entries.index)
+        if ttl is not None:
+            victims |= entries["last_access"] < time.time() - ttl
+        if max_bytes is not None:
+            # entries are ordered oldest access first
+            kept = entries["bytes"].where(~victims, 0)
+            victims |= kept[::-1].cumsum()[::-1] > max_bytes
+
+        evicted = entries[victims]
+        for partition, group in evicted.groupby("partition"):
+            self.compact(pathlib.Path(partition), drop=group["key"])
+        self.index.remove(evicted["key"])
+        return evicted["key"].tolist()
+
+
+_STORE: MetadataStore | None = None
+
+
+def _metadata_store() -> MetadataStore:
+    """Return the process-wide :class:`MetadataStore` under ``_CACHE_DIR``."""
+    global _STORE
+    if _STORE is None:
+        _STORE = MetadataStore(_CACHE_DIR)
+    return _STORE
@@ -0,0 +1,127 @@
+"""Inspect, bound and prune the on-disk metadata cache.
+
+The cache used by :func:`cubexpress.s2_cloud_table` and
+:func:`cubexpress.s2_cloud_tables` lives under ``$CUBEXPRESS_CACHE``
+(default ``~/.cubexpress_cache``). Its size is bounded by
+``$CUBEXPRESS_CACHE_MAX_BYTES`` (default 5 GiB): once exceeded, least
+recently used entries are evicted down to 90 % of the budget. Setting
+``$CUBEXPRESS_CACHE_TTL`` (seconds) also evicts entries not accessed for
+that long.
+
+Example
+-------
+>>> from cubexpress import cache_manager
+>>> cache_manager.stats()
+{'entries': 12, 'bytes': 48213, 'disk_bytes': 51022, 'hits': 30, 'misses': 12, ...}
+>>> cache_manager.prune(ttl=30 * 86400)
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pandas as pd
+
+from cubexpress.cache import _MAX_BYTES, CacheKey, _metadata_store
+
+
+def list_entries() -> pd.DataFrame:
+    """Return one row per cached key, least recently used first.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns ``key``, ``params`` (``[lon, lat, edge_size, scale,
+        collection]``, or ``["geohash", cell, ...]`` for snapped keys),
+        ``partition``, ``bytes``, ``rows``, ``created``,
+        ``last_access`` and ``hits``. Timestamps are UTC datetimes.
+    """
+    df = _metadata_store().index.entries()
+    for col in ("created", "last_access"):
+        df[col] = pd.to_datetime(df[col], unit="s", utc=True)
+    return df
+
+
+def inspect(key: str) -> dict[str, Any]:
+    """Return the index entry, covered intervals and rows of one cache key.
+
+    Parameters
+    ----------
+    key
+        Digest as listed by :func:`list_entries`.
+
+    Raises
+    ------
+    KeyError
+        If *key* is not in the cache.
+    """
+    store = _metadata_store()
+    entries = store.index.entries().set_index("key")
+    if key not in entries.index:
+        raise KeyError(f"{key!r} is not in the cache")
+
+    entry = entries.loc[key].to_dict()
+    cache_key = CacheKey(
+        digest=key,
+        geohash=entry["partition"].rsplit("geohash=", 1)[-1],
+        collection=json.loads(entry["params"])[-1],
+        params=entry["params"],
+    )
+    return {
+        "key": key,
+        **entry,
+        "coverage": store.coverage([cache_key]).get(key, []),
+        "rows": store.read([cache_key]).drop(columns="key"),
+    }
+
+
+def prune(max_bytes: int | None = None, ttl: float | None = None) -> list[str]:
+    """Evict entries beyond *max_bytes* (LRU) or older than *ttl* seconds.
+
+    Parameters
+    ----------
+    max_bytes
+        Size budget in bytes. Defaults to ``$CUBEXPRESS_CACHE_MAX_BYTES``
+        when *ttl* is not given either.
+    ttl
+        Maximum age since the last access, in seconds.
+
+    Returns
+    -------
+    list[str]
+        Evicted keys.
+    """
+    if max_bytes is None and ttl is None:
+        max_bytes = _MAX_BYTES
+    return _metadata_store().evict(max_bytes, ttl)
+
+
+def clear() -> list[str]:
+    """Evict every entry."""
+    return _metadata_store().evict(max_bytes=0)
+
+
+def stats() -> dict[str, int]:
+    """Return cache-wide counters.
+
+    ``entries`` and ``bytes`` come from the index, ``disk_bytes`` is the
+    actual size of the dataset files. ``hits`` and ``misses`` count lookups
+    that did and did not need an Earth Engine query; ``bytes_written``,
+    ``bytes_read`` and ``evictions`` are cumulative.
+    """
+    store = _metadata_store()
+    entries = store.index.entries()
+    disk = sum(
+        f.stat().st_size
+        for dataset in ("metadata", "coverage")
+        for f in (store.root / dataset).rglob("*.parquet")
+    )
+    counters = {"hits": 0, "misses": 0, "bytes_written": 0, "bytes_read": 0, "evictions": 0}
+    counters.update(store.index.counters())
+    return {
+        "entries": len(entries),
+        "bytes": int(entries["bytes"].sum()),
+        "disk_bytes": disk,
+        **counters,
+    }
@@ -1,26 +1,81 @@
 """Cloud-coverage tables for Sentinel-2 over a square ROI.
 
-Two helpers are exposed:
+Three helpers are exposed:
 
 * :func:`_cloud_table_single_range` – query Earth Engine for one date-range.
-* :func:`cloud_table` – smart wrapper that adds on-disk caching, automatic
+* :func:`s2_cloud_table` – smart wrapper that adds on-disk caching, automatic
   back-filling, and cloud-percentage filtering.
+* :func:`s2_cloud_tables` – batched variant for many sites; one server-side
+  query per chunk of points, returning a long table keyed by ``site``.
 
-Both return a ``pandas.DataFrame`` with the columns **day**, **cloudPct** and
+All of them return a ``pandas.DataFrame`` with the columns **day**, **cloudPct** and
 **images** plus useful ``.attrs`` metadata for downstream functions.
 """
 
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
 import datetime as dt
+import re
+
 import ee
 import pandas as pd
 
-from cubexpress.cache import _cache_key
+from cubexpress.cache import _ROW_SCHEMA, _cache_key, _metadata_store, _missing_intervals, _snap
 from cubexpress.geospatial import _square_roi
 
+_S2_COLLECTION = "COPERNICUS/S2_HARMONIZED"
+_CSP_COLLECTION = "GOOGLE/CLOUD_SCORE_PLUS/V1/S2_HARMONIZED"
+# Earth Engine computation/size limits that a smaller date window can avoid.
+# Quota and rate-limit errors ("Too many concurrent aggregations", "Too Many
+# Requests") are deliberately excluded: splitting would only send more requests.
+_LIMIT_ERRORS = re.compile(
+    r"timed out|memory limit|limit exceeded|accumulating over",
+    re.IGNORECASE,
+)
+_S2_BANDS = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8", "B8A", "B9", "B10", "B11", "B12"]
+
+
+def _linked_collection(region: ee.Geometry, start: str, end: str) -> ee.ImageCollection:
+    """Sentinel-2 images over *region* with the Cloud Score+ band linked."""
+    return (
+        ee.ImageCollection(_S2_COLLECTION)
+        .filterBounds(region)
+        .filterDate(start, end)
+        .linkCollection(ee.ImageCollection(_CSP_COLLECTION), ["cs_cdf"])
+    )
 
-def _cloud_table_single_range(
+
+def _score_band(img: ee.Image) -> ee.Image:
+    """Single ``cs_cdf`` band where missing links and masked pixels are -1."""
+    missing = ee.Image.constant(-1).rename("cs_cdf")
+    return img.addBands(missing).select("cs_cdf").unmask(-1)
+
+
+def _fetch_columns(table: ee.FeatureCollection, columns: list[str]) -> pd.DataFrame:
+    """Fetch *columns* of *table* as one columnar payload (single ``getInfo``)."""
+    raw = (
+        table.reduceColumns(ee.Reducer.toList().repeat(len(columns)), columns)
+        .get("list")
+        .getInfo()
+    )
+    # object dtype keeps empty payloads string-comparable on ``date``
+    return pd.DataFrame(dict(zip(columns, raw)), columns=columns, dtype=object).infer_objects()
+
+
+def _finalise_scores(df: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    """Turn the -1 sentinel into NaN, flag it and fill with the group mean."""
+    df["cs_cdf"] = pd.to_numeric(df["cs_cdf"]).where(lambda x: x >= 0)
+    df["null_flag"] = df["cs_cdf"].isna().astype(int)
+    if df["null_flag"].any():
+        df["cs_cdf"] = df["cs_cdf"].fillna(
+            df.groupby(by)["cs_cdf"].transform("mean")
+        )
+    return df
+
+
+def _cloud_scores_query(
     lon: float,
     lat: float,
     edge_size: int,
@@ -28,7 +83,11 @@ def _cloud_table_single_range(
     end: str
 ) -> pd.DataFrame:
     """
-    Build a daily cloud-score table for a square Sentinel-2 footprint.
+    Query the cloud-score table of one date window with a single EE call.
+
+    Image ID, acquisition date and ``cs_cdf`` are computed server-side and
+    fetched together as one columnar payload, so a single ``getInfo`` round
+    trip is made per call.
 
     Parameters
     ----------
@@ -55,55 +114,273 @@ def _cloud_table_single_range(
 
     center = ee.Geometry.Point([lon, lat])
     roi = _square_roi(lon, lat, edge_size, 10)
+    region_scale = edge_size * 10 / 2
+    reducer = ee.Reducer.first().setOutputs(["cs_cdf"])
 
-    s2 = (
-        ee.ImageCollection("COPERNICUS/S2_HARMONIZED")
-        .filterBounds(roi)
-        .filterDate(start, end)
-    )
+    def _row(img):
+        img = ee.Image(img)
+        score = _score_band(img).reduceRegion(
+            reducer=reducer, geometry=center, scale=region_scale
+        )
+        return ee.Feature(
+            None,
+            {
+                "id": img.get("system:index"),
+                "date": img.date().format("YYYY-MM-dd"),
+                "cs_cdf": score.get("cs_cdf"),
+            },
+        )
 
-    csp = ee.ImageCollection("GOOGLE/CLOUD_SCORE_PLUS/V1/S2_HARMONIZED")
+    table = ee.FeatureCollection(_linked_collection(roi, start, end).map(_row))
+    df = _fetch_columns(table, ["id", "cs_cdf", "date"])
 
-    ic = (
-        s2
-        .linkCollection(csp, ["cs_cdf"])
-        .select(["cs_cdf"])
-    )
+    return _finalise_scores(df, ["date"])
 
-    # image IDs for every expected date
-    ids = ic.aggregate_array("system:index").getInfo()
-    df_ids = pd.DataFrame({"id": ids})
 
+def _date_chunks(start: str, end: str, chunk: str | int | None) -> list[tuple[str, str]]:
+    """Split the half-open window [*start*, *end*) into consecutive chunks.
 
-    region_scale = edge_size * 10 / 2
+    *chunk* is ``"year"`` for calendar years, a number of days for fixed
+    windows, or *None* to keep the window whole.
+    """
+    a, b = dt.date.fromisoformat(start), dt.date.fromisoformat(end)
+    if chunk is None or a >= b:
+        return [(start, end)]
+
+    bounds = [a]
+    while bounds[-1] < b:
+        last = bounds[-1]
+        if chunk == "year":
+            nxt = dt.date(last.year + 1, 1, 1)
+        else:
+            nxt = last + dt.timedelta(days=int(chunk))
+        bounds.append(min(nxt, b))
 
+    return [(x.isoformat(), y.isoformat()) for x, y in zip(bounds[:-1], bounds[1:])]
 
+
+def _cloud_scores_adaptive(
+    lon: float,
+    lat: float,
+    edge_size: int,
+    start: str,
+    end: str
+) -> pd.DataFrame:
+    """Run :func:`_cloud_scores_query`, halving the window on EE limit errors."""
     try:
-        raw = ic.getRegion(geometry=center, scale=region_scale).getInfo()
-    except ee.ee_exception.EEException as e:
-        if "No bands in collection" in str(e):
-            return pd.DataFrame(
-                columns=["id", "cs_cdf", "date", "null_flag"]
-            )
-        raise 
+        return _cloud_scores_query(lon, lat, edge_size, start, end)
+    except ee.ee_exception.EEException as err:
+        a, b = dt.date.fromisoformat(start), dt.date.fromisoformat(end)
+        if not _LIMIT_ERRORS.search(str(err)) or (b - a).days < 2:
+            raise
+        mid = (a + (b - a) / 2).isoformat()
+        return pd.concat(
+            [
+                _cloud_scores_adaptive(lon, lat, edge_size, start, mid),
+                _cloud_scores_adaptive(lon, lat, edge_size, mid, end),
+            ],
+            ignore_index=True,
+        )
+
+
+def _empty_scores() -> pd.DataFrame:
+    """Cloud-score table without rows (``id``, ``cs_cdf``, ``date``, ``null_flag``)."""
+    return _ROW_SCHEMA.empty_table().to_pandas().drop(columns="key")
+
+
+def _within(dates: pd.Series, intervals: list[tuple[str, str]]) -> pd.Series:
+    """Boolean mask of *dates* falling inside any half-open interval."""
+    mask = pd.Series(False, index=dates.index)
+    for a, b in intervals:
+        mask |= (dates >= a) & (dates < b)
+    return mask
+
+
+def _cloud_table_single_range(
+    lon: float,
+    lat: float,
+    edge_size: int,
+    start: str,
+    end: str,
+    chunk: str | int | None = "year",
+    max_workers: int = 4,
+) -> pd.DataFrame:
+    """
+    Build a daily cloud-score table for a square Sentinel-2 footprint.
 
-    df_raw = pd.DataFrame(raw[1:], columns=raw[0])
+    Long periods are split into chunks (see :func:`_date_chunks`) that are
+    queried concurrently; a chunk failing with an Earth Engine limit error is
+    retried as two halves. Results are concatenated in chronological chunk
+    order, so the output does not depend on completion order.
 
+    Parameters
+    ----------
+    lon, lat : float
+        Point at the centre of the requested region (°).
+    edge_size : int
+        Side length of the square region in Sentinel-2 pixels (10 m each).
+    start, end : str
+        ISO-8601 dates delimiting the period, e.g. ``"2024-06-01"``.
+    chunk : str | int | None
+        ``"year"`` (default), a window length in days, or *None* for a
+        single request.
+    max_workers : int
+        Maximum number of chunks in flight.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Same columns as :func:`_cloud_scores_query`.
+    """
 
-    df = (
-        df_ids
-        .merge(df_raw, on="id", how="left")
-        .assign(
-            date=lambda d: pd.to_datetime(d["id"].str[:8], format="%Y%m%d").dt.strftime("%Y-%m-%d"),
-            null_flag=lambda d: d["cs_cdf"].isna().astype(int),
+    windows = _date_chunks(start, end, chunk)
+    if len(windows) == 1:
+        return _cloud_scores_adaptive(lon, lat, edge_size, start, end)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(max_workers, len(windows))
+    ) as pool:
+        parts = list(
+            pool.map(
+                lambda w: _cloud_scores_adaptive(lon, lat, edge_size, *w), windows
+            )
         )
-        .drop(columns=["longitude", "latitude", "time"])
+
+    return pd.concat(parts, ignore_index=True)
+
+
+def _cloud_scores_multi_query(
+    sites: pd.DataFrame,
+    edge_size: int,
+    start: str,
+    end: str
+) -> pd.DataFrame:
+    """
+    Query the cloud-score table of many sites and one date window in one EE call.
+
+    Every site becomes a feature of a single ``ee.FeatureCollection``; each
+    Sentinel-2 image is reduced over the centres of the sites its footprint
+    intersects and the flattened result is fetched column-wise with one
+    ``getInfo``.
+
+    Parameters
+    ----------
+    sites : pandas.DataFrame
+        Points with ``lon`` and ``lat`` columns. The positional order is used
+        as server-side site key.
+    edge_size : int
+        Side length of the square region in Sentinel-2 pixels (10 m each).
+    start, end : str
+        ISO-8601 dates delimiting the period, e.g. ``"2024-06-01"``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Same columns as :func:`_cloud_table_single_range` plus ``row``, the
+        positional index of the site in *sites*.
+    """
+
+    rois = ee.FeatureCollection(
+        [
+            ee.Feature(_square_roi(lon, lat, edge_size, 10), {"row": i})
+            for i, (lon, lat) in enumerate(zip(sites["lon"], sites["lat"]))
+        ]
     )
+    region_scale = edge_size * 10 / 2
+    reducer = ee.Reducer.first().setOutputs(["cs_cdf"])
+
+    def _scores(img):
+        img = ee.Image(img)
+        centres = rois.filterBounds(img.geometry()).map(
+            lambda f: f.setGeometry(f.geometry().centroid(1))
+        )
+        return _score_band(img).reduceRegions(
+            collection=centres, reducer=reducer, scale=region_scale
+        ).map(
+            lambda f: f.set(
+                {"id": img.get("system:index"), "date": img.date().format("YYYY-MM-dd")}
+            )
+        )
 
-    # fill missing scores with daily mean
-    df["cs_cdf"] = df["cs_cdf"].fillna(df.groupby("date")["cs_cdf"].transform("mean"))
+    table = _linked_collection(rois.geometry(), start, end).map(_scores).flatten()
+    df = _fetch_columns(table, ["row", "id", "cs_cdf", "date"])
 
-    return df
+    return _finalise_scores(df, ["row", "date"])
+
+
+def _cloud_scores_multi_adaptive(
+    sites: pd.DataFrame,
+    edge_size: int,
+    start: str,
+    end: str
+) -> pd.DataFrame:
+    """Run :func:`_cloud_scores_multi_query`, halving the window on EE limit errors."""
+    try:
+        return _cloud_scores_multi_query(sites, edge_size, start, end)
+    except ee.ee_exception.EEException as err:
+        a, b = dt.date.fromisoformat(start), dt.date.fromisoformat(end)
+        if not _LIMIT_ERRORS.search(str(err)) or (b - a).days < 2:
+            raise
+        mid = (a + (b - a) / 2).isoformat()
+        return pd.concat(
+            [
+                _cloud_scores_multi_adaptive(sites, edge_size, start, mid),
+                _cloud_scores_multi_adaptive(sites, edge_size, mid, end),
+            ],
+            ignore_index=True,
+        )
+
+
+def _cloud_table_multi(
+    sites: pd.DataFrame,
+    edge_size: int,
+    start: str,
+    end: str,
+    chunk: str | int | None = "year",
+    max_workers: int = 4,
+) -> pd.DataFrame:
+    """
+    Build the per-image cloud-score table for many sites at once.
+
+    The date range is chunked and retried exactly as in
+    :func:`_cloud_table_single_range`; every window is resolved for all
+    *sites* with one :func:`_cloud_scores_multi_query` call.
+
+    Parameters
+    ----------
+    sites : pandas.DataFrame
+        Points with ``lon`` and ``lat`` columns. The positional order is used
+        as server-side site key.
+    edge_size : int
+        Side length of the square region in Sentinel-2 pixels (10 m each).
+    start, end : str
+        ISO-8601 dates delimiting the period, e.g. ``"2024-06-01"``.
+    chunk : str | int | None
+        ``"year"`` (default), a window length in days, or *None* for a
+        single request.
+    max_workers : int
+        Maximum number of chunks in flight.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Same columns as :func:`_cloud_scores_multi_query`.
+    """
+
+    windows = _date_chunks(start, end, chunk)
+    if len(windows) == 1:
+        return _cloud_scores_multi_adaptive(sites, edge_size, start, end)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(max_workers, len(windows))
+    ) as pool:
+        parts = list(
+            pool.map(
+                lambda w: _cloud_scores_multi_adaptive(sites, edge_size, *w), windows
+            )
+        )
+
+    return pd.concat(parts, ignore_index=True)
 
 
 def s2_cloud_table(
@@ -116,13 +393,17 @@ def s2_cloud_table(
     min_cscore: float = 0.0,
     cache: bool = False,
     verbose: bool = True,
+    snap: int | None = None,
 ) -> pd.DataFrame:
     """Build (and cache) a per-day cloud-table for the requested ROI.
 
-    The function first checks an on-disk parquet cache keyed on location and
-    parameters.  If parts of the requested date-range are missing, it fetches
-    only those gaps from Earth Engine, merges, updates the cache and finally
-    filters by *cloud_max*.
+    The function first checks the on-disk metadata store keyed on location and
+    parameters.  The store records which date intervals have already been
+    queried; only the sub-intervals of *start*–*end* never queried before are
+    fetched from Earth Engine, deduplicated by image ``id``, appended to the
+    store together with the new coverage and finally filtered by
+    *min_cscore*/*max_cscore*.  Nothing is written when the request is
+    served entirely from cache.
 
     Parameters
     ----------
@@ -146,6 +427,11 @@ def s2_cloud_table(
         Toggle parquet caching.
     verbose
         If *True* prints cache info/progress.
+    snap
+        Opt-in geohash precision (e.g. ``7`` ≈ 150 m). The metadata is then
+        queried at the centre of the geohash cell holding (*lon*, *lat*) and
+        cached under that cell, so neighbouring sites share one entry. The
+        returned ``.attrs`` keep the exact *lon*/*lat*.
 
     Returns
     -------
@@ -153,88 +439,255 @@ def s2_cloud_table(
         Filtered cloud table with ``.attrs`` containing the call parameters.
     """
 
-    bands = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8", "B8A", "B9", "B10", "B11", "B12"]
-    collection = "COPERNICUS/S2_HARMONIZED"
-    scale = 10
-    cache_file = _cache_key(lon, lat, edge_size, scale, collection)
-
-    # ─── 1. Load cached data if present ────────────────────────────────────
-    if cache and cache_file.exists():
-        if verbose:
-            print("📂  Loading cached metadata …")
-        df_cached = pd.read_parquet(cache_file)
-        have_idx = pd.to_datetime(df_cached["date"], errors="coerce").dropna()
-
-        cached_start = have_idx.min().date()
-        cached_end = have_idx.max().date()
-
-        if (
-            dt.date.fromisoformat(start) >= cached_start
-            and dt.date.fromisoformat(end) <= cached_end
-        ):
-            if verbose:
-                print("✅  Served entirely from metadata.")
-            df_full = df_cached
-        else:
-            # Identify missing segments and fetch only those.
-            df_new_parts = []
-            if dt.date.fromisoformat(start) < cached_start:
-                a1, b1 = start, cached_start.isoformat()
-                df_new_parts.append(
-                    _cloud_table_single_range(
-                        lon, lat, edge_size, a1, b1
+    key = _cache_key(lon, lat, edge_size, 10, _S2_COLLECTION, snap)
+    q_lon, q_lat = (lon, lat) if snap is None else _snap(lon, lat, snap)[:2]
+    # the store creates its folder and index: leave it alone when caching is off
+    store = _metadata_store() if cache else None
+
+    # ─── 1. Look up which dates the cache already covers ───────────────────
+    covered = store.coverage([key]).get(key.digest, []) if cache else []
+    gaps = _missing_intervals(covered, start, end)
+
+    # ─── 2. Fetch never-queried intervals, one caller per key at a time ────
+    df_new = None
+    if gaps:
+        with store.lock([key]) if cache else contextlib.nullcontext():
+            if cache:
+                # a concurrent caller may have filled the gaps while we waited
+                covered = store.coverage([key]).get(key.digest, [])
+                gaps = _missing_intervals(covered, start, end)
+            if gaps:
+                if verbose:
+                    msg = "Fetching missing dates…" if covered else (
+                        "Generating metadata (no cache found)…" if cache else "Generating metadata…"
                     )
+                    print("⏳", msg)
+                df_new = pd.concat(
+                    [_cloud_table_single_range(q_lon, q_lat, edge_size, a, b) for a, b in gaps],
+                    ignore_index=True,
                 )
-            if dt.date.fromisoformat(end) > cached_end:
-                a2, b2 = cached_end.isoformat(), end
-                df_new_parts.append(
-                    _cloud_table_single_range(
-                        lon, lat, edge_size, a2, b2
-                    )
-                )
-            df_new_parts = [df for df in df_new_parts if not df.empty]
-            
-            if df_new_parts:
-                
-                df_new = pd.concat(df_new_parts, ignore_index=True)
-                df_full = (
-                    pd.concat([df_cached, df_new], ignore_index=True)
-                    .sort_values("date", kind="mergesort")
-                )
-            else:
-                df_full = df_cached
-    else:
-
-        if verbose:
-            msg = "Generating metadata (no cache found)…" if cache else "Generating metadata…"
-            print("⏳", msg)
-        df_full = _cloud_table_single_range(
-            lon, lat, edge_size, start, end
-        )
-        
+                if cache:
+                    store.append([(key, df_new, gaps)])
 
-    # ─── 2. Save cache ─────────────────────────────────────────────────────
     if cache:
-        df_full.to_parquet(cache_file, compression="zstd")
+        store.index.touch([key.digest], hit=df_new is None)
+        if verbose:
+            print("✅  Served entirely from metadata." if df_new is None else "📂  Loading cached metadata …")
+        df_full = store.read([key], start, end).drop(columns="key")
+    elif df_new is None:
+        # empty window (start >= end): nothing was queried
+        df_full = _empty_scores()
+    else:
+        df_full = df_new.sort_values("date", kind="mergesort").reset_index(drop=True)
 
     # ─── 3. Filter by cloud cover and requested date window ────────────────
-    
-    result = (
-        df_full.query("@start <= date <= @end")
-        .query("@min_cscore <= cs_cdf <= @max_cscore")
-        .reset_index(drop=True)
-    )
+    return _finish_table(df_full, lon, lat, edge_size, start, end, min_cscore, max_cscore)
+
+
+def _finish_table(
+    df_full: pd.DataFrame,
+    lon: float,
+    lat: float,
+    edge_size: int,
+    start: str,
+    end: str,
+    min_cscore: float,
+    max_cscore: float,
+) -> pd.DataFrame:
+    """Filter *df_full* by date window and cloud score and attach ``.attrs``."""
+    # plain NumPy masks: Series.between costs more than the filter itself on
+    # the small tables served from the in-memory cache
+    dates = df_full["date"].to_numpy(dtype=object)
+    scores = df_full["cs_cdf"].to_numpy()
+    mask = (dates >= start) & (dates <= end) & (scores >= min_cscore) & (scores <= max_cscore)
+    result = df_full[mask].reset_index(drop=True)
 
     # Attach metadata for downstream helpers
     result.attrs.update(
         {
             "lon": lon,
             "lat": lat,
+            "edge_size": edge_size,
+            "scale": 10,
+            "bands": _S2_BANDS,
+            "collection": _S2_COLLECTION
+        }
+    )
+    return result
+
+
+def s2_cloud_tables(
+    points: pd.DataFrame,
+    edge_size: int,
+    start: str,
+    end: str,
+    max_cscore: float = 1.0,
+    min_cscore: float = 0.0,
+    cache: bool = False,
+    chunk_size: int = 250,
+    verbose: bool = True,
+    snap: int | None = None,
+) -> pd.DataFrame:
+    """Build per-day cloud tables for many sites at once.
+
+    Sites are sent to Earth Engine in chunks of *chunk_size*; every chunk is
+    resolved with one server-side query per date chunk (see
+    :func:`_cloud_table_multi`) instead of per site as in :func:`s2_cloud_table`.
+
+    Parameters
+    ----------
+    points
+        Table with ``lon`` and ``lat`` columns. An optional ``site`` column
+        names every point (defaults to the index) and an optional
+        ``edge_size`` column overrides *edge_size* per point.
+    edge_size
+        Default square size in pixels.
+    start, end
+        ISO start/end dates.
+    max_cscore, min_cscore
+        Cloud Score+ window, as in :func:`s2_cloud_table`.
+    cache
+        Read and fill the same metadata store used by
+        :func:`s2_cloud_table`.
+    chunk_size
+        Maximum number of sites per Earth Engine query.
+    verbose
+        If *True* prints cache info/progress.
+    snap
+        Opt-in geohash precision, as in :func:`s2_cloud_table`. Sites falling
+        in the same cell are queried and cached once.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Long table with columns ``site``, ``lon``, ``lat``, ``edge_size``,
+        ``id``, ``cs_cdf``, ``date`` and ``null_flag``.
+    """
+
+    missing_cols = {"lon", "lat"} - set(points.columns)
+    if missing_cols:
+        raise ValueError(f"Missing required columns in points: {missing_cols}")
+
+    sites = pd.DataFrame(
+        {
+            "site": points["site"] if "site" in points.columns else points.index,
+            "lon": points["lon"].astype(float),
+            "lat": points["lat"].astype(float),
+            "edge_size": (
+                points["edge_size"].astype(int)
+                if "edge_size" in points.columns
+                else int(edge_size)
+            ),
+        }
+    ).reset_index(drop=True)
+
+    if sites["site"].duplicated().any():
+        raise ValueError("All points must have unique site keys")
+
+    scale = 10
+    collection = _S2_COLLECTION
+    site_keys = [
+        _cache_key(lon, lat, size, scale, collection, snap)
+        for lon, lat, size in zip(sites["lon"], sites["lat"], sites["edge_size"])
+    ]
+
+    # One query per distinct key: with *snap* several sites share a cell.
+    queries = sites[["lon", "lat", "edge_size"]].assign(
+        digest=[key.digest for key in site_keys]
+    )
+    if snap is not None:
+        cells = [_snap(lon, lat, snap) for lon, lat in zip(sites["lon"], sites["lat"])]
+        queries["lon"] = [c[0] for c in cells]
+        queries["lat"] = [c[1] for c in cells]
+    queries = queries.drop_duplicates("digest").reset_index(drop=True)
+    by_digest = {key.digest: key for key in site_keys}
+    keys = [by_digest[d] for d in queries["digest"]]
+    # the store creates its folder and index: leave it alone when caching is off
+    store = _metadata_store() if cache else None
+
+    # ─── 1. Find the keys whose window is not fully cached ────────────────
+    gaps: dict[int, list[tuple[str, str]]] = {
+        i: [(start, end)] for i in range(len(queries))
+    }
+    if cache:
+        covered = store.coverage(keys)
+        gaps = {
+            i: _missing_intervals(covered.get(key.digest, []), start, end)
+            for i, key in enumerate(keys)
+        }
+
+    # ``.loc``: a bare empty list would select columns, not rows
+    todo = queries.loc[[bool(gaps[i]) for i in queries.index]]
+    if verbose:
+        print(f"📂  {len(queries) - len(todo)} sites served from cache, {len(todo)} to query …")
+
+    # ─── 2. One Earth Engine query per chunk of sites ──────────────────────
+    fetched: dict[int, pd.DataFrame] = {}
+    for size, group in todo.groupby("edge_size", sort=False):
+        for offset in range(0, len(group), chunk_size):
+            chunk = group.iloc[offset : offset + chunk_size]
+            chunk_keys = [keys[i] for i in chunk.index]
+            with store.lock(chunk_keys) if cache else contextlib.nullcontext():
+                if cache:
+                    # concurrent callers may have filled some sites meanwhile
+                    covered = store.coverage(chunk_keys)
+                    for i, key in zip(chunk.index, chunk_keys):
+                        gaps[i] = _missing_intervals(covered.get(key.digest, []), start, end)
+                    chunk = chunk[[bool(gaps[i]) for i in chunk.index]]
+                    if chunk.empty:
+                        continue
+
+                if verbose:
+                    print(f"⏳ Querying {len(chunk)} sites (edge_size={size}) …")
+                df_chunk = _cloud_table_multi(chunk, int(size), start, end)
+                parts = dict(tuple(df_chunk.groupby("row", sort=False)))
+
+                entries = []
+                for row, i in enumerate(chunk.index):
+                    fetched[i] = parts.get(row, df_chunk.iloc[0:0]).drop(columns="row")
+                    new_rows = fetched[i][_within(fetched[i]["date"], gaps[i])]
+                    entries.append((keys[i], new_rows, gaps[i]))
+
+                # ─── 3. Append the chunk to the metadata store ──────────
+                if cache:
+                    store.append(entries)
+
+    if cache:
+        store.index.touch([k.digest for i, k in enumerate(keys) if i not in fetched], hit=True)
+        store.index.touch([k.digest for i, k in enumerate(keys) if i in fetched], hit=False)
+        rows = dict(tuple(store.read(keys, start, end).groupby("key", sort=False)))
+        empty = store.read([]).drop(columns="key")
+        tables = {
+            key.digest: rows[key.digest].drop(columns="key").reset_index(drop=True)
+            if key.digest in rows else empty
+            for key in keys
+        }
+    else:
+        tables = {keys[i].digest: df for i, df in fetched.items()}
+
+    # ─── 4. Long table, filtered by cloud cover and date window ────────────
+    frames = [
+        tables[key.digest].assign(
+            site=site, lon=lon, lat=lat, edge_size=size
+        )
+        for key, (site, lon, lat, size) in zip(site_keys, sites.itertuples(index=False))
+    ]
+    if not frames:
+        # no points: an empty table with the same columns and dtypes
+        frames = [_empty_scores().assign(**sites)]
+    columns = ["site", "lon", "lat", "edge_size", "id", "cs_cdf", "date", "null_flag"]
+    long = pd.concat(frames, ignore_index=True)[columns]
+    result = long[
+        long["date"].between(start, end)
+        & long["cs_cdf"].between(min_cscore, max_cscore)
+    ].reset_index(drop=True)
+
+    result.attrs.update(
+        {
             "edge_size": edge_size,
             "scale": scale,
-            "bands": bands,
+            "bands": _S2_BANDS,
             "collection": collection
         }
     )
     return result
-
@@ -1,6 +1,8 @@
+import numpy as np
+import pandas as pd
 import utm
 
-from cubexpress.geotyping import RasterTransform
+from cubexpress.geotyping import GEOTRANSFORM_KEYS, RasterTransform
 
 # Define your GeotransformDict type if not already defined
 GeotransformDict = dict[str, float]
@@ -71,3 +73,128 @@ def lonlat2rt(lon: float, lat: float, edge_size: int, scale: int) -> RasterTrans
     return RasterTransform(
         crs=crs, geotransform=geotransform, width=edge_size, height=edge_size
     )
+
+
+def _utm_zones(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """
+    Vectorized UTM zone numbers, including the Norway and Svalbard exceptions.
+
+    Args:
+        lon (np.ndarray): Longitudes.
+        lat (np.ndarray): Latitudes.
+
+    Returns:
+        np.ndarray: Zone number (1-60) of every point, as :func:`utm.from_latlon` picks it.
+    """
+    lon = (np.asarray(lon, dtype=float) % 360 + 540) % 360 - 180
+    lat = np.asarray(lat, dtype=float)
+    zones = ((lon + 180) / 6).astype(int) + 1
+
+    norway = (lat >= 56) & (lat < 64) & (lon >= 3) & (lon < 12)
+    svalbard = (lat >= 72) & (lat <= 84) & (lon >= 0) & (lon < 42)
+    zones = np.where(norway, 32, zones)
+    zones = np.where(
+        svalbard, np.select([lon < 9, lon < 21, lon < 33], [31, 33, 35], 37), zones
+    )
+    return zones
+
+
+def geo2utm_many(
+    lon: np.ndarray, lat: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Array version of :func:`geo2utm`.
+
+    Zones are computed for all points at once and every (zone, hemisphere)
+    group is projected in a single call, with the same formulas as the scalar
+    version.
+
+    Args:
+        lon (np.ndarray): Longitudes.
+        lat (np.ndarray): Latitudes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: UTM coordinates (x, y) and the
+        EPSG code (e.g. ``32718``) of every point.
+    """
+    lon = np.atleast_1d(np.asarray(lon, dtype=float))
+    lat = np.atleast_1d(np.asarray(lat, dtype=float))
+    if lon.shape != lat.shape:
+        raise ValueError("lon and lat must have the same shape")
+
+    zones = _utm_zones(lon, lat)
+    epsg = np.where(lat >= 0, 32600, 32700) + zones
+
+    x = np.empty_like(lon)
+    y = np.empty_like(lat)
+    # sort once and walk the groups instead of masking per zone
+    order = np.argsort(epsg, kind="stable")
+    bounds = np.flatnonzero(np.diff(epsg[order])) + 1
+    for rows in np.split(order, bounds):
+        if not len(rows):
+            continue
+        code = int(epsg[rows[0]])
+        x[rows], y[rows], _, _ = utm.from_latlon(
+            lat[rows],
+            lon[rows],
+            force_zone_number=code % 100,
+            force_northern=code < 32700,
+        )
+    return x, y, epsg
+
+
+def lonlat2rt_many(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    edge_size: int | np.ndarray,
+    scale: int | np.ndarray,
+) -> pd.DataFrame:
+    """
+    Array version of :func:`lonlat2rt`.
+
+    Args:
+        lon (np.ndarray): Longitudes.
+        lat (np.ndarray): Latitudes.
+        edge_size (int | np.ndarray): Width and height in pixels, per point or shared.
+        scale (int | np.ndarray): Spatial resolution in meters per pixel, per point or shared.
+
+    Returns:
+        pd.DataFrame: One row per point with ``crs``, ``width``, ``height`` and the
+        geotransform parameters (``scaleX`` ... ``translateY``), ready for
+        :meth:`RequestSet.from_transforms`.
+
+    Example:
+        >>> import numpy as np
+        >>> import cubexpress
+        >>> table = cubexpress.lonlat2rt_many(
+        ...     lon=np.array([-76.0, 10.0]),
+        ...     lat=np.array([40.0, 45.0]),
+        ...     edge_size=512,
+        ...     scale=30
+        ... )
+    """
+    x, y, epsg = geo2utm_many(lon, lat)
+    edge_size = np.broadcast_to(np.asarray(edge_size), x.shape)
+    scale = np.broadcast_to(np.asarray(scale), x.shape)
+    half_extent = (edge_size * scale) / 2
+
+    codes, groups = np.unique(epsg, return_inverse=True)
+    crs = pd.Categorical.from_codes(
+        groups.reshape(-1), categories=[f"EPSG:{code}" for code in codes]
+    )
+    columns = dict(
+        zip(
+            GEOTRANSFORM_KEYS,
+            (
+                scale,
+                np.zeros_like(x),
+                x - half_extent,
+                -scale,  # Y-axis is inverted in geospatial images
+                np.zeros_like(y),
+                y + half_extent,
+            ),
+        )
+    )
+    return pd.DataFrame(
+        {"crs": crs, "width": edge_size, "height": edge_size, **columns}
+    )
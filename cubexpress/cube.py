@@ -1,11 +1,13 @@
 """High-level helpers for tiled GeoTIFF downloads.
 
-The module provides two thread-friendly wrappers:
+The module provides three thread-friendly wrappers:
 
 * **get_geotiff** – download a single manifest, auto-tiling on EE pixel-count
   errors.
+* **get_array** – same, but into a NumPy array instead of a file.
 * **get_cube** – iterate over a ``RequestSet`` (or similar) and build a local
-  raster “cube” in parallel.
+  raster “cube” in parallel, as GeoTIFFs, one memory-mapped ``.npy`` or one
+  chunked Zarr store.
 
 The core download/split logic lives in *cubexpress.downloader* and
 *cubexpress.geospatial*; here we merely orchestrate it.
@@ -13,24 +15,34 @@ The core download/split logic lives in *cubexpress.downloader* and
 
 from __future__ import annotations
 
+import collections
+import os
 import pathlib
 import concurrent.futures
 from typing import Dict, Any
 import ee
+import numpy as np
 
 
-from cubexpress.downloader import download_manifest, download_manifests
+from cubexpress.downloader import (
+    download_manifest,
+    download_manifest_array,
+    download_manifests,
+    download_manifests_array,
+)
 from cubexpress.geospatial import quadsplit_manifest, calculate_cell_size
 from cubexpress.request import table_to_requestset
+from cubexpress.zarrstore import ZarrStore
 import pandas as pd
 
 
 def get_geotiff(
     manifest: Dict[str, Any],
     full_outname: pathlib.Path | str,
-    join: bool = True,
+    join: bool | str = True,
     nworks: int = 4,
     verbose: bool = True,
+    recompress: bool = True,
 ) -> None:
     """Download *manifest* to *full_outname*, retrying with tiled requests.
 
@@ -40,36 +52,223 @@ def get_geotiff(
         Earth Engine download manifest returned by cubexpress.
     full_outname
         Final ``.tif`` path (created/overwritten).
+    join
+        How the tiles of a split request are assembled; see
+        :func:`cubexpress.downloader.download_manifests`.
     nworks
         Maximum worker threads when the image must be split; default **4**.
+    recompress
+        Re-encode the EE response as a compressed GeoTIFF (default) or save
+        it untouched; see :func:`cubexpress.downloader.download_manifest`.
     """
     full_outname = pathlib.Path(full_outname)
     try:
-        download_manifest(manifest, full_outname)
+        download_manifest(manifest, full_outname, recompress)
     except ee.ee_exception.EEException as err:
 
         size = manifest["grid"]["dimensions"]["width"]  # square images assumed
         cell_w, cell_h, power = calculate_cell_size(str(err), size)
         tiled = quadsplit_manifest(manifest, cell_w, cell_h, power)
-        download_manifests(tiled, full_outname, join, nworks)
+        download_manifests(tiled, full_outname, join, nworks, recompress)
 
     if verbose:
         print(f"Downloaded {full_outname}")
 
 
+def get_array(
+    manifest: Dict[str, Any],
+    out: np.ndarray,
+    nworks: int = 4,
+) -> bool:
+    """Download *manifest* into *out*, retrying with tiled requests.
+
+    Parameters
+    ----------
+    manifest
+        Earth Engine download manifest returned by cubexpress.
+    out
+        Destination array of shape ``(band, height, width)``, typically one
+        time slice of a memory-mapped cube.
+    nworks
+        Maximum worker threads when the image must be split; default **4**.
+
+    Returns
+    -------
+    bool
+        *True* when every pixel was downloaded.
+    """
+    try:
+        download_manifest_array(manifest, out)
+    except ee.ee_exception.EEException as err:
+        size = manifest["grid"]["dimensions"]["width"]  # square images assumed
+        cell_w, cell_h, power = calculate_cell_size(str(err), size)
+        tiled = quadsplit_manifest(manifest, cell_w, cell_h, power)
+        return download_manifests_array(tiled, out, nworks)
+    return True
+
+
+def _single_grid(requests, output: str) -> tuple[int, int, tuple, str, tuple]:
+    """Return ``(width, height, geotransform, crs, bands)`` shared by *requests*."""
+    columns = requests._columns
+    grids = {
+        (int(w), int(h), tuple(gt), columns.crs_values[c], tuple(columns.band_values[b]))
+        for w, h, gt, c, b in zip(
+            columns.width, columns.height, columns.geotransform.tolist(),
+            columns.crs_codes, columns.band_codes,
+        )
+    }
+    if len(grids) != 1:
+        raise ValueError(
+            f"output={output!r} needs every request on the same grid and bands; "
+            "call get_cube once per site."
+        )
+    return grids.pop()
+
+
+def _memmap_cube(
+    requests,
+    table: pd.DataFrame,
+    outfolder: pathlib.Path,
+    nworks: int,
+    verbose: bool,
+    cache: bool,
+) -> pd.DataFrame:
+    """Download *requests* into ``outfolder/cube.npy`` (see :func:`get_cube`)."""
+    width, height, _, _, bands = _single_grid(requests, "memmap")
+    shape = (len(table), len(bands), height, width)
+
+    cube_path = outfolder / "cube.npy"
+    index_path = outfolder / "cube.parquet"
+    index = table[["id", "date", "cs_cdf"]].reset_index(drop=True)
+    index["complete"] = False
+
+    # ─── 1. Reuse a previous cube of the same requests, or allocate one ────
+    cube = None
+    if cache and cube_path.exists() and index_path.exists():
+        previous = pd.read_parquet(index_path)
+        cube = np.lib.format.open_memmap(cube_path, mode="r+")
+        if cube.shape == shape and previous["id"].tolist() == index["id"].tolist():
+            index["complete"] = previous["complete"].to_numpy()
+        else:
+            del cube
+            cube = None
+    if cube is None:
+        outfolder.mkdir(parents=True, exist_ok=True)
+        cube = np.lib.format.open_memmap(cube_path, mode="w+", dtype="uint16", shape=shape)
+
+    # ─── 2. Download each date into its time slice ─────────────────────────
+    def _fetch(slot: int) -> bool:
+        # a fresh memmap reads as zeros: start every pending slot as nodata
+        cube[slot] = 65535
+        return get_array(requests.manifest(slot), cube[slot], nworks)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nworks) as pool:
+        futures = {
+            pool.submit(_fetch, slot): slot
+            for slot in np.flatnonzero(~index["complete"].to_numpy())
+        }
+        for fut in concurrent.futures.as_completed(futures):
+            slot = futures[fut]
+            try:
+                index.at[slot, "complete"] = fut.result()
+            except Exception as exc:  # noqa: BLE001 – log and keep going
+                print(f"Download error: {exc}")
+            else:
+                if verbose:
+                    print(f"Downloaded {index.at[slot, 'id']} into {cube_path}[{slot}]")
+
+    # ─── 3. Flush pixels, then the index that vouches for them ─────────────
+    cube.flush()
+    del cube
+    partial = index_path.with_name(index_path.name + ".part")
+    index.to_parquet(partial, index=False)
+    os.replace(partial, index_path)
+
+    index.insert(0, "full_outname", cube_path)
+    return index
+
+
+def _zarr_cube(
+    requests,
+    table: pd.DataFrame,
+    outfolder: pathlib.Path,
+    nworks: int,
+    verbose: bool,
+    cache: bool,
+    chunks: str | tuple[int, int, int, int],
+) -> pd.DataFrame:
+    """Download *requests* into ``outfolder/cube.zarr`` (see :func:`get_cube`)."""
+    width, height, geotransform, crs, bands = _single_grid(requests, "zarr")
+    store = ZarrStore.open(
+        outfolder / "cube.zarr", bands, height, width, crs, geotransform, chunks
+    )
+
+    # ─── 1. Reserve a time slot per request (existing ids keep theirs) ─────
+    slots = store.register(table["id"].tolist(), table["date"].tolist(), table["cs_cdf"].tolist())
+    complete = store.index()["complete"].to_numpy()
+
+    # ─── 2. Download each pending date, then write and flag its chunks ─────
+    def _fetch(position: int) -> tuple[np.ndarray, bool]:
+        data = np.full((len(bands), height, width), 65535, dtype="uint16")
+        return data, get_array(requests.manifest(position), data, nworks)
+
+    # dates sharing a time chunk are buffered and written together once all
+    # of them are in, so a shared chunk is recompressed once, not per date
+    ct = store.chunks()[0]
+    pending = [p for p, slot in enumerate(slots) if not (cache and complete[slot])]
+    remaining = collections.Counter(int(slots[p]) // ct for p in pending)
+    batches: dict[int, list[tuple[int, np.ndarray, bool]]] = {}
+
+    def _flush(group: int) -> None:
+        batch = batches.pop(group, [])
+        if not batch:
+            return
+        try:
+            store.write_many([s for s, _, _ in batch], [d for _, d, _ in batch])
+        except Exception as exc:  # noqa: BLE001 – log and keep going
+            print(f"Write error: {exc}")
+            return
+        # flagged as soon as written: an interrupted run keeps these dates
+        store.mark_complete([s for s, _, done in batch if done])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nworks) as pool:
+        futures = {pool.submit(_fetch, position): position for position in pending}
+        for fut in concurrent.futures.as_completed(futures):
+            position = futures[fut]
+            group = int(slots[position]) // ct
+            try:
+                data, done = fut.result()
+            except Exception as exc:  # noqa: BLE001 – log and keep going
+                print(f"Download error: {exc}")
+            else:
+                batches.setdefault(group, []).append((slots[position], data, done))
+                if verbose:
+                    print(f"Downloaded {table['id'].iat[position]} into {store.path}")
+            remaining[group] -= 1
+            if not remaining[group]:
+                _flush(group)
+
+    index = store.index().iloc[slots].reset_index(names="slot")
+    index.insert(0, "full_outname", store.path)
+    return index
+
+
 def get_cube(
     table: pd.DataFrame,
     outfolder: pathlib.Path | str,
     mosaic: bool = True,
-    join: bool = True,
+    join: bool | str = True,
     nworks: int = 4,
     verbose: bool = True,
-    cache: bool = True
-) -> None:
+    cache: bool = True,
+    recompress: bool = True,
+    output: str = "geotiff",
+    chunks: str | tuple[int, int, int, int] = "time",
+) -> pd.DataFrame:
     """Download every request in *requests* to *outfolder* using a thread pool.
 
-    Each row in ``requests._dataframe`` must expose ``manifest`` and ``id``.
-    Resulting files are named ``{id}.tif``.
+    Each request of the :class:`RequestSet` built from *table* is written to
+    ``{id}.tif``; manifests are built one at a time as requests are queued.
 
     Parameters
     ----------
@@ -77,9 +276,49 @@ def get_cube(
         A ``RequestSet`` or object with an internal ``_dataframe`` attribute.
     outfolder
         Folder where the GeoTIFFs will be written (created if absent).
+    join
+        ``True``/``"window"``, ``"merge"``, ``"vrt"`` or ``False``; see
+        :func:`cubexpress.downloader.download_manifests`. With ``"vrt"``,
+        split requests are written as ``{id}.vrt`` plus an ``{id}/`` tile
+        folder, and ``full_outname`` points at the VRT.
     nworks
         Pool size for concurrent downloads; default **4**.
+    recompress
+        Set to ``False`` to save the EE responses untouched when download
+        throughput is bound by local compression, and re-encode them later
+        with :func:`cubexpress.downloader.recompress_geotiffs`.
+    output
+        ``"geotiff"`` (default) writes one ``{id}.tif`` per request.
+        ``"memmap"`` requests ``NUMPY_NDARRAY`` pixels and writes every date
+        into a slot of one ``outfolder/cube.npy`` array of shape
+        ``(time, band, y, x)`` (``uint16``), opened with
+        ``np.load(path, mmap_mode="r")``. A sidecar ``cube.parquet`` lists
+        ``id``, ``date``, ``cs_cdf`` and ``complete`` for each slot; slots
+        not ``complete`` hold nodata (65535) where pixels are missing and are
+        fetched again on the next call when *cache* is set. All requests must share one grid
+        (one site); *join* and *recompress* are ignored.
+        ``"zarr"`` writes every date into one chunked, zlib-compressed
+        Zarr v2 store ``outfolder/cube.zarr`` (see
+        :class:`cubexpress.zarrstore.ZarrStore`). Later calls append new
+        dates along ``time``, and concurrent calls on the same store are
+        safe. The same single-grid restriction applies.
+    chunks
+        Chunk layout of a new ``"zarr"`` store: ``"time"`` (one date per
+        chunk, cheap appends and image reads), ``"space"`` (many dates per
+        small window, cheap per-pixel time series) or an explicit
+        ``(time, band, y, x)`` shape. Dates sharing a time chunk are held
+        in memory until all of them are downloaded and written together;
+        each date is flagged ``complete`` as soon as it is written.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``full_outname``, ``cs_cdf`` and ``date`` of every request; with
+        ``output="memmap"`` or ``"zarr"``, the cube index of the requests,
+        with ``full_outname`` set to the cube.
     """
+    if output not in ("geotiff", "memmap", "zarr"):
+        raise ValueError(f"output must be 'geotiff', 'memmap' or 'zarr', got {output!r}")
 
     requests = table_to_requestset(
         table=table, 
@@ -88,21 +327,30 @@ def get_cube(
     
     outfolder = pathlib.Path(outfolder).expanduser().resolve()
 
+    # manifests are built one at a time from the columnar request set
+    table = requests.to_frame(manifests=False)
+
+    if output == "memmap":
+        return _memmap_cube(requests, table, outfolder, nworks, verbose, cache)
+    if output == "zarr":
+        return _zarr_cube(requests, table, outfolder, nworks, verbose, cache, chunks)
+
     with concurrent.futures.ThreadPoolExecutor(max_workers=nworks) as pool:
         futures = []
-        for _, row in requests._dataframe.iterrows():
-            outname = pathlib.Path(outfolder) / f"{row.id}.tif"
-            if outname.exists() and cache:
+        for index, request_id in enumerate(table["id"]):
+            outname = pathlib.Path(outfolder) / f"{request_id}.tif"
+            if cache and (outname.exists() or outname.with_suffix(".vrt").exists()):
                 continue
             outname.parent.mkdir(parents=True, exist_ok=True)
             futures.append(
                 pool.submit(
                     get_geotiff, 
-                    row.manifest, 
+                    requests.manifest(index), 
                     outname, 
                     join, 
                     nworks, 
-                    verbose
+                    verbose,
+                    recompress,
                 )
             )
 
@@ -112,8 +360,14 @@ def get_cube(
             except Exception as exc:  # noqa: BLE001 – log and keep going
                 print(f"Download error: {exc}")
 
-    download_df = requests._dataframe[["outname", "cs_cdf", "date"]].copy()
-    download_df["outname"] = outfolder / requests._dataframe["outname"]
+    download_df = table[["outname", "cs_cdf", "date"]].copy()
+    download_df["outname"] = outfolder / table["outname"]
+    if join == "vrt":
+        # split requests were indexed by a VRT instead of a merged GeoTIFF
+        download_df["outname"] = [
+            vrt if (vrt := path.with_suffix(".vrt")).exists() else path
+            for path in download_df["outname"]
+        ]
     download_df.rename(columns={"outname": "full_outname"}, inplace=True)
 
     return download_df
\ No newline at end of file
@@ -1,113 +1,613 @@
 """Low-level download helpers for Earth Engine manifests.
 
-Only two public callables are exposed:
+Three public callables are exposed:
 
 * :func:`download_manifest` – fetch a single manifest and write one GeoTIFF.
 * :func:`download_manifests` – convenience wrapper to parallel-download a list
-  of manifests with a thread pool.
+  of manifests with a thread pool, optionally assembling them into one file.
+* :func:`recompress_geotiffs` – re-encode GeoTIFFs saved as raw EE responses
+  (``recompress=False``) in a separate, batched stage.
+
+:func:`download_manifest_array` and :func:`download_manifests_array` are
+their array counterparts: they request ``NUMPY_NDARRAY`` pixels and copy them
+into a caller-provided (e.g. memory-mapped) array instead of a file.
 
 Both functions are fully I/O bound; no return value is expected.
 """
 
 from __future__ import annotations
 
-import json
+import os
 import pathlib
+import queue
+import threading
 import concurrent.futures
-from copy import deepcopy
-from typing import Any, Dict, List
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable
 
 import ee
+import numpy as np
 import rasterio as rio
 from rasterio.io import MemoryFile
+from rasterio.transform import Affine
+from rasterio.windows import Window
 import logging
 from rasterio.merge import merge
 from rasterio.enums import Resampling
-import os
+
+from cubexpress.expressions import decode_expression
 import shutil
 import tempfile
 
-os.environ['CPL_LOG_ERRORS'] = 'OFF'
 logging.getLogger('rasterio._env').setLevel(logging.ERROR)
 
-def download_manifest(ulist: Dict[str, Any], full_outname: pathlib.Path) -> None:
-    """Download *ulist* and save it as *full_outname*.
+# GDAL options for every rasterio call of this module; scoped with rio.Env
+# rather than written to os.environ at import.
+_GDAL_ENV = {"CPL_LOG_ERRORS": "OFF"}
 
-    The manifest must include either an ``assetId`` or an ``expression``
-    (serialized EE image). RasterIO is used to write a tiled, compressed
-    GeoTIFF; the function is silent apart from the final ``print``.
-    """
+# Creation options of every GeoTIFF written by cubexpress
+_GTIFF_PROFILE = dict(
+    driver="GTiff",
+    tiled=True,
+    interleave="band",
+    blockxsize=256, # TODO: Creo que es 128 (por de la superresolucion)
+    blockysize=256,
+    compress="ZSTD",
+    # zstd_level=13,
+    predictor=2,
+    num_threads=20,
+    nodata=65535,
+    dtype="uint16",
+    photometric="MINISBLACK",
+)
+
+def _request_pixels(ulist: Dict[str, Any]) -> bytes:
+    """Fetch the raw EE response for *ulist* (``getPixels``/``computePixels``)."""
     if "assetId" in ulist:
-        images_bytes = ee.data.getPixels(ulist)
+        return ee.data.getPixels(ulist)
     elif "expression" in ulist:
-        ee_image = ee.deserializer.decode(json.loads(ulist["expression"]))
-        ulist_deep = deepcopy(ulist)
-        ulist_deep["expression"] = ee_image
-        images_bytes = ee.data.computePixels(ulist_deep)
+        # tiles of one request share the decoded graph; computePixels copies
+        # the top-level dict itself, so a shallow copy is enough
+        ee_image = decode_expression(ulist["expression"])
+        return ee.data.computePixels({**ulist, "expression": ee_image})
     else:  # pragma: no cover
         raise ValueError("Manifest does not contain 'assetId' or 'expression'")
 
-    with MemoryFile(images_bytes) as memfile:
+
+def _write_pixels(images_bytes: bytes, full_outname: pathlib.Path) -> None:
+    """Re-encode an EE GeoTIFF response as a tiled, compressed GeoTIFF.
+
+    Like :func:`_write_raw`, the file is built under a ``.part`` name and
+    renamed once complete.
+    """
+    partial = full_outname.with_name(full_outname.name + ".part")
+    with rio.Env(**_GDAL_ENV), MemoryFile(images_bytes) as memfile:
         with memfile.open() as src:
             profile = src.profile
-            profile.update(
-                driver="GTiff", 
-                tiled=True,
-                interleave="band",
-                blockxsize=256, # TODO: Creo que es 128 (por de la superresolucion)
-                blockysize=256,
-                compress="ZSTD",
-                # zstd_level=13,
-                predictor=2,
-                num_threads=20,
-                nodata=65535,
-                dtype="uint16",
-                count=13,
-                photometric="MINISBLACK"
-            )
+            profile.update(_GTIFF_PROFILE, count=13)
+
+            with rio.open(partial, "w", **profile) as dst:
+                dst.write(src.read())
+    os.replace(partial, full_outname)
+
+
+def _write_raw(images_bytes: bytes, full_outname: pathlib.Path) -> None:
+    """Save an EE GeoTIFF response as-is, without decoding it.
+
+    The bytes go to a ``.part`` file renamed once complete, so a partial
+    write is never mistaken for a finished download.
+    """
+    partial = full_outname.with_name(full_outname.name + ".part")
+    with open(partial, "wb") as f:
+        f.write(images_bytes)
+    os.replace(partial, full_outname)
+
+
+def _save_pixels(
+    images_bytes: bytes, full_outname: pathlib.Path, recompress: bool = True
+) -> None:
+    """Write an EE response with :func:`_write_pixels` or :func:`_write_raw`."""
+    if recompress:
+        _write_pixels(images_bytes, full_outname)
+    else:
+        _write_raw(images_bytes, full_outname)
+
+
+def _read_pixels(images_bytes: bytes) -> np.ndarray:
+    """Decode an EE GeoTIFF response into a ``(band, y, x)`` array."""
+    with rio.Env(**_GDAL_ENV), MemoryFile(images_bytes) as memfile:
+        with memfile.open() as src:
+            return src.read()
+
+
+def download_manifest(
+    ulist: Dict[str, Any], full_outname: pathlib.Path, recompress: bool = True
+) -> None:
+    """Download *ulist* and save it as *full_outname*.
+
+    The manifest must include either an ``assetId`` or an ``expression``
+    (serialized EE image). By default RasterIO re-encodes the response as a
+    tiled, ZSTD-compressed GeoTIFF; with ``recompress=False`` the response
+    bytes are written to disk untouched (see :func:`recompress_geotiffs` to
+    compress them later). The function is silent apart from the final
+    ``print``.
+    """
+    _save_pixels(_request_pixels(ulist), full_outname, recompress)
+
+
+def recompress_geotiffs(
+    paths: Iterable[pathlib.Path | str], max_workers: int = 4
+) -> list[pathlib.Path]:
+    """Re-encode GeoTIFFs in place as tiled, ZSTD-compressed GeoTIFFs.
+
+    This is the deferred half of ``recompress=False`` downloads: run it once
+    the network-bound stage is over, or on a different machine.
+
+    Parameters
+    ----------
+    paths
+        GeoTIFFs to rewrite, e.g. the ``full_outname`` column returned by
+        :func:`cubexpress.cube.get_cube`. Paths not ending in ``.tif`` or
+        ``.tiff`` (such as ``join="vrt"`` mosaics) are skipped with a
+        message.
+    max_workers
+        Files re-encoded concurrently; default **4**.
+
+    Returns
+    -------
+    list[pathlib.Path]
+        The files that were rewritten.
+    """
 
-            with rio.open(full_outname, "w", **profile) as dst:
+    def _recompress(path: pathlib.Path) -> pathlib.Path:
+        partial = path.with_name(path.name + ".part")
+        with rio.Env(**_GDAL_ENV), rio.open(path) as src:
+            profile = src.profile
+            profile.update(_GTIFF_PROFILE, count=src.count)
+            with rio.open(partial, "w", **profile) as dst:
                 dst.write(src.read())
+        os.replace(partial, path)
+        return path
+
+    geotiffs = []
+    for path in map(pathlib.Path, paths):
+        if path.suffix.lower() in (".tif", ".tiff"):
+            geotiffs.append(path)
+        else:
+            print(f"Skipping {path}: not a GeoTIFF")  # noqa: T201
+
+    done = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_recompress, path): path for path in geotiffs}
+        for fut in concurrent.futures.as_completed(futures):
+            try:
+                done.append(fut.result())
+            except Exception as exc:  # noqa: BLE001
+                print(f"Could not recompress {futures[fut]}: {exc}")  # noqa: T201
+    return done
+
 
 def download_manifests(
     manifests: list[Dict[str, Any]],
     full_outname: pathlib.Path,
-    join: bool = True,
+    join: bool | str = True,
     max_workers: int = 4,
-) -> None:
+    recompress: bool = True,
+) -> pathlib.Path:
     """Download every manifest in *manifests* concurrently.
 
-    Each output file is saved in the folder
-    ``full_outname.parent/full_outname.stem`` with names ``000000.tif``,
-    ``000001.tif`` … according to the list order.
+    Parameters
+    ----------
+    manifests
+        Tiles of one request, as returned by
+        :func:`cubexpress.geospatial.quadsplit_manifest`.
+    full_outname
+        Final ``.tif`` path of the request.
+    join
+        How the tiles are assembled:
+
+        * ``True`` / ``"window"`` – write each tile straight into its window
+          of *full_outname* as it arrives (default). Falls back to
+          ``"merge"`` when the tiles do not lie on an axis-aligned grid.
+          Nothing is written, and :class:`RuntimeError` is raised, when a
+          tile fails to download.
+        * ``"merge"`` – save the tiles to a temporary folder and mosaic
+          them with :func:`rasterio.merge.merge`.
+        * ``False`` – like ``"merge"``, but the tiles are staged in
+          ``full_outname.parent/full_outname.stem`` as ``000000.tif``,
+          ``000001.tif`` … according to the list order.
+        * ``"vrt"`` – keep the tiles in ``full_outname.parent/full_outname.stem``
+          and write a GDAL VRT mosaic of them as
+          ``full_outname.with_suffix(".vrt")``; nothing is merged. The VRT
+          is not written, and :class:`RuntimeError` is raised, when a tile
+          fails to download; the finished tiles are reused by the next call.
+    max_workers
+        Download threads; default **4**.
+    recompress
+        Re-encode each tile saved to disk (see :func:`download_manifest`).
+        Ignored by ``"window"``, which always encodes the assembled raster.
+
+    Returns
+    -------
+    pathlib.Path
+        The raster the tiles have been assembled into: *full_outname*, or
+        the ``.vrt`` mosaic with ``join="vrt"``.
+    """
+    join, windows = _join_mode(join, manifests)
+    if join == "window":
+        return _assemble_tiles(manifests, windows, full_outname, max_workers)
+    if join == "vrt":
+        return _tiles_vrt(manifests, windows, full_outname, max_workers, recompress)
+
+    if not join:
+        dir_path = full_outname.parent / full_outname.stem
+        _download_tiles(manifests, dir_path, max_workers, recompress)
+        return _join_tiles(dir_path, full_outname)
+    with tempfile.TemporaryDirectory(prefix="s2tmp_") as tmp_dir:
+        dir_path = pathlib.Path(tmp_dir) / full_outname.stem
+        _download_tiles(manifests, dir_path, max_workers, recompress)
+        return _join_tiles(dir_path, full_outname)
+
+
+def _join_mode(
+    join: bool | str, manifests: list[Dict[str, Any]]
+) -> tuple[bool | str, list[Window] | None]:
+    """Resolve *join* for *manifests* (see :func:`download_manifests`).
+
+    Returns ``"window"``, ``"vrt"``, ``"merge"`` or ``False``, and the tile
+    windows for the first two. Tiles off an axis-aligned grid fall back to
+    ``"merge"``.
     """
-    # full_outname = pathlib.Path("/home/contreras/Documents/GitHub/cubexpress/cubexpress_test/2017-08-19_6mfrw_18LVN.tif")
-    original_dir = full_outname.parent
-    if join:
-        tmp_dir = pathlib.Path(tempfile.mkdtemp(prefix="s2tmp_"))
-        full_outname = tmp_dir / full_outname.name
+    _check_join(join)
+    if join is True:
+        join = "window"
+    if join in ("window", "vrt"):
+        windows = _tile_windows(manifests)
+        if windows is not None:
+            return join, windows
+        join = "merge"
+    return join, None
 
+
+def _check_join(join: bool | str) -> None:
+    """Raise :class:`ValueError` unless *join* is a mode of :func:`download_manifests`."""
+    if not (isinstance(join, bool) or join in ("window", "merge", "vrt")):
+        raise ValueError(
+            f"join must be True, False, 'window', 'merge' or 'vrt', got {join!r}"
+        )
+
+
+def _download_tiles(
+    manifests: list[Dict[str, Any]],
+    folder: pathlib.Path,
+    max_workers: int,
+    recompress: bool = True,
+    reuse: bool = False,
+) -> list[int]:
+    """Download *manifests* to ``folder/000000.tif`` … and list the successes.
+
+    With *reuse*, tiles already in *folder* count as done and are not
+    requested again.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    done = [i for i in range(len(manifests)) if reuse and (folder / f"{i:06d}.tif").exists()]
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = []
+        futures = {
+            executor.submit(
+                download_manifest, umanifest, folder / f"{index:06d}.tif", recompress
+            ): index
+            for index, umanifest in enumerate(manifests)
+            if index not in done
+        }
 
-        for index, umanifest in enumerate(manifests):
-            folder = full_outname.parent / full_outname.stem
-            folder.mkdir(parents=True, exist_ok=True)
-            outname = folder / f"{index:06d}.tif"
-            futures.append(executor.submit(download_manifest, umanifest, outname))
+        for fut in concurrent.futures.as_completed(futures):
+            try:
+                fut.result()
+            except Exception as exc:  # noqa: BLE001
+                print(f"Error en una de las descargas: {exc}")  # noqa: T201
+            else:
+                done.append(futures[fut])
+    return sorted(done)
+
+
+def _tile_windows(manifests: list[Dict[str, Any]]) -> list[Window] | None:
+    """Place every tile of *manifests* in the pixel grid of the first one.
+
+    Returns *None* when a tile is rotated, uses another pixel size or CRS,
+    or is not offset by a whole number of pixels.
+    """
+    grid = manifests[0]["grid"]
+    aff = grid["affineTransform"]
+    if aff["shearX"] or aff["shearY"]:
+        return None
+    x0 = min(m["grid"]["affineTransform"]["translateX"] for m in manifests)
+    y0 = max(m["grid"]["affineTransform"]["translateY"] for m in manifests)
+    if aff["scaleY"] > 0:
+        y0 = min(m["grid"]["affineTransform"]["translateY"] for m in manifests)
+
+    windows = []
+    for manifest in manifests:
+        tile = manifest["grid"]
+        tile_aff = tile["affineTransform"]
+        if tile.get("crsCode") != grid.get("crsCode") or any(
+            tile_aff[k] != aff[k] for k in ("scaleX", "scaleY", "shearX", "shearY")
+        ):
+            return None
+        col = (tile_aff["translateX"] - x0) / aff["scaleX"]
+        row = (tile_aff["translateY"] - y0) / aff["scaleY"]
+        if abs(col - round(col)) > 1e-6 or abs(row - round(row)) > 1e-6:
+            return None
+        dims = tile["dimensions"]
+        windows.append(Window(round(col), round(row), dims["width"], dims["height"]))
+    return windows
+
+
+class _TileWriter:
+    """Write tiles into their windows of one GeoTIFF from a dedicated thread.
+
+    Tiles are handed over with :meth:`put` through a bounded queue of
+    *maxsize* items, so memory stays bounded however fast they arrive. The
+    raster is built under a ``.part`` name and only renamed to *outname* by
+    :meth:`close` once every tile has been written.
+    """
+
+    def __init__(
+        self,
+        manifests: list[Dict[str, Any]],
+        windows: list[Window],
+        outname: pathlib.Path,
+        maxsize: int,
+    ) -> None:
+        grid = manifests[0]["grid"]
+        aff = grid["affineTransform"]
+        self.profile = dict(
+            _GTIFF_PROFILE,
+            count=len(manifests[0]["bandIds"]),
+            width=max(w.col_off + w.width for w in windows),
+            height=max(w.row_off + w.height for w in windows),
+            crs=grid["crsCode"],
+            transform=Affine(
+                aff["scaleX"], 0.0, aff["translateX"] - windows[0].col_off * aff["scaleX"],
+                0.0, aff["scaleY"], aff["translateY"] - windows[0].row_off * aff["scaleY"],
+            ),
+        )
+        self.outname = outname
+        self.partial = outname.with_name(outname.name + ".part")
+        self.n_tiles = len(manifests)
+        self.errors: list[BaseException] = []
+        self._tiles: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._failure: list[BaseException] = []
+
+        outname.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._write, name=f"cubexpress-writer-{outname.stem}"
+        )
+        self._thread.start()
+
+    def _write(self) -> None:
+        # GDAL datasets are not thread-safe: only this thread touches *dst*
+        try:
+            with rio.Env(**_GDAL_ENV), rio.open(self.partial, "w", **self.profile) as dst:
+                while (item := self._tiles.get()) is not None:
+                    window, data = item
+                    dst.write(data, window=window)
+        except BaseException as exc:  # noqa: BLE001 – re-raised by close()
+            self._failure.append(exc)
+            # keep draining so producers never block on a dead writer
+            while self._tiles.get() is not None:
+                pass
 
+    def put(self, window: Window, data: np.ndarray) -> None:
+        """Queue the ``(band, y, x)`` *data* of one tile for *window*."""
+        self._tiles.put((window, data))
+
+    def fail(self, exc: BaseException) -> None:
+        """Record a tile that could not be fetched."""
+        self.errors.append(exc)
+
+    def close(self, publish: bool = True) -> pathlib.Path:
+        """Wait for the queued tiles and publish the raster.
+
+        The ``.part`` file is deleted instead when *publish* is false or any
+        tile failed; a failed tile raises :class:`RuntimeError`.
+        """
+        self._tiles.put(None)
+        self._thread.join()
+        if not publish or self._failure or self.errors:
+            self.partial.unlink(missing_ok=True)
+            if not publish:
+                return self.outname
+            if self._failure:
+                raise self._failure[0]
+            raise RuntimeError(
+                f"{len(self.errors)} of {self.n_tiles} tiles of {self.outname.name} "
+                "failed to download; nothing was written"
+            ) from self.errors[0]
+        os.replace(self.partial, self.outname)
+        return self.outname
+
+
+def _assemble_tiles(
+    manifests: list[Dict[str, Any]],
+    windows: list[Window],
+    outname: pathlib.Path,
+    max_workers: int,
+) -> pathlib.Path:
+    """Download *manifests* and write each tile into its window of *outname*.
+
+    Download threads decode the tiles and hand them to a :class:`_TileWriter`,
+    so at most about ``2 * max_workers`` tiles are held in memory and no
+    temporary files are written. If any tile fails, *outname* is not written
+    and :class:`RuntimeError` is raised.
+    """
+    writer = _TileWriter(manifests, windows, outname, max_workers)
+
+    def _fetch(manifest: Dict[str, Any], window: Window) -> None:
+        writer.put(window, _read_pixels(_request_pixels(manifest)))
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_fetch, manifest, window)
+                for manifest, window in zip(manifests, windows)
+            ]
+            for fut in concurrent.futures.as_completed(futures):
+                try:
+                    fut.result()
+                except Exception as exc:  # noqa: BLE001
+                    print(f"Error en una de las descargas: {exc}")  # noqa: T201
+                    writer.fail(exc)
+    except BaseException:
+        writer.close(publish=False)
+        raise
+    return writer.close()
+
+
+def _tiles_vrt(
+    manifests: list[Dict[str, Any]],
+    windows: list[Window],
+    outname: pathlib.Path,
+    max_workers: int,
+    recompress: bool = True,
+) -> pathlib.Path:
+    """Download *manifests* as tiles and index them with a GDAL VRT mosaic.
+
+    The tiles are kept in ``outname.parent/outname.stem`` and the mosaic is
+    written next to them as ``outname.with_suffix(".vrt")``, referencing them
+    by relative path so the pair can be moved together. The VRT is only
+    written once every tile is on disk; tiles finished by an earlier,
+    failed call are reused.
+    """
+    folder = outname.parent / outname.stem
+    done = _download_tiles(manifests, folder, max_workers, recompress, reuse=True)
+    return _write_vrt(manifests, windows, done, outname)
+
+
+def _write_vrt(
+    manifests: list[Dict[str, Any]],
+    windows: list[Window],
+    done: list[int],
+    outname: pathlib.Path,
+) -> pathlib.Path:
+    """Write the VRT mosaic of the tiles of :func:`_tiles_vrt`.
+
+    Raises :class:`RuntimeError`, writing nothing, unless every tile is in
+    *done*: a VRT with holes would pass for a finished download.
+    """
+    folder = outname.parent / outname.stem
+    if len(done) < len(manifests):
+        raise RuntimeError(
+            f"{len(manifests) - len(done)} of {len(manifests)} tiles of {outname.name} "
+            f"failed to download; the others are kept in {folder} for the next run"
+        )
+    grid = manifests[0]["grid"]
+    aff = grid["affineTransform"]
+    count = len(manifests[0]["bandIds"])
+    width = max(w.col_off + w.width for w in windows)
+    height = max(w.row_off + w.height for w in windows)
+    x0 = aff["translateX"] - windows[0].col_off * aff["scaleX"]
+    y0 = aff["translateY"] - windows[0].row_off * aff["scaleY"]
+    nodata = _GTIFF_PROFILE["nodata"]
+
+    root = ET.Element("VRTDataset", rasterXSize=str(width), rasterYSize=str(height))
+    ET.SubElement(root, "SRS").text = grid["crsCode"]
+    ET.SubElement(root, "GeoTransform").text = (
+        f"{x0!r}, {aff['scaleX']!r}, 0.0, {y0!r}, 0.0, {aff['scaleY']!r}"
+    )
+    for band in range(1, count + 1):
+        vrt_band = ET.SubElement(root, "VRTRasterBand", dataType="UInt16", band=str(band))
+        ET.SubElement(vrt_band, "NoDataValue").text = str(nodata)
+        ET.SubElement(vrt_band, "ColorInterp").text = "Gray"
+        for index in done:
+            window = windows[index]
+            source = ET.SubElement(vrt_band, "SimpleSource")
+            ET.SubElement(source, "SourceFilename", relativeToVRT="1").text = (
+                f"{folder.name}/{index:06d}.tif"
+            )
+            ET.SubElement(source, "SourceBand").text = str(band)
+            ET.SubElement(
+                source,
+                "SourceProperties",
+                RasterXSize=str(window.width),
+                RasterYSize=str(window.height),
+                DataType="UInt16",
+            )
+            rect = dict(xSize=str(window.width), ySize=str(window.height))
+            ET.SubElement(source, "SrcRect", xOff="0", yOff="0", **rect)
+            ET.SubElement(
+                source, "DstRect", xOff=str(window.col_off), yOff=str(window.row_off), **rect
+            )
+
+    vrt_name = outname.with_suffix(".vrt")
+    partial = vrt_name.with_name(vrt_name.name + ".part")
+    ET.indent(root)
+    ET.ElementTree(root).write(partial, encoding="unicode")
+    os.replace(partial, vrt_name)
+    return vrt_name
+
+
+def _write_array(data: np.ndarray, out: np.ndarray) -> None:
+    """Copy a structured ``NUMPY_NDARRAY`` response into *out* ``(band, y, x)``."""
+    for band, name in enumerate(data.dtype.names):
+        out[band] = data[name]
+
+
+def download_manifest_array(ulist: Dict[str, Any], out: np.ndarray) -> None:
+    """Download *ulist* as a NumPy array straight into *out*.
+
+    The manifest is sent with ``fileFormat="NUMPY_NDARRAY"``, so no GeoTIFF
+    is encoded by Earth Engine or decoded locally. *out* must have shape
+    ``(len(bandIds), height, width)``; values are cast to its dtype.
+    """
+    _write_array(_request_pixels({**ulist, "fileFormat": "NUMPY_NDARRAY"}), out)
+
+
+def download_manifests_array(
+    manifests: list[Dict[str, Any]],
+    out: np.ndarray,
+    max_workers: int = 4,
+) -> bool:
+    """Download the tiles of one request concurrently into *out*.
+
+    Each tile is written to its own window of *out* ``(band, y, x)``, laid
+    out as in :func:`download_manifests` with ``join="window"``.
+
+    Returns
+    -------
+    bool
+        *True* when every tile was downloaded; failed windows are left
+        untouched.
+    """
+    windows = _tile_windows(manifests)
+    if windows is None:
+        raise ValueError("Tiles do not lie on an axis-aligned pixel grid.")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(download_manifest_array, umanifest, out[(slice(None), *w.toslices())])
+            for umanifest, w in zip(manifests, windows)
+        ]
+
+        complete = True
         for fut in concurrent.futures.as_completed(futures):
             try:
                 fut.result()
             except Exception as exc:  # noqa: BLE001
                 print(f"Error en una de las descargas: {exc}")  # noqa: T201
+                complete = False
+    return complete
+
 
-    dir_path = full_outname.parent / full_outname.stem
+def _join_tiles(dir_path: pathlib.Path, outname: pathlib.Path) -> pathlib.Path:
+    """Merge the tiles in *dir_path* into *outname* and delete the folder.
+
+    Nothing is merged when the folder holds a single tile (or none).
+    """
     input_files = sorted(dir_path.glob("*.tif"))
 
     if dir_path.exists() and len(input_files) > 1:
 
-        with rio.Env(GDAL_NUM_THREADS="8", NUM_THREADS="8"):
+        with rio.Env(GDAL_NUM_THREADS="8", NUM_THREADS="8", **_GDAL_ENV):
             srcs = [rio.open(fp) for fp in input_files]
             mosaic, out_transform = merge(
                 srcs,
@@ -121,7 +621,6 @@ def download_manifests(
                 height=mosaic.shape[1],
                 width=mosaic.shape[2]
             )
-            outname = original_dir / full_outname.name
             outname.parent.mkdir(parents=True, exist_ok=True)
             with rio.open(outname, "w", **meta) as dst:
                 dst.write(mosaic)
@@ -131,5 +630,4 @@ def download_manifests(
 
         # Delete a folder with pathlib
         shutil.rmtree(dir_path) 
-    else:
-        return outname
+    return outname
@@ -0,0 +1,72 @@
+"""Shared store for serialized Earth Engine expressions.
+
+A mosaic request carries its ``ee.Image`` as a serialized JSON graph that
+can weigh several kilobytes. Two process-wide, content-addressed caches keep
+that graph from being copied and parsed over and over:
+
+* :func:`intern_expression` maps equal graphs to one canonical string, so
+  requests, manifests and their tiles all reference the same object.
+* :func:`decode_expression` parses each distinct graph once; every tile of a
+  split request shares the decoded ``ee.Image``.
+
+Both caches are keyed on the string content and bounded, so long-running
+processes do not grow without limit.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import json
+import os
+import threading
+
+import ee
+
+# Distinct graphs kept by each cache
+_STORE_SIZE = int(os.environ.get("CUBEXPRESS_EXPRESSION_CACHE", "1024"))
+
+_store: collections.OrderedDict[str, str] = collections.OrderedDict()
+_store_lock = threading.Lock()
+
+
+def intern_expression(expression: str) -> str:
+    """Return the canonical string equal to *expression*.
+
+    Parameters
+    ----------
+    expression
+        Serialized ``ee.Image`` graph.
+
+    Returns
+    -------
+    str
+        A previously stored equal string, or *expression* itself.
+    """
+    with _store_lock:
+        canonical = _store.get(expression)
+        if canonical is None:
+            canonical = _store[expression] = expression
+            if len(_store) > _STORE_SIZE:
+                _store.popitem(last=False)
+        else:
+            _store.move_to_end(expression)
+    return canonical
+
+
+@functools.lru_cache(maxsize=_STORE_SIZE)
+def decode_expression(expression: str) -> ee.Image:
+    """Decode a serialized graph once and share the result.
+
+    Parameters
+    ----------
+    expression
+        Serialized ``ee.Image`` graph, as stored in a manifest.
+
+    Returns
+    -------
+    ee.Image
+        The decoded image. Treat it as read-only: it is shared by every
+        caller passing an equal string.
+    """
+    return ee.deserializer.decode(json.loads(expression))
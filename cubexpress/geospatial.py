@@ -1,18 +1,17 @@
 import ee
 import re
-from copy import deepcopy
 from typing import Dict
 
 
 def quadsplit_manifest(manifest: Dict, cell_width: int, cell_height: int, power: int) -> list[Dict]:
-    manifest_copy = deepcopy(manifest)
-    
-    manifest_copy["grid"]["dimensions"]["width"] = cell_width
-    manifest_copy["grid"]["dimensions"]["height"] = cell_height
-    x = manifest_copy["grid"]["affineTransform"]["translateX"]
-    y = manifest_copy["grid"]["affineTransform"]["translateY"]
-    scale_x = manifest_copy["grid"]["affineTransform"]["scaleX"]
-    scale_y = manifest_copy["grid"]["affineTransform"]["scaleY"]
+    # Tiles only differ in their grid: everything else (notably a serialized
+    # expression, which can be large) is shared with *manifest*.
+    grid = manifest["grid"]
+    affine = grid["affineTransform"]
+    x = affine["translateX"]
+    y = affine["translateY"]
+    scale_x = affine["scaleX"]
+    scale_y = affine["scaleY"]
 
     manifests = []
 
@@ -20,9 +19,12 @@ def quadsplit_manifest(manifest: Dict, cell_width: int, cell_height: int, power:
         for rowx in range(2**power):
             new_x = x + (rowx * cell_width) * scale_x
             new_y = y + (columny * cell_height) * scale_y
-            new_manifest = deepcopy(manifest_copy)
-            new_manifest["grid"]["affineTransform"]["translateX"] = new_x
-            new_manifest["grid"]["affineTransform"]["translateY"] = new_y
+            new_manifest = dict(manifest)
+            new_manifest["grid"] = {
+                **grid,
+                "dimensions": {"width": cell_width, "height": cell_height},
+                "affineTransform": {**affine, "translateX": new_x, "translateY": new_y},
+            }
             manifests.append(new_manifest)
 
     return manifests
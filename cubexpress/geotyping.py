@@ -1,14 +1,25 @@
 from __future__ import annotations
 
-from concurrent.futures import ProcessPoolExecutor
-from typing import Any, Final, List, Set, TypeAlias
+import functools
+import hashlib
+import json
+import operator
+import pathlib
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Final, List, Literal, Sequence, Set, TypeAlias
 
 import ee
+import numpy as np
 import pandas as pd
-from pydantic import BaseModel, field_validator, model_validator
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 from pyproj import CRS, Transformer
 from typing_extensions import TypedDict
 
+from cubexpress.expressions import intern_expression
+
 # Type definitions
 NumberType: TypeAlias = int | float
 
@@ -22,18 +33,49 @@ REQUIRED_KEYS: Final[Set[str]] = {
     "translateY",
 }
 
+# Geotransform keys in GeotransformDict order
+GEOTRANSFORM_KEYS: Final[tuple[str, ...]] = (
+    "scaleX",
+    "shearX",
+    "translateX",
+    "scaleY",
+    "shearY",
+    "translateY",
+)
+
+_WGS84: Final[CRS] = CRS.from_epsg(4326)
+
+# Version of the on-disk RequestSet layout (see RequestSet.to_parquet)
+_SCHEMA_VERSION: Final[str] = "1"
+
+# Columns of RequestSet._dataframe
+_MANIFEST_COLUMNS: Final[list[str]] = [
+    "id", "lon", "lat", "x", "y", "crs", "width", "height", "geotransform",
+    "scale_x", "scale_y", "manifest", "cs_cdf", "date", "outname",
+]
 
-def get_transformer(source_crs_wkt: str) -> Transformer:
-    """Get cached transformer from source CRS to WGS84 (EPSG:4326)"""
-    target_crs = CRS.from_epsg(4326)
+
+@functools.lru_cache(maxsize=None)
+def get_transformer(source_crs: str) -> Transformer | None:
+    """Get cached transformer from source CRS to WGS84 (EPSG:4326).
+
+    Args:
+        source_crs: Any CRS accepted by pyproj (EPSG code, WKT, ...).
+
+    Returns:
+        The transformer, or None when the source CRS already is WGS84.
+    """
+    source = CRS.from_user_input(source_crs)
+    if source == _WGS84:
+        return None
     return Transformer.from_crs(
-        CRS.from_wkt(source_crs_wkt),
-        target_crs,
+        source,
+        _WGS84,
         always_xy=True,  # Ensures consistent x,y order
     )
 
 
-def rt2lonlat(raster: "RasterTransform") -> tuple[float, float]:
+def rt2lonlat(raster: "RasterTransform") -> tuple[float, float, float, float]:
     """
     Calculate the geographic centroid in WGS84 with optimized performance.
 
@@ -41,39 +83,222 @@ def rt2lonlat(raster: "RasterTransform") -> tuple[float, float]:
         raster: RasterTransform instance with geospatial metadata
 
     Returns:
-        Tuple of (longitude, latitude) in WGS84 coordinates
+        Tuple of (longitude, latitude, x, y), the centroid in WGS84 and in
+        the raster CRS
     """
-    # Calculate pixel coordinates of raster center
-    col_center = (raster.width - 1) / 2.0
-    row_center = (raster.height - 1) / 2.0
-
-    # Extract geotransform parameters as local variables for faster access
     gt = raster.geotransform
-    tx = gt["translateX"]
-    sx = gt["scaleX"]
-    shx = gt["shearX"]
-    ty = gt["translateY"]
-    shy = gt["shearY"]
-    sy = gt["scaleY"]
+    lon, lat, x, y = rt2lonlat_many(
+        [raster.crs],
+        np.array([raster.width]),
+        np.array([raster.height]),
+        *(np.array([gt[key]]) for key in GEOTRANSFORM_KEYS),
+    )
+    return float(lon[0]), float(lat[0]), float(x[0]), float(y[0])
+
+
+def rt2lonlat_many(
+    crs: Sequence[str],
+    width: np.ndarray,
+    height: np.ndarray,
+    scaleX: np.ndarray,
+    shearX: np.ndarray,
+    translateX: np.ndarray,
+    scaleY: np.ndarray,
+    shearY: np.ndarray,
+    translateY: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized :func:`rt2lonlat` over many rasters.
 
-    # Apply affine transformation
-    x = tx + sx * col_center + shx * row_center
-    y = ty + shy * col_center + sy * row_center
+    The affine transform is applied to all raster centres at once and the
+    reprojection runs as one ``Transformer.transform`` call per distinct CRS.
 
-    # Check if transformation is needed
-    source_crs = CRS.from_user_input(raster.crs)
-    target_crs = CRS.from_epsg(4326)
+    Args:
+        crs: CRS string of every raster
+        width, height: Raster sizes in pixels
+        scaleX, shearX, translateX, scaleY, shearY, translateY: Geotransform
+            parameters of every raster
 
-    if source_crs == target_crs:
-        return (x, y)
+    Returns:
+        Arrays (lon, lat, x, y) of the centroids in WGS84 and in the raster CRS
+    """
+    # Calculate pixel coordinates of raster centres
+    col_center = (np.asarray(width, dtype=float) - 1) / 2.0
+    row_center = (np.asarray(height, dtype=float) - 1) / 2.0
 
-    # Perform the transformation
-    transformer = get_transformer(source_crs.to_wkt())
-    lon, lat = transformer.transform(x, y)
+    # Apply affine transformation
+    x = translateX + scaleX * col_center + shearX * row_center
+    y = translateY + shearY * col_center + scaleY * row_center
+
+    lon = np.array(x, dtype=float)
+    lat = np.array(y, dtype=float)
+    codes, groups = np.unique(np.asarray(crs, dtype=object), return_inverse=True)
+    for index, code in enumerate(codes):
+        transformer = get_transformer(code)
+        if transformer is None:
+            continue
+        mask = groups == index
+        lon[mask], lat[mask] = transformer.transform(x[mask], y[mask])
 
     return lon, lat, x, y
 
 
+ValidationMode: TypeAlias = Literal["full", "fast", "off"]
+
+# Expected kind of every RequestSet._dataframe column
+_COLUMN_KINDS: Final[dict[str, str]] = {
+    "id": "str",
+    "lon": "float",
+    "lat": "float",
+    "x": "float",
+    "y": "float",
+    "crs": "str",
+    "width": "int",
+    "height": "int",
+    "geotransform": "dict",
+    "scale_x": "number",
+    "scale_y": "number",
+    "manifest": "dict",
+    "outname": "str",
+}
+
+_KIND_NAMES: Final[dict[str, str]] = {
+    "str": "str",
+    "float": "float",
+    "int": "int",
+    "number": "int or float",
+    "dict": "dict",
+}
+
+# pandas.api.types.infer_dtype results accepted for object columns
+_INFERRED_KINDS: Final[dict[str, Set[str]]] = {
+    "str": {"string", "empty"},
+    "float": {"floating", "empty"},
+    "int": {"integer", "empty"},
+    "number": {"integer", "floating", "mixed-integer-float", "empty"},
+}
+
+_CELL_TYPES: Final[dict[str, type | tuple[type, ...]]] = {
+    "str": str,
+    "float": float,
+    "int": int,
+    "number": (int, float),
+    "dict": dict,
+}
+
+
+def _invalid_rows(column: pd.Series, kind: str) -> pd.Index:
+    """
+    Return the index of the cells of *column* that are not of *kind*.
+
+    Numeric dtypes are accepted without touching the cells; object columns are
+    scanned cell by cell only when their inferred dtype does not match.
+    """
+    dtype_kind = column.dtype.kind
+    if kind == "float" and dtype_kind == "f":
+        return column.index[:0]
+    if kind == "int" and dtype_kind in "iu":
+        return column.index[:0]
+    if kind == "number" and dtype_kind in "iuf":
+        return column.index[:0]
+    if kind in _INFERRED_KINDS and (
+        pd.api.types.infer_dtype(column, skipna=False) in _INFERRED_KINDS[kind]
+    ):
+        return column.index[:0]
+
+    expected = _CELL_TYPES[kind]
+    valid = np.fromiter(
+        (isinstance(value, expected) for value in column),
+        dtype=bool,
+        count=len(column),
+    )
+    return column.index[~valid]
+
+
+def _head(rows: Sequence[Any], limit: int = 5) -> str:
+    """Format the first *limit* row labels of *rows* for an error message."""
+    rows = list(rows)
+    shown = ", ".join(str(r) for r in rows[:limit])
+    return f"[{shown}, ... ({len(rows)} rows)]" if len(rows) > limit else f"[{shown}]"
+
+
+def _manifest_template(manifest: Any) -> tuple:
+    """
+    Describe the structure of *manifest* (keys and value types, not values).
+
+    Manifests sharing a template pass or fail validation together.
+    """
+    if not isinstance(manifest, dict):
+        return (type(manifest),)
+    grid = manifest.get("grid")
+    if not isinstance(grid, dict):
+        return (tuple(manifest), type(grid))
+    dims = grid.get("dimensions")
+    aff = grid.get("affineTransform")
+    return (
+        tuple(manifest),
+        tuple(grid),
+        tuple((k, type(v)) for k, v in dims.items()) if isinstance(dims, dict) else type(dims),
+        tuple((k, type(v)) for k, v in aff.items()) if isinstance(aff, dict) else type(aff),
+    )
+
+
+def _manifest_problems(manifest: Any) -> list[str]:
+    """
+    List the structural problems of a single manifest.
+
+    Args:
+        manifest: The manifest dictionary to check.
+
+    Returns:
+        Human readable descriptions, empty if the manifest is valid.
+    """
+    if not isinstance(manifest, dict):
+        return [f"'manifest' must be a dict, got {type(manifest)}"]
+
+    problems = [
+        f"Missing key '{key}' in 'manifest'"
+        for key in ("fileFormat", "bandIds", "grid")
+        if key not in manifest
+    ]
+
+    # At least one of 'assetId' or 'expression'
+    if not any(k in manifest for k in ("assetId", "expression")):
+        problems.append("Manifest does not contain 'assetId' or 'expression'")
+
+    # Basic validation of 'grid'
+    grid = manifest.get("grid")
+    if not isinstance(grid, dict):
+        return problems
+    problems += [
+        f"Missing key '{subkey}' in 'manifest.grid'"
+        for subkey in ("dimensions", "affineTransform", "crsCode")
+        if subkey not in grid
+    ]
+
+    # Basic validation of 'dimensions'
+    dims = grid.get("dimensions", {})
+    for dim_key in ("width", "height"):
+        if dim_key not in dims:
+            problems.append(f"Missing '{dim_key}' in 'manifest.grid.dimensions'")
+        elif not isinstance(dims[dim_key], int):
+            problems.append(
+                f"'{dim_key}' in 'manifest.grid.dimensions' must be a positive integer"
+            )
+
+    # Basic validation of 'affineTransform'
+    aff = grid.get("affineTransform", {})
+    for a_key in GEOTRANSFORM_KEYS:
+        if a_key not in aff:
+            problems.append(f"Missing '{a_key}' in 'manifest.grid.affineTransform'")
+        elif not isinstance(aff[a_key], (int, float)):
+            problems.append(
+                f"Value for '{a_key}' in 'manifest.grid.affineTransform' must be numeric"
+            )
+
+    return problems
+
+
 class GeotransformDict(TypedDict):
     """
     Type definition for a geotransform dictionary containing spatial transformation parameters.
@@ -227,10 +452,11 @@ class Request(BaseModel):
     def validate_image(self):
 
         if isinstance(self.image, ee.Image):
-            self.image = self.image.serialize()
+            self.image = intern_expression(self.image.serialize())
             self._expression_key = "expression"
         # to avoid reading serialization of an ee.Image as str in RequestSet
         elif isinstance(self.image, str) and self.image.strip().startswith("{"):
+            self.image = intern_expression(self.image)
             self._expression_key = "expression"
         else:
             self.image = self.image
@@ -239,22 +465,709 @@ class Request(BaseModel):
         return self
 
 
+def _image_entry(image: str, is_expression: bool) -> dict[str, str]:
+    """Manifest entry for *image*; expressions are interned so requests share them."""
+    if is_expression:
+        return {"expression": intern_expression(image)}
+    return {"assetId": image}
+
+
+def _hash_strings(digest: "hashlib._Hash", array: pa.Array) -> None:
+    """Feed the values of a string *array* to *digest*, independent of layout."""
+    array = array.cast(pa.string())
+    _, offsets, data = array.buffers()
+    if offsets is None:
+        digest.update(b"")
+        return
+    offsets = np.frombuffer(offsets, dtype=np.int32)[array.offset : array.offset + len(array) + 1]
+    digest.update((offsets - offsets[0]).tobytes())
+    if data is not None:
+        digest.update(memoryview(data)[offsets[0] : offsets[-1]])
+
+
+class _RequestColumns(SequenceABC):
+    """
+    Columnar storage behind a RequestSet.
+
+    Holds one array per attribute instead of one Request model per entry: ids
+    and images as Arrow string arrays, CRS strings and band lists dictionary
+    encoded, sizes and geotransforms as NumPy arrays. Indexing returns Request
+    objects and manifests built on the fly.
+
+    Attributes:
+        ids (pa.StringArray): Request ids.
+        crs_codes (np.ndarray): Index of every request into ``crs_values``.
+        crs_values (list[str]): Distinct CRS strings.
+        width, height (np.ndarray): Raster sizes in pixels.
+        geotransform (np.ndarray): ``(n, 6)`` array in GEOTRANSFORM_KEYS order.
+        images (pa.StringArray): Asset ids or serialized ee.Image expressions.
+        is_expression (np.ndarray): True where ``images`` holds an expression.
+        band_codes (np.ndarray): Index of every request into ``band_values``.
+        band_values (list[tuple[str, ...]]): Distinct band lists.
+    """
+
+    def __init__(
+        self,
+        ids: pa.StringArray,
+        crs_codes: np.ndarray,
+        crs_values: list[str],
+        width: np.ndarray,
+        height: np.ndarray,
+        geotransform: np.ndarray,
+        images: pa.StringArray,
+        is_expression: np.ndarray,
+        band_codes: np.ndarray,
+        band_values: list[tuple[str, ...]],
+    ) -> None:
+        self.ids = ids
+        self.crs_codes = crs_codes
+        self.crs_values = crs_values
+        self.width = width
+        self.height = height
+        self.geotransform = geotransform
+        self.images = images
+        self.is_expression = is_expression
+        self.band_codes = band_codes
+        self.band_values = band_values
+
+    @classmethod
+    def from_arrays(
+        cls,
+        ids: Sequence[str] | pa.Array,
+        crs: str | Sequence[str],
+        width: int | Sequence[int],
+        height: int | Sequence[int],
+        geotransform: GeotransformDict | Sequence[GeotransformDict] | np.ndarray,
+        images: Sequence[Any] | pa.Array,
+        bands: Sequence[str] | Sequence[Sequence[str]],
+    ) -> _RequestColumns:
+        """
+        Build the columns from per-request values.
+
+        Scalars (a single CRS, size, geotransform dict or band list) are
+        broadcast to every request.
+
+        Args:
+            ids: Request ids.
+            crs: CRS string(s).
+            width, height: Raster size(s) in pixels.
+            geotransform: Geotransform dict(s) or an ``(n, 6)`` / ``(6,)`` array
+                in GEOTRANSFORM_KEYS order.
+            images: Asset ids, serialized expressions or ee.Image objects.
+            bands: Band list shared by all requests, or one list per request.
+
+        Returns:
+            _RequestColumns: The columnar storage.
+        """
+        ids = pa.array(ids, type=pa.string())
+        n = len(ids)
+
+        if isinstance(crs, str):
+            crs_codes, crs_values = np.zeros(n, dtype=np.int32), [crs]
+        elif isinstance(getattr(crs, "dtype", None), pd.CategoricalDtype):
+            crs = pd.Categorical(crs)
+            crs_codes, crs_values = crs.codes.astype(np.int32), list(crs.categories)
+        else:
+            crs_codes, uniques = pd.factorize(np.asarray(crs, dtype=object))
+            crs_codes, crs_values = crs_codes.astype(np.int32), list(uniques)
+
+        width = np.broadcast_to(np.asarray(width, dtype=np.int64), (n,)).copy()
+        height = np.broadcast_to(np.asarray(height, dtype=np.int64), (n,)).copy()
+
+        if isinstance(geotransform, dict):
+            geotransform = [geotransform[key] for key in GEOTRANSFORM_KEYS]
+        elif not isinstance(geotransform, np.ndarray):
+            geotransform = [[gt[key] for key in GEOTRANSFORM_KEYS] for gt in geotransform]
+        geotransform = np.broadcast_to(
+            np.asarray(geotransform, dtype=np.float64), (n, len(GEOTRANSFORM_KEYS))
+        ).copy()
+
+        if not isinstance(images, pa.Array):
+            images = [
+                image.serialize() if isinstance(image, ee.Image) else image
+                for image in images
+            ]
+        images = pa.array(images, type=pa.string())
+        # same rule as Request.validate_image
+        is_expression = pc.starts_with(pc.utf8_ltrim_whitespace(images), "{")
+        is_expression = is_expression.fill_null(False).to_numpy(zero_copy_only=False)
+
+        bands = list(bands)
+        if not bands or isinstance(bands[0], str):
+            band_codes, band_values = np.zeros(n, dtype=np.int32), [tuple(bands)]
+        else:
+            lookup: dict[tuple[str, ...], int] = {}
+            band_codes = np.array(
+                [lookup.setdefault(tuple(b), len(lookup)) for b in bands], dtype=np.int32
+            )
+            band_values = list(lookup)
+
+        return cls(
+            ids, crs_codes, crs_values, width, height, geotransform,
+            images, is_expression, band_codes, band_values,
+        )
+
+    @classmethod
+    def from_requests(cls, requests: Sequence[Request]) -> _RequestColumns:
+        """Build the columns from a list of Request models."""
+        rts = [req.raster_transform for req in requests]
+        return cls.from_arrays(
+            ids=[req.id for req in requests],
+            crs=[rt.crs for rt in rts],
+            width=[rt.width for rt in rts],
+            height=[rt.height for rt in rts],
+            geotransform=[rt.geotransform for rt in rts],
+            images=[req.image for req in requests],
+            bands=[req.bands for req in requests],
+        )
+
+    @property
+    def crs(self) -> np.ndarray:
+        """CRS string of every request."""
+        return np.asarray(self.crs_values, dtype=object)[self.crs_codes]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, in bytes."""
+        arrays = (
+            self.crs_codes, self.width, self.height, self.geotransform,
+            self.is_expression, self.band_codes,
+        )
+        return (
+            self.ids.nbytes
+            + self.images.nbytes
+            + sum(a.nbytes for a in arrays)
+            + sum(len(c) for c in self.crs_values)
+            + sum(len(b) for bands in self.band_values for b in bands)
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return f"<{len(self)} columnar requests>"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        i = self._position(index)
+        return Request(
+            id=self.ids[i].as_py(),
+            raster_transform=self.raster_transform(i),
+            image=self.images[i].as_py(),
+            bands=list(self.band_values[self.band_codes[i]]),
+        )
+
+    def _position(self, index: int) -> int:
+        i = operator.index(index)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("RequestSet index out of range")
+        return i
+
+    def _geotransform(self, i: int) -> GeotransformDict:
+        return dict(zip(GEOTRANSFORM_KEYS, self.geotransform[i].tolist()))
+
+    def raster_transform(self, index: int) -> RasterTransform:
+        """Return the RasterTransform of request *index*."""
+        i = self._position(index)
+        return RasterTransform(
+            crs=self.crs_values[self.crs_codes[i]],
+            geotransform=self._geotransform(i),
+            width=int(self.width[i]),
+            height=int(self.height[i]),
+        )
+
+    def manifest(self, index: int) -> dict[str, Any]:
+        """Return the Earth Engine download manifest of request *index*."""
+        i = self._position(index)
+        return {
+            **_image_entry(self.images[i].as_py(), self.is_expression[i]),
+            "fileFormat": "GEO_TIFF",
+            "bandIds": list(self.band_values[self.band_codes[i]]),
+            "grid": {
+                "dimensions": {
+                    "width": int(self.width[i]),
+                    "height": int(self.height[i]),
+                },
+                "affineTransform": self._geotransform(i),
+                "crsCode": self.crs_values[self.crs_codes[i]],
+            },
+        }
+
+    def _manifests(self) -> tuple[list[GeotransformDict], list[dict[str, Any]]]:
+        """Bulk version of :meth:`manifest` returning geotransforms and manifests."""
+        geotransforms = [dict(zip(GEOTRANSFORM_KEYS, gt)) for gt in self.geotransform.tolist()]
+        crs = self.crs.tolist()
+        bands = [list(b) for b in self.band_values]
+        manifests = [
+            {
+                **_image_entry(image, expr),
+                "fileFormat": "GEO_TIFF",
+                "bandIds": list(bands[b]),
+                "grid": {
+                    "dimensions": {"width": w, "height": h},
+                    "affineTransform": gt,
+                    "crsCode": c,
+                },
+            }
+            for image, expr, b, w, h, gt, c in zip(
+                self.images.to_pylist(),
+                self.is_expression.tolist(),
+                self.band_codes.tolist(),
+                self.width.tolist(),
+                self.height.tolist(),
+                geotransforms,
+                crs,
+            )
+        ]
+        return geotransforms, manifests
+
+    def take(self, indices: np.ndarray) -> _RequestColumns:
+        """Return the requests at positions *indices*, sharing CRS and band values."""
+        indices = np.asarray(indices, dtype=np.int64)
+        return type(self)(
+            ids=self.ids.take(indices),
+            crs_codes=self.crs_codes[indices],
+            crs_values=self.crs_values,
+            width=self.width[indices],
+            height=self.height[indices],
+            geotransform=self.geotransform[indices],
+            images=self.images.take(indices),
+            is_expression=self.is_expression[indices],
+            band_codes=self.band_codes[indices],
+            band_values=self.band_values,
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence[_RequestColumns]) -> _RequestColumns:
+        """Concatenate *parts*, merging their CRS and band dictionaries."""
+
+        def merge(values_attr: str, codes_attr: str) -> tuple[np.ndarray, list]:
+            lookup: dict[Any, int] = {}
+            codes = []
+            for part in parts:
+                remap = np.array(
+                    [lookup.setdefault(v, len(lookup)) for v in getattr(part, values_attr)],
+                    dtype=np.int32,
+                )
+                codes.append(remap[getattr(part, codes_attr)] if len(remap) else getattr(part, codes_attr))
+            return np.concatenate(codes), list(lookup)
+
+        crs_codes, crs_values = merge("crs_values", "crs_codes")
+        band_codes, band_values = merge("band_values", "band_codes")
+        return cls(
+            ids=pa.concat_arrays([p.ids for p in parts]),
+            crs_codes=crs_codes,
+            crs_values=crs_values,
+            width=np.concatenate([p.width for p in parts]),
+            height=np.concatenate([p.height for p in parts]),
+            geotransform=np.concatenate([p.geotransform for p in parts]),
+            images=pa.concat_arrays([p.images for p in parts]),
+            is_expression=np.concatenate([p.is_expression for p in parts]),
+            band_codes=band_codes,
+            band_values=band_values,
+        )
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Return the columns as an Arrow table.
+
+        Band lists are stored as codes with their distinct values in the
+        schema metadata, CRS strings as a dictionary column and geotransforms
+        as fixed-size lists in GEOTRANSFORM_KEYS order.
+        """
+        arrays = {
+            "id": self.ids,
+            "crs": pa.DictionaryArray.from_arrays(
+                pa.array(self.crs_codes, type=pa.int32()),
+                pa.array(self.crs_values, type=pa.string()),
+            ),
+            "width": pa.array(self.width, type=pa.int64()),
+            "height": pa.array(self.height, type=pa.int64()),
+            "geotransform": pa.FixedSizeListArray.from_arrays(
+                pa.array(self.geotransform.ravel(), type=pa.float64()),
+                len(GEOTRANSFORM_KEYS),
+            ),
+            "image": self.images,
+            "is_expression": pa.array(self.is_expression, type=pa.bool_()),
+            "bands": pa.array(self.band_codes, type=pa.int32()),
+        }
+        metadata = {
+            b"cubexpress.schema_version": _SCHEMA_VERSION.encode(),
+            b"cubexpress.bands": json.dumps([list(b) for b in self.band_values]).encode(),
+            b"cubexpress.checksum": self.checksum().encode(),
+        }
+        return pa.table(arrays).replace_schema_metadata(metadata)
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> _RequestColumns:
+        """
+        Rebuild the columns from :meth:`to_arrow` output.
+
+        Single-chunk columns without nulls are wrapped without copying, so a
+        memory-mapped IPC file stays on disk until pages are touched.
+
+        Raises:
+            ValueError: If the table was not written by a compatible version.
+        """
+        metadata = table.schema.metadata or {}
+        version = metadata.get(b"cubexpress.schema_version", b"").decode()
+        if version != _SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported RequestSet schema version {version!r} "
+                f"(expected {_SCHEMA_VERSION!r})"
+            )
+
+        def column(name: str) -> pa.Array:
+            chunked = table.column(name)
+            # combine_chunks copies even a single chunk
+            return chunked.chunk(0) if chunked.num_chunks == 1 else chunked.combine_chunks()
+
+        def numpy(name: str, dtype) -> np.ndarray:
+            return column(name).to_numpy(zero_copy_only=False).astype(dtype, copy=False)
+
+        crs = column("crs")
+        if pa.types.is_dictionary(crs.type):
+            crs_codes = crs.indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+            crs_values = crs.dictionary.to_pylist()
+        else:
+            crs_codes, uniques = pd.factorize(crs.to_numpy(zero_copy_only=False))
+            crs_codes, crs_values = crs_codes.astype(np.int32), list(uniques)
+
+        return cls(
+            ids=column("id"),
+            crs_codes=crs_codes,
+            crs_values=crs_values,
+            width=numpy("width", np.int64),
+            height=numpy("height", np.int64),
+            geotransform=column("geotransform").flatten().to_numpy(
+                zero_copy_only=False
+            ).reshape(-1, len(GEOTRANSFORM_KEYS)),
+            images=column("image"),
+            is_expression=numpy("is_expression", bool),
+            band_codes=numpy("bands", np.int32),
+            band_values=[tuple(b) for b in json.loads(metadata[b"cubexpress.bands"])],
+        )
+
+    def checksum(self) -> str:
+        """
+        Content hash of the columns.
+
+        The hash covers values only, not the memory layout, so it survives a
+        round trip through Parquet or Arrow IPC.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (self.ids, self.images):
+            _hash_strings(digest, array)
+        digest.update(json.dumps([self.crs_values, self.band_values]).encode())
+        for array, dtype in (
+            (self.crs_codes, np.int32),
+            (self.width, np.int64),
+            (self.height, np.int64),
+            (self.geotransform, np.float64),
+            (self.is_expression, bool),
+            (self.band_codes, np.int32),
+        ):
+            digest.update(np.ascontiguousarray(array, dtype=dtype).tobytes())
+        return digest.hexdigest()
+
+    def frame(self, manifests: bool = True) -> pd.DataFrame:
+        """
+        Build the RequestSet dataframe from the columns.
+
+        Args:
+            manifests: If False the ``geotransform`` and ``manifest`` columns,
+                which hold one dict per request, are left out.
+
+        Returns:
+            pd.DataFrame: One row per request.
+        """
+        gt = self.geotransform
+        lon, lat, x, y = rt2lonlat_many(
+            self.crs, self.width, self.height,
+            *(gt[:, j] for j in range(len(GEOTRANSFORM_KEYS))),
+        )
+        parts = pc.extract_regex(self.ids, r"^(?P<date>[^_]*)(?:.*_)?(?P<cs_cdf>[^_]*)$")
+        ids = self.ids.to_pandas()
+
+        columns = {
+            "id": ids, # add clud
+            "lon": lon,
+            "lat": lat,
+            "x": x,
+            "y": y,
+            "crs": self.crs,
+            "width": self.width,
+            "height": self.height,
+            "scale_x": gt[:, 0],
+            "scale_y": gt[:, 3],
+            "cs_cdf": pc.struct_field(parts, "cs_cdf").to_numpy(zero_copy_only=False).astype(int) / 100,
+            "date": pc.struct_field(parts, "date").to_pandas(),
+            "outname": ids + ".tif",
+        }
+        if manifests:
+            columns["geotransform"], columns["manifest"] = self._manifests()
+        return pd.DataFrame(
+            columns, columns=[c for c in _MANIFEST_COLUMNS if c in columns]
+        )
+
+
 class RequestSet(BaseModel):
     """
     Container for multiple RasterTransform instances with bulk validation capabilities.
 
     Attributes:
         rastertransformset (List[RasterTransform]): A list of RasterTransform metadata entries.
+        validation (str): Validation level of the generated dataframe, passed as
+            ``validate=``: "full" (default) checks every row, "fast" only column
+            dtypes and the first manifest, "off" trusts the caller entirely.
 
     Example:
         >>> metadatas = RasterTransformSet(rastertransformset=[metadata1, metadata2])
         >>> df = metadatas.export_df()
     """
 
+    model_config = ConfigDict(populate_by_name=True)
+
     requestset: List[Request]
-    _dataframe: pd.DataFrame | None = None
+    validation: ValidationMode = Field("full", alias="validate", exclude=True)
+    _columns: _RequestColumns | None = None
+    _frame: pd.DataFrame | None = None
+    _ids: set[str] | None = None
+
+    @classmethod
+    def from_columns(
+        cls,
+        ids: Sequence[str] | pa.Array,
+        crs: str | Sequence[str],
+        width: int | Sequence[int],
+        height: int | Sequence[int],
+        geotransform: GeotransformDict | Sequence[GeotransformDict] | np.ndarray,
+        images: Sequence[Any] | pa.Array,
+        bands: Sequence[str] | Sequence[Sequence[str]],
+        validate: ValidationMode = "full",
+    ) -> RequestSet:
+        """
+        Build a RequestSet straight from columns, without Request models.
+
+        Requests are kept in columnar storage (a few hundred bytes each) and
+        only materialized as Request objects, manifests or a dataframe when
+        accessed. Scalars are broadcast to every request, so a single CRS,
+        size, geotransform or band list can be shared.
+
+        Args:
+            ids: Unique request ids.
+            crs: CRS string(s).
+            width, height: Raster size(s) in pixels.
+            geotransform: Geotransform dict(s) or an ``(n, 6)`` / ``(6,)`` array
+                in GEOTRANSFORM_KEYS order.
+            images: Asset ids, serialized expressions or ee.Image objects.
+            bands: Band list shared by all requests, or one list per request.
+            validate: "full"/"fast" check ids, CRS, sizes and scales column-wise;
+                "off" trusts the caller.
 
+        Returns:
+            RequestSet: The columnar request set.
+
+        Raises:
+            ValueError: If validation fails.
+        """
+        columns = _RequestColumns.from_arrays(
+            ids, crs, width, height, geotransform, images, bands
+        )
+        requests = cls.model_construct(requestset=columns, validation=validate)
+        requests._columns = columns
+        requests._validate_columns(validate)
+        return requests
+
+    @classmethod
+    def from_transforms(
+        cls,
+        ids: Sequence[str] | pa.Array,
+        transforms: pd.DataFrame,
+        images: Sequence[Any] | pa.Array,
+        bands: Sequence[str] | Sequence[Sequence[str]],
+        validate: ValidationMode = "full",
+    ) -> RequestSet:
+        """
+        Build a columnar RequestSet from a transform table.
+
+        Args:
+            ids: Unique request ids.
+            transforms: One row per request with ``crs``, ``width``, ``height``
+                and the GEOTRANSFORM_KEYS columns, as returned by
+                :func:`cubexpress.conversion.lonlat2rt_many`.
+            images: Asset ids, serialized expressions or ee.Image objects.
+            bands: Band list shared by all requests, or one list per request.
+            validate: See :meth:`from_columns`.
+
+        Returns:
+            RequestSet: The columnar request set.
+        """
+        return cls.from_columns(
+            ids=ids,
+            crs=transforms["crs"],
+            width=transforms["width"].to_numpy(),
+            height=transforms["height"].to_numpy(),
+            geotransform=transforms[list(GEOTRANSFORM_KEYS)].to_numpy(dtype=float),
+            images=images,
+            bands=bands,
+            validate=validate,
+        )
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Return the request set as an Arrow table of typed columns.
+
+        The schema metadata records the layout version, a content checksum,
+        whether the set was validated and its validation level, so
+        :meth:`from_arrow` can trust it and restore the level.
+
+        Returns:
+            pa.Table: One row per request.
+        """
+        table = self._columns.to_arrow()
+        metadata = dict(table.schema.metadata)
+        metadata[b"cubexpress.validated"] = b"1" if self.validation != "off" else b"0"
+        metadata[b"cubexpress.validation"] = self.validation.encode()
+        return table.replace_schema_metadata(metadata)
+
+    @classmethod
+    def from_arrow(
+        cls, table: pa.Table, validate: ValidationMode | None = None
+    ) -> RequestSet:
+        """
+        Rebuild a request set from :meth:`to_arrow` output.
+
+        Args:
+            table: The Arrow table.
+            validate: Validation level. By default the load-time check is
+                skipped when the stored checksum matches the content of a
+                validated set, which keeps its stored level for later
+                :meth:`extend` calls; otherwise it runs in "full" mode.
+
+        Returns:
+            RequestSet: The columnar request set.
+
+        Raises:
+            ValueError: If the layout version is unknown or validation fails.
+        """
+        columns = _RequestColumns.from_arrow(table)
+        check = validate
+        if validate is None:
+            metadata = table.schema.metadata
+            trusted = (
+                metadata.get(b"cubexpress.validated") == b"1"
+                and metadata.get(b"cubexpress.checksum", b"").decode() == columns.checksum()
+            )
+            validate = metadata.get(b"cubexpress.validation", b"full").decode() if trusted else "full"
+            check = "off" if trusted else "full"
+        requests = cls.model_construct(requestset=columns, validation=validate)
+        requests._columns = columns
+        requests._validate_columns(check)
+        return requests
+
+    def to_parquet(self, path: str | pathlib.Path, **kwargs: Any) -> None:
+        """
+        Write the request set to a Parquet file.
+
+        Args:
+            path: Destination file.
+            **kwargs: Passed to ``pyarrow.parquet.write_table``.
+        """
+        pq.write_table(self.to_arrow(), path, **kwargs)
+
+    @classmethod
+    def from_parquet(
+        cls, path: str | pathlib.Path, validate: ValidationMode | None = None
+    ) -> RequestSet:
+        """
+        Read a request set written by :meth:`to_parquet`.
+
+        Args:
+            path: Source file.
+            validate: See :meth:`from_arrow`.
+
+        Returns:
+            RequestSet: The columnar request set.
+        """
+        return cls.from_arrow(pq.read_table(path, memory_map=True), validate)
+
+    def to_feather(self, path: str | pathlib.Path) -> None:
+        """
+        Write the request set to an uncompressed Arrow IPC (Feather v2) file.
 
+        The file holds a single record batch, so :meth:`from_feather` can
+        memory-map it without copying.
+
+        Args:
+            path: Destination file.
+        """
+        table = self.to_arrow().combine_chunks()
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=max(len(table), 1))
+
+    @classmethod
+    def from_feather(
+        cls, path: str | pathlib.Path, validate: ValidationMode | None = None
+    ) -> RequestSet:
+        """
+        Memory-map a request set written by :meth:`to_feather`.
+
+        Args:
+            path: Source file.
+            validate: See :meth:`from_arrow`.
+
+        Returns:
+            RequestSet: The columnar request set.
+        """
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        return cls.from_arrow(table, validate)
+
+    @property
+    def _dataframe(self) -> pd.DataFrame:
+        """The request table, built from the columns on first access."""
+        if self._frame is None:
+            self._frame = self.create_manifests()
+        return self._frame
+
+    @_dataframe.setter
+    def _dataframe(self, value: pd.DataFrame) -> None:
+        self._frame = value
+
+    def manifest(self, index: int) -> dict[str, Any]:
+        """
+        Return the download manifest of request *index*.
+
+        Args:
+            index: Position of the request.
+
+        Returns:
+            dict: The Earth Engine manifest.
+        """
+        if self._frame is not None:
+            return self._frame["manifest"].iloc[index]
+        return self._columns.manifest(index)
+
+    def to_frame(self, manifests: bool = True) -> pd.DataFrame:
+        """
+        Return the request table.
+
+        Args:
+            manifests: If False the per-request ``geotransform`` and ``manifest``
+                dicts are left out, which keeps large columnar sets small.
+
+        Returns:
+            pd.DataFrame: One row per request.
+        """
+        if manifests or self._frame is not None:
+            frame = self._dataframe
+            return frame if manifests else frame.drop(columns=["geotransform", "manifest"])
+        return self._columns.frame(manifests=False)
 
     def create_manifests(self) -> pd.DataFrame:
         """
@@ -267,162 +1180,289 @@ class RequestSet(BaseModel):
             >>> df = raster_transform_set.export_df()
             >>> print(df)
         """
-        # Use ProcessPoolExecutor for CPU-bound tasks to convert raster transforms to lon/lat
-        with ProcessPoolExecutor(max_workers=None) as executor:
-            # Submit all tasks to the executor
-            futures = [
-                executor.submit(rt2lonlat, rt.raster_transform)
-                for rt in self.requestset
-            ]
-
-            # Collect results as they complete
-            points = [future.result() for future in futures]
-            lon, lat, x, y = zip(*points)
-
-        return pd.DataFrame(
-            [
-                {
-                    "id": meta.id, # add clud
-                    "lon": lon[index],
-                    "lat": lat[index],
-                    "x": x[index],
-                    "y": y[index],
-                    "crs": meta.raster_transform.crs,
-                    "width": meta.raster_transform.width,
-                    "height": meta.raster_transform.height,
-                    "geotransform": meta.raster_transform.geotransform,
-                    "scale_x": meta.raster_transform.geotransform["scaleX"],
-                    "scale_y": meta.raster_transform.geotransform["scaleY"],
-                    "manifest": {
-                        meta._expression_key: meta.image,
-                        "fileFormat": "GEO_TIFF",
-                        "bandIds": meta.bands,
-                        "grid": {
-                            "dimensions": {
-                                "width": meta.raster_transform.width,
-                                "height": meta.raster_transform.height,
-                            },
-                            "affineTransform": meta.raster_transform.geotransform,
-                            "crsCode": meta.raster_transform.crs,
-                        },
-                    },
-                    "cs_cdf": int(meta.id.split("_")[-1]) / 100,
-                    "date": meta.id.split("_")[0],
-                    "outname": f"{meta.id}.tif",
-                }
-                
-                for index, meta in enumerate(self.requestset)
-            ]
-        )
-
-
+        return self._columns.frame()
 
-    def _validate_dataframe_schema(self) -> None:
+    def _validate_dataframe_schema(self, mode: ValidationMode = "full") -> None:
         """
         Checks that the `_dataframe` contains the required columns and that each column
         has the expected data type. Also verifies that the `manifest` field has the
         necessary minimum structure.
-        """
 
-        # A) Required columns and expected data types
-        required_columns = {
-            "id": str,
-            "lon": float,
-            "lat": float,
-            "x": float,
-            "y": float,
-            "crs": str,
-            "width": int,
-            "height": int,
-            "geotransform": dict,
-            "scale_x": (int, float),
-            "scale_y": (int, float),
-            "manifest": dict,
-            "outname": str,
-        }
+        Columns are checked through their dtype, falling back to a per-cell scan only
+        to locate offending rows. Manifests are grouped by structure (keys and value
+        types) and every distinct structure is checked once. All problems are
+        collected and reported in a single error.
+
+        Args:
+            mode: "full" checks every cell and every manifest, "fast" only checks
+                column dtypes and the first manifest, "off" skips validation.
+
+        Raises:
+            ValueError: Listing every problem found.
+        """
+        if mode == "off":
+            return
 
-        df_cols = set(self._dataframe.columns)
-        required_cols = set(required_columns.keys())
+        df = self._dataframe
+        errors: list[str] = []
 
         # 1. Check for missing columns
-        missing_cols = required_cols - df_cols
+        missing_cols = set(_COLUMN_KINDS) - set(df.columns)
         if missing_cols:
             raise ValueError(f"Missing required columns in dataframe: {missing_cols}")
 
-        # 2. (Optional) Check for extra columns
-        # extra_cols = df_cols - required_cols
-        # if extra_cols:
-        #     raise ValueError(f"Unexpected extra columns in dataframe: {extra_cols}")
-
-        # 3. Verify data types (basic check)
-        for col_name, expected_type in required_columns.items():
-            for i, value in enumerate(self._dataframe[col_name]):
-                if not isinstance(value, expected_type):
-                    # For cases like (int, float), you can check with isinstance(value, (int, float))
-                    # or directly use the tuple in `expected_type`
-                    if isinstance(expected_type, tuple):
-                        if not any(isinstance(value, t) for t in expected_type):
-                            raise ValueError(
-                                f"Column '{col_name}' has an invalid type in row {i}. "
-                                f"Expected one of {expected_type}, got {type(value)}"
-                            )
-                    else:
-                        raise ValueError(
-                            f"Column '{col_name}' has an invalid type in row {i}. "
-                            f"Expected {expected_type}, got {type(value)}"
-                        )
-                    
-        for i, row in self._dataframe.iterrows():
-            manifest = row["manifest"]
-
-            # Main required keys
-            for key in ["fileFormat", "bandIds", "grid"]:
-                if key not in manifest:
-                    raise ValueError(
-                        f"Missing key '{key}' in 'manifest' for row index {i}"
-                    )
-
-            # At least one of 'assetId' or 'expression'
-            if not any(k in manifest for k in ["assetId", "expression"]):
-                raise ValueError(
-                    f"Manifest in row {i} does not contain 'assetId' or 'expression'"
+        # 2. Verify data types column by column
+        for col_name, kind in _COLUMN_KINDS.items():
+            if kind == "dict" and mode == "fast":
+                continue
+            bad = _invalid_rows(df[col_name], kind)
+            if len(bad):
+                errors.append(
+                    f"Column '{col_name}' has invalid types in rows {_head(bad)}. "
+                    f"Expected {_KIND_NAMES[kind]}."
                 )
 
-            # Basic validation of 'grid'
-            grid = manifest["grid"]
-            for subkey in ["dimensions", "affineTransform", "crsCode"]:
-                if subkey not in grid:
-                    raise ValueError(
-                        f"Missing key '{subkey}' in 'manifest.grid' for row index {i}"
+        # 3. Validate the manifest structure once per distinct template
+        manifests = df["manifest"] if mode == "full" else df["manifest"].iloc[:1]
+        templates: dict[tuple, list[Any]] = {}
+        for index, manifest in zip(manifests.index, manifests):
+            templates.setdefault(_manifest_template(manifest), []).append(index)
+        for rows in templates.values():
+            for problem in _manifest_problems(df.at[rows[0], "manifest"]):
+                errors.append(f"{problem} in rows {_head(rows)}")
+
+        # 4. Dimensions must be positive (checked on the validated columns)
+        if not errors and mode == "full" and len(df):
+            dims = np.array(
+                [
+                    (m["grid"]["dimensions"]["width"], m["grid"]["dimensions"]["height"])
+                    for m in df["manifest"]
+                ]
+            )
+            for j, dim_key in enumerate(("width", "height")):
+                bad = df.index[dims[:, j] <= 0]
+                if len(bad):
+                    errors.append(
+                        f"'{dim_key}' in 'manifest.grid.dimensions' must be a positive "
+                        f"integer in rows {_head(bad)}"
                     )
 
-            # Basic validation of 'dimensions'
-            dims = grid["dimensions"]
-            for dim_key in ["width", "height"]:
-                if dim_key not in dims:
-                    raise ValueError(
-                        f"Missing '{dim_key}' in 'manifest.grid.dimensions' for row {i}"
-                    )
-                if not isinstance(dims[dim_key], int) or dims[dim_key] <= 0:
-                    raise ValueError(
-                        f"'{dim_key}' in 'manifest.grid.dimensions' must be a positive integer. "
-                        f"Row {i} has value {dims[dim_key]}"
-                    )
+        if errors:
+            raise ValueError(
+                "Invalid RequestSet dataframe:\n" + "\n".join(f"- {e}" for e in errors)
+            )
 
-            # Basic validation of 'affineTransform'
-            aff = grid["affineTransform"]
-            for a_key in ["scaleX", "shearX", "translateX", "scaleY", "shearY", "translateY"]:
-                if a_key not in aff:
-                    raise ValueError(
-                        f"Missing '{a_key}' in 'manifest.grid.affineTransform' for row {i}"
-                    )
-                if not isinstance(aff[a_key], (int, float)):
-                    raise ValueError(
-                        f"Value for '{a_key}' in 'manifest.grid.affineTransform' must be numeric. "
-                        f"Row {i} has {type(aff[a_key])}."
-                    )
 
 
+    def _validate_columns(
+        self,
+        mode: ValidationMode = "full",
+        columns: _RequestColumns | None = None,
+    ) -> None:
+        """
+        Validates columnar storage built by :meth:`from_columns`.
+
+        Ids must be unique, CRS strings parseable, sizes positive and scales
+        non-zero and finite. All problems are reported in a single error.
+
+        Args:
+            mode: "full" or "fast" validate, "off" skips validation. Ids of
+                new *columns* are checked at every level.
+            columns: New entries about to be appended; their ids are also
+                checked against the ids already in the set. Defaults to the
+                set's own columns.
+
+        Raises:
+            ValueError: Listing every problem found.
+        """
+        if mode == "off" and columns is None:
+            return
+
+        cols = self._columns if columns is None else columns
+        # rows of new entries are numbered as they will be once appended
+        offset = 0 if columns is None else len(self._columns)
+        errors: list[str] = []
+
+        ids = cols.ids.to_pandas()
+        duplicated = ids[ids.duplicated()]
+        if len(duplicated):
+            errors.append(f"All entries must have unique IDs, repeated: {_head(duplicated.unique())}")
+        if columns is not None:
+            index = self._id_index()
+            clashes = [i for i in ids.unique() if i in index]
+            if clashes:
+                errors.append(f"All entries must have unique IDs, already present: {_head(clashes)}")
+        if mode != "off":
+            errors.extend(self._column_errors(cols, offset))
+
+        if errors:
+            raise ValueError(
+                "Invalid RequestSet columns:\n" + "\n".join(f"- {e}" for e in errors)
+            )
+
+    @staticmethod
+    def _column_errors(cols: _RequestColumns, offset: int) -> list[str]:
+        """Problems of *cols* other than repeated ids (see :meth:`_validate_columns`)."""
+        errors: list[str] = []
+        if cols.ids.null_count or cols.images.null_count:
+            errors.append("Ids and images cannot be missing")
+
+        for crs in cols.crs_values:
+            try:
+                CRS.from_user_input(crs)
+            except Exception:
+                errors.append(f"Invalid CRS format: {crs}")
+
+        for name, values in (("width", cols.width), ("height", cols.height)):
+            bad = np.flatnonzero(values <= 0)
+            if len(bad):
+                errors.append(f"{name} must be positive and greater than zero in rows {_head(bad + offset)}")
+
+        gt = cols.geotransform
+        bad = np.flatnonzero(~np.isfinite(gt).all(axis=1) | (gt[:, 0] == 0) | (gt[:, 3] == 0))
+        if len(bad):
+            errors.append(f"Geotransform must be finite with non-zero scales in rows {_head(bad + offset)}")
+        return errors
+
+    def _id_index(self) -> set[str]:
+        """Hash index of the ids in the set, built on first use."""
+        if self._ids is None:
+            self._ids = set(self._columns.ids.to_pylist())
+        return self._ids
+
+    def _derive(self, columns: _RequestColumns, frame: pd.DataFrame | None) -> RequestSet:
+        """Return a new set over *columns*, already validated by the caller."""
+        requests = type(self).model_construct(requestset=columns, validation=self.validation)
+        requests._columns = columns
+        requests._frame = frame
+        return requests
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __getitem__(self, index):
+        """
+        Select requests by position.
+
+        Args:
+            index: An integer returns a Request; a slice, an integer array or a
+                boolean mask returns a new RequestSet.
+        """
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        if np.ndim(index) == 0:
+            return self._columns[index]
+        index = np.asarray(index)
+        if index.dtype == bool:
+            return self.filter(index)
+        return self.take(index)
+
+    def take(self, indices: Sequence[int] | np.ndarray) -> RequestSet:
+        """
+        Return a new set with the requests at *indices*, in that order.
+
+        Nothing is revalidated; an already built dataframe is sliced rather
+        than rebuilt.
+
+        Args:
+            indices: Positions of the requests to keep.
+
+        Returns:
+            RequestSet: The selected requests.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = np.where(indices < 0, indices + len(self), indices)
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError("RequestSet index out of range")
+        if len(np.unique(indices)) != len(indices):
+            raise ValueError("All entries must have unique IDs")
+        frame = None if self._frame is None else self._frame.iloc[indices].reset_index(drop=True)
+        return self._derive(self._columns.take(indices), frame)
+
+    def filter(self, mask: Sequence[bool] | np.ndarray | pd.Series) -> RequestSet:
+        """
+        Return a new set with the requests where *mask* is True.
+
+        Args:
+            mask: One boolean per request, aligned by position.
+
+        Returns:
+            RequestSet: The selected requests.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (len(self),):
+            raise ValueError(f"Mask must have {len(self)} entries, got {mask.shape}")
+        return self.take(np.flatnonzero(mask))
+
+    def extend(self, requests: RequestSet | Sequence[Request]) -> None:
+        """
+        Append *requests* in place.
+
+        Only the new entries are validated (at the set's validation level) and
+        their ids are checked against the hash index of existing ids, even
+        when validation is "off". A built dataframe is extended with the new
+        rows only.
+
+        Args:
+            requests: Another RequestSet or Request objects.
+
+        Raises:
+            ValueError: If the new entries are invalid or repeat an id.
+        """
+        if isinstance(requests, RequestSet):
+            columns, frame = requests._columns, requests._frame
+        else:
+            columns, frame = _RequestColumns.from_requests(list(requests)), None
+        if not len(columns):
+            return
+
+        self._validate_columns(self.validation, columns)
+
+        if self._frame is not None:
+            new_frame = columns.frame() if frame is None else frame
+            self._frame = pd.concat([self._frame, new_frame], ignore_index=True)
+        if self._ids is not None:
+            self._ids.update(columns.ids.to_pylist())
+        self._columns = _RequestColumns.concat([self._columns, columns])
+        self.requestset = self._columns
+
+    @classmethod
+    def concat(cls, sets: Sequence[RequestSet]) -> RequestSet:
+        """
+        Concatenate request sets without revalidating them.
+
+        Only ids are checked for uniqueness across the sets.
+
+        Args:
+            sets: The sets to join, in order.
+
+        Returns:
+            RequestSet: A new set with every request.
+
+        Raises:
+            ValueError: If an id appears in more than one set.
+        """
+        sets = list(sets)
+        if not sets:
+            raise ValueError("Nothing to concatenate")
+        columns = _RequestColumns.concat([s._columns for s in sets])
+        ids = columns.ids.to_pandas()
+        duplicated = ids[ids.duplicated()]
+        if len(duplicated):
+            raise ValueError(
+                f"All entries must have unique IDs, repeated: {_head(duplicated.unique())}"
+            )
+        frame = None
+        if all(s._frame is not None for s in sets):
+            frame = pd.concat([s._frame for s in sets], ignore_index=True)
+        levels = [s.validation for s in sets]
+        validation = next(
+            (level for level in ("off", "fast") if level in levels), "full"
+        )
+        requests = cls.model_construct(requestset=columns, validation=validation)
+        requests._columns = columns
+        requests._frame = frame
+        return requests
 
     @model_validator(mode="after")
     def validate_metadata(self) -> RequestSet:
@@ -435,6 +1475,10 @@ class RequestSet(BaseModel):
         Raises:
             ValueError: If any CRS is invalid or inconsistent.
         """
+        self._columns = _RequestColumns.from_requests(self.requestset)
+        if self.validation == "off":
+            return self
+
         # 1. Pre-consistency validation (CRS, IDs, etc.)
         crs_set: Set[str] = {meta.raster_transform.crs for meta in self.requestset}
         validated_crs: Set[str] = set()
@@ -458,7 +1502,7 @@ class RequestSet(BaseModel):
         self._dataframe = self.create_manifests()
         
         # 3. We validate the structure of the dataframe
-        self._validate_dataframe_schema()
+        self._validate_dataframe_schema(self.validation)
 
         return self
     
@@ -471,7 +1515,7 @@ class RequestSet(BaseModel):
         Returns:
             str: A string representation of the entire RasterTransformSet.
         """
-        num_entries = len(self.requestset)
+        num_entries = len(self._columns) if self._columns is not None else len(self.requestset)
         return f"RequestSet({num_entries} entries)"
 
     def __str__(self):
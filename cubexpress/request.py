@@ -2,34 +2,112 @@
 
 from __future__ import annotations
 
+import functools
+import json
+import re
+
 import ee
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pygeohash as pgh
 
-from cubexpress.geotyping import Request, RequestSet
-from cubexpress.conversion import lonlat2rt
+from cubexpress.geotyping import RequestSet
+from cubexpress.conversion import lonlat2rt_many
+
+# Stand-in asset id used to serialize mosaic templates
+_PLACEHOLDER = "cubexpress-placeholder-{}"
+_PLACEHOLDER_RE = re.compile(r'"cubexpress-placeholder-(\d+)"')
+
+
+@functools.lru_cache(maxsize=64)
+def _mosaic_template(count: int) -> tuple[tuple[str, ...], tuple[int, ...]]:
+    """Serialize a *count*-image mosaic once.
+
+    Returns the JSON split around its asset ids: the literal pieces and, for
+    each gap between two pieces, which image of the collection goes there.
+    """
+    expression = ee.ImageCollection(
+        [ee.Image(_PLACEHOLDER.format(j)) for j in range(count)]
+    ).mosaic().serialize()
+    pieces = _PLACEHOLDER_RE.split(expression)
+    slots = tuple(int(j) for j in pieces[1::2])
+    if sorted(slots) != list(range(count)):  # pragma: no cover – serializer changed
+        raise RuntimeError("Unexpected mosaic serialization; use template=False.")
+    return tuple(pieces[::2]), slots
+
+
+def _mosaic_expression(asset_ids: list[str]) -> str:
+    """Serialized ``ee.ImageCollection(asset_ids).mosaic()`` built from a template.
+
+    The output is identical to serializing the graph client-side, as long as
+    the ids are distinct (the serializer would merge repeated ones).
+    """
+    pieces, slots = _mosaic_template(len(asset_ids))
+    quoted = [json.dumps(asset_id) for asset_id in asset_ids]
+    out = [pieces[0]]
+    for slot, piece in zip(slots, pieces[1:]):
+        out += [quoted[slot], piece]
+    return "".join(out)
+
+
+def _tiles(image_ids: pd.Series) -> pd.Series:
+    """MGRS tile of every Sentinel-2 id (``..._T18LVN`` -> ``18LVN``)."""
+    tiles = pc.extract_regex(
+        pa.array(image_ids, type=pa.string()), r"(?:^|_)[^_](?P<tile>[^_]*)$"
+    )
+    # positional values relabelled with the caller's (possibly filtered) index
+    return pd.Series(
+        pc.struct_field(tiles, "tile").to_numpy(zero_copy_only=False),
+        index=image_ids.index,
+    )
+
+
+def _site_hashes(lon: np.ndarray, lat: np.ndarray, precision: int = 5) -> list[str]:
+    """Geohash of every site, lengthened only where distinct sites would clash."""
+    full = [pgh.encode(y, x, precision=12) for x, y in zip(lon, lat)]
+    hashes = pd.Series([h[:precision] for h in full])
+    for longer in range(precision + 1, 13):
+        clash = hashes.duplicated(keep=False)
+        if not clash.any():
+            break
+        hashes[clash] = [h[:longer] for h, c in zip(full, clash) if c]
+    return hashes.tolist()
 
 
 def table_to_requestset(
         table: pd.DataFrame, 
-        mosaic: bool = True
+        mosaic: bool = True,
+        template: bool = True,
     ) -> RequestSet:
     """Return a :class:`RequestSet` built from *df* (cloud_table result).
 
     Parameters
     ----------
     df
-        DataFrame with *day* and *images* columns plus attrs created by
-        :pyfunc:`cubexpress.cloud_table`.
+        Cloud table with *id*, *cs_cdf* and *date* columns. The site comes
+        from ``df.attrs`` (:func:`cubexpress.s2_cloud_table`) or, for a long
+        table covering many sites (:func:`cubexpress.s2_cloud_tables`), from
+        *lon*, *lat* and optionally *edge_size* columns.
     mosaic
-        If ``True`` a single mosaic per day is requested; otherwise each
-        individual asset becomes its own request.
+        If ``True`` a single mosaic per day and site is requested; otherwise
+        each individual asset becomes its own request.
+    template
+        Build the mosaic expressions by substituting asset ids into one
+        serialized mosaic per image count instead of building and
+        serializing an ``ee.ImageCollection`` per day. The manifests are
+        identical either way.
 
     Raises
     ------
     ValueError
         If *df* is empty after filtering.
 
+    Notes
+    -----
+    Request ids embed a 5-character geohash of the site, lengthened for sites
+    that would otherwise share one.
     """
 
     
@@ -38,70 +116,66 @@ def table_to_requestset(
     if df.empty:
         raise ValueError("cloud_table returned no rows; nothing to request.")
 
-    rt = lonlat2rt(
-        lon=df.attrs["lon"],
-        lat=df.attrs["lat"],
-        edge_size=df.attrs["edge_size"],
-        scale=df.attrs["scale"],
+    for column in ("lon", "lat", "edge_size"):
+        if column not in df.columns:
+            df[column] = df.attrs[column]
+    scale = df.attrs["scale"]
+    collection = df.attrs["collection"]
+
+    # ─── 1. One raster transform and geohash per distinct site ─────────────
+    site_cols = ["lon", "lat", "edge_size"]
+    df["site_code"] = df.groupby(site_cols, sort=False).ngroup()
+    sites = df.drop_duplicates("site_code").sort_values("site_code")[site_cols]
+    transforms = lonlat2rt_many(
+        lon=sites["lon"].to_numpy(),
+        lat=sites["lat"].to_numpy(),
+        edge_size=sites["edge_size"].to_numpy(dtype=int),
+        scale=scale,
+    )
+    site_hash = np.array(
+        _site_hashes(sites["lon"].to_numpy(), sites["lat"].to_numpy()), dtype=object
     )
-    centre_hash = pgh.encode(df.attrs["lat"], df.attrs["lon"], precision=5)
-    reqs: list[Request] = []
-
-
 
+    # ─── 2. Request ids and images, column-wise ────────────────────────────
     if mosaic:
-        grouped = (
-        df.groupby('date')
-            .agg(
-                id_list      = ('id', list),
-                cs_cdf_mean  = ('cs_cdf', lambda x: int(round(x.mean(), 2) * 100))
-            )
+        grouped = df.groupby(["site_code", "date"], sort=True)
+        days = grouped.agg(
+            count=("id", "size"), first=("id", "first"), cs_cdf=("cs_cdf", "mean")
+        ).reset_index()
+        codes = days["site_code"].to_numpy()
+        hashes = pd.Series(site_hash[codes], index=days.index)
+        cdfs = (days["cs_cdf"].round(2) * 100).astype(int).astype(str)
+        tiles = _tiles(days["first"])
+        single = (days["count"] == 1).to_numpy()
+
+        # one-image days keep the asset; several images become a mosaic
+        ids = (days["date"] + "_" + hashes + "_" + tiles + "_" + cdfs).where(
+            single, days["date"] + "_" + hashes + "_" + cdfs
         )
-
-        for day, row in grouped.iterrows():
-            
-            img_ids   = row["id_list"]
-            cdf  = row["cs_cdf_mean"]
-            
-            if len(img_ids) > 1:
-
-                ee_img = ee.ImageCollection(
-                    [ee.Image(f"{df.attrs['collection']}/{img}") for img in img_ids]
-                ).mosaic()
-
-                reqs.append(
-                    Request(
-                        id=f"{day}_{centre_hash}_{cdf}",
-                        raster_transform=rt,
-                        image=ee_img,
-                        bands=df.attrs["bands"],
-                    )
-                )
-            else:
-                for img_id in img_ids:
-                    tile = img_id.split("_")[-1][1:]
-                    reqs.append(
-                        Request(
-                            id=f"{day}_{centre_hash}_{tile}_{cdf}",
-                            raster_transform=rt,
-                            image=f"{df.attrs['collection']}/{img_id}",
-                            bands=df.attrs["bands"],
-                        )
-                    )
+        images = (collection + "/" + days["first"]).to_numpy(dtype=object, copy=True)
+        if not single.all():
+            id_lists = df[df.groupby(["site_code", "date"])["id"].transform("size") > 1]
+            id_lists = id_lists.groupby(["site_code", "date"], sort=True)["id"].agg(list)
+            for position, img_ids in zip(np.flatnonzero(~single), id_lists):
+                assets = [f"{collection}/{img}" for img in img_ids]
+                if template and len(set(assets)) == len(assets):
+                    images[position] = _mosaic_expression(assets)
+                else:
+                    images[position] = ee.ImageCollection(
+                        [ee.Image(asset) for asset in assets]
+                    ).mosaic()
     else:
-        for _, row in df.iterrows():
-            img_id = row["id"]
-            tile = img_id.split("_")[-1][1:]
-            day = row["date"]
-            cdf = int(round(row["cs_cdf"], 2) * 100)
-
-            reqs.append(
-                Request(
-                    id=f"{day}_{centre_hash}_{tile}_{cdf}",
-                    raster_transform=rt,
-                    image=f"{df.attrs['collection']}/{img_id}",
-                    bands=df.attrs["bands"],
-                )
-            )
-
-    return RequestSet(requestset=reqs)
+        codes = df["site_code"].to_numpy()
+        hashes = pd.Series(site_hash[codes], index=df.index)
+        tiles = _tiles(df["id"])
+        cdfs = (df["cs_cdf"].round(2) * 100).astype(int).astype(str)
+        ids = df["date"] + "_" + hashes + "_" + tiles + "_" + cdfs
+        images = pa.array(collection + "/" + df["id"], type=pa.string())
+
+    return RequestSet.from_transforms(
+        ids=ids,
+        transforms=transforms.iloc[codes],
+        images=images,
+        bands=df.attrs["bands"],
+        validate="fast",
+    )
@@ -0,0 +1,317 @@
+"""Chunked time-series store for :func:`cubexpress.cube.get_cube`.
+
+Every date of one site goes into a single Zarr v2 directory store::
+
+    cube.zarr/
+        .zgroup  .zattrs                 crs, transform, bands and the index
+        pixels/.zarray  pixels/t.b.y.x   uint16 (time, band, y, x), zlib chunks
+        time/.zarray    time/0           days since 1970-01-01
+
+The layout is written by hand (no ``zarr`` dependency) and can be opened
+with ``zarr.open_group`` or ``xarray.open_zarr``. Chunks span either one
+date and a large window (``"time"``-major, cheap to append and to read as
+images) or many dates and a small window (``"space"``-major, cheap to read
+a pixel's history); see :data:`CHUNKS`. A ``"space"`` chunk is shared by 64
+dates and must be decompressed and rewritten to add one, so those dates are
+best written together with :meth:`ZarrStore.write_many`.
+
+New dates are appended along ``time`` under a store-wide lock; pixels are
+written chunk by chunk, each chunk under its own advisory lock (see
+:func:`cubexpress.cache._file_lock`) and atomically renamed into place, so
+several threads or processes can fill different dates of the same store.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import pathlib
+import threading
+import zlib
+from typing import Any, Final, Sequence
+
+import numpy as np
+import pandas as pd
+
+from cubexpress.cache import _file_lock
+
+# Chunk shape (time, band, y, x) of each named layout; a band size of None
+# means "all bands"
+CHUNKS: Final[dict[str, tuple[int, int | None, int, int]]] = {
+    "time": (1, None, 512, 512),
+    "space": (64, None, 32, 32),
+}
+
+_DTYPE: Final[str] = "<u2"
+_FILL: Final[int] = 65535
+_COMPRESSOR: Final[dict[str, Any]] = {"id": "zlib", "level": 1}
+
+
+def _write_atomic(path: pathlib.Path, data: bytes) -> None:
+    """Write *data* to a temporary sibling of *path* and rename it into place."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _write_json(path: pathlib.Path, obj: dict[str, Any]) -> None:
+    # strict JSON: zarr and xarray reject the bare NaN / Infinity tokens
+    _write_atomic(path, json.dumps(obj, indent=2, allow_nan=False).encode())
+
+
+class ZarrStore:
+    """A ``(time, band, y, x)`` uint16 cube stored as a Zarr v2 group.
+
+    Parameters
+    ----------
+    path
+        Folder of the store (conventionally ``*.zarr``).
+    """
+
+    def __init__(self, path: pathlib.Path | str) -> None:
+        self.path = pathlib.Path(path)
+
+    # ─── layout ───────────────────────────────────────────────────────────
+    @classmethod
+    def open(
+        cls,
+        path: pathlib.Path | str,
+        bands: Sequence[str],
+        height: int,
+        width: int,
+        crs: str,
+        transform: Sequence[float],
+        chunks: str | Sequence[int] = "time",
+    ) -> ZarrStore:
+        """Open the store at *path*, creating it on first use.
+
+        Parameters
+        ----------
+        path
+            Folder of the store.
+        bands, height, width, crs, transform
+            Grid of every date; an existing store must match it. *transform*
+            is the affine ``(a, b, c, d, e, f)`` of the upper-left pixel.
+        chunks
+            ``"time"``, ``"space"`` or an explicit ``(time, band, y, x)``
+            chunk shape. Only used when the store is created.
+
+        Returns
+        -------
+        ZarrStore
+            The opened store.
+        """
+        store = cls(path)
+        grid = {
+            "crs": crs,
+            "transform": [float(v) for v in transform],
+            "bands": list(bands),
+        }
+        with store._lock("meta"):
+            if (store.path / ".zgroup").exists():
+                attrs = store._attrs()
+                shape = store._zarray()["shape"]
+                if {k: attrs[k] for k in grid} != grid or shape[2:] != [height, width]:
+                    raise ValueError(
+                        f"{store.path} holds another grid or band set; "
+                        "use a different output folder."
+                    )
+                return store
+
+            if isinstance(chunks, str):
+                try:
+                    chunks = CHUNKS[chunks]
+                except KeyError:
+                    raise ValueError(
+                        f"chunks must be one of {sorted(CHUNKS)} or a 4-tuple, got {chunks!r}"
+                    ) from None
+            ct, cb, cy, cx = chunks
+            chunk_shape = [ct, cb or len(bands), min(cy, height), min(cx, width)]
+
+            (store.path / "pixels").mkdir(parents=True, exist_ok=True)
+            (store.path / "time").mkdir(exist_ok=True)
+            _write_json(store.path / ".zgroup", {"zarr_format": 2})
+            _write_json(
+                store.path / "pixels" / ".zarray",
+                {
+                    "zarr_format": 2,
+                    "shape": [0, len(bands), height, width],
+                    "chunks": chunk_shape,
+                    "dtype": _DTYPE,
+                    "compressor": _COMPRESSOR,
+                    "fill_value": _FILL,
+                    "order": "C",
+                    "filters": None,
+                },
+            )
+            _write_json(
+                store.path / "pixels" / ".zattrs",
+                {"_ARRAY_DIMENSIONS": ["time", "band", "y", "x"]},
+            )
+            _write_json(
+                store.path / "time" / ".zattrs",
+                {
+                    "_ARRAY_DIMENSIONS": ["time"],
+                    "units": "days since 1970-01-01",
+                    "calendar": "proleptic_gregorian",
+                },
+            )
+            store._write_time([])
+            _write_json(
+                store.path / ".zattrs",
+                {**grid, "index": {"id": [], "date": [], "cs_cdf": [], "complete": []}},
+            )
+        return store
+
+    def _lock(self, name: str):
+        return _file_lock(self.path / ".locks" / f"{name}.lock")
+
+    def _attrs(self) -> dict[str, Any]:
+        return json.loads((self.path / ".zattrs").read_text())
+
+    def _zarray(self) -> dict[str, Any]:
+        return json.loads((self.path / "pixels" / ".zarray").read_text())
+
+    def _write_time(self, dates: list[str]) -> None:
+        days = np.array(dates, dtype="datetime64[D]").astype("<i8")
+        _write_json(
+            self.path / "time" / ".zarray",
+            {
+                "zarr_format": 2,
+                "shape": [len(days)],
+                "chunks": [max(len(days), 1)],
+                "dtype": "<i8",
+                "compressor": None,
+                "fill_value": None,
+                "order": "C",
+                "filters": None,
+            },
+        )
+        _write_atomic(self.path / "time" / "0", days.tobytes())
+
+    # ─── index ────────────────────────────────────────────────────────────
+    def index(self) -> pd.DataFrame:
+        """Return ``id``, ``date``, ``cs_cdf`` and ``complete`` of every time slot."""
+        return pd.DataFrame(self._attrs()["index"])
+
+    def register(self, ids: Sequence[str], dates: Sequence[str], cs_cdf: Sequence[float]) -> np.ndarray:
+        """Return the time slot of every id, appending the unknown ones.
+
+        New slots grow ``time`` in the order given and start incomplete.
+        Non-finite scores (e.g. of a fully masked ROI) are stored as null.
+        """
+        with self._lock("meta"):
+            attrs = self._attrs()
+            index = attrs["index"]
+            slots = {request_id: slot for slot, request_id in enumerate(index["id"])}
+            new = [
+                (request_id, date, float(cs) if math.isfinite(cs) else None)
+                for request_id, date, cs in zip(ids, dates, cs_cdf)
+                if request_id not in slots
+            ]
+            if new:
+                for request_id, date, cs in new:
+                    slots[request_id] = len(index["id"])
+                    index["id"].append(request_id)
+                    index["date"].append(date)
+                    index["cs_cdf"].append(cs)
+                    index["complete"].append(False)
+                zarray = self._zarray()
+                zarray["shape"][0] = len(index["id"])
+                # grow the array before publishing the index that points into it
+                _write_json(self.path / "pixels" / ".zarray", zarray)
+                self._write_time(index["date"])
+                _write_json(self.path / ".zattrs", attrs)
+        return np.array([slots[request_id] for request_id in ids], dtype=np.int64)
+
+    def chunks(self) -> tuple[int, int, int, int]:
+        """Chunk shape ``(time, band, y, x)`` of the pixels."""
+        return tuple(self._zarray()["chunks"])
+
+    def mark_complete(self, slots: Sequence[int]) -> None:
+        """Flag *slots* as fully written."""
+        with self._lock("meta"):
+            attrs = self._attrs()
+            for slot in slots:
+                attrs["index"]["complete"][int(slot)] = True
+            _write_json(self.path / ".zattrs", attrs)
+
+    # ─── pixels ───────────────────────────────────────────────────────────
+    def _read_chunk(self, key: str, chunks: Sequence[int]) -> np.ndarray:
+        path = self.path / "pixels" / key
+        if not path.exists():
+            return np.full(chunks, _FILL, dtype=_DTYPE)
+        raw = zlib.decompress(path.read_bytes())
+        return np.frombuffer(raw, dtype=_DTYPE).reshape(chunks).copy()
+
+    def _write_chunk(self, key: str, chunk: np.ndarray) -> None:
+        data = zlib.compress(np.ascontiguousarray(chunk).tobytes(), _COMPRESSOR["level"])
+        _write_atomic(self.path / "pixels" / key, data)
+
+    def write(self, slot: int, data: np.ndarray) -> None:
+        """Write one date *data* ``(band, y, x)`` into time *slot*."""
+        self.write_many([slot], [data])
+
+    def write_many(self, slots: Sequence[int], data: Sequence[np.ndarray]) -> None:
+        """Write the dates *data* ``(band, y, x)`` into their time *slots*.
+
+        Chunks holding a single date are overwritten outright. Chunks shared
+        with other dates are read, patched and rewritten under their lock,
+        once per call: writing the dates of one time chunk together avoids
+        recompressing the chunk for each of them.
+        """
+        ct, cb, cy, cx = self._zarray()["chunks"]
+        groups: dict[int, list[tuple[int, np.ndarray]]] = {}
+        for slot, date in zip(slots, data):
+            t, offset = divmod(int(slot), ct)
+            groups.setdefault(t, []).append((offset, date))
+
+        for t, dates in groups.items():
+            bands, height, width = dates[0][1].shape
+            for b in range(math.ceil(bands / cb)):
+                for y in range(math.ceil(height / cy)):
+                    for x in range(math.ceil(width / cx)):
+                        key = f"{t}.{b}.{y}.{x}"
+                        window = (
+                            slice(b * cb, (b + 1) * cb),
+                            slice(y * cy, (y + 1) * cy),
+                            slice(x * cx, (x + 1) * cx),
+                        )
+                        if ct == 1:
+                            chunk = np.full((1, cb, cy, cx), _FILL, dtype=_DTYPE)
+                            self._patch(chunk, dates, window)
+                            self._write_chunk(key, chunk)
+                            continue
+                        with self._lock(f"chunk-{key}"):
+                            chunk = self._read_chunk(key, (ct, cb, cy, cx))
+                            self._patch(chunk, dates, window)
+                            self._write_chunk(key, chunk)
+
+    @staticmethod
+    def _patch(
+        chunk: np.ndarray, dates: list[tuple[int, np.ndarray]], window: tuple[slice, ...]
+    ) -> None:
+        """Copy the *window* of every ``(offset, date)`` into *chunk*."""
+        for offset, date in dates:
+            part = date[window]
+            chunk[(offset, *(slice(0, n) for n in part.shape))] = part
+
+    def read_series(self, row: int, col: int) -> np.ndarray:
+        """Return the ``(time, band)`` history of pixel (*row*, *col*).
+
+        Only the chunks covering that pixel are decoded.
+        """
+        zarray = self._zarray()
+        n_time, bands = zarray["shape"][:2]
+        ct, cb, cy, cx = zarray["chunks"]
+        y, dy = divmod(row, cy)
+        x, dx = divmod(col, cx)
+        out = np.empty((n_time, bands), dtype=_DTYPE)
+        for t in range(math.ceil(n_time / ct)):
+            for b in range(math.ceil(bands / cb)):
+                chunk = self._read_chunk(f"{t}.{b}.{y}.{x}", (ct, cb, cy, cx))
+                times = min(ct, n_time - t * ct)
+                nb = min(cb, bands - b * cb)
+                out[t * ct:t * ct + times, b * cb:b * cb + nb] = chunk[:times, :nb, dy, dx]
+        return out
@@ -0,0 +1,266 @@
+"""Tests of the asyncio front-end against an in-memory transport."""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+
+import numpy as np
+import pandas as pd
+import pytest
+import rasterio as rio
+from rasterio.io import MemoryFile
+from rasterio.transform import Affine
+
+from cubexpress import aio, cache
+from cubexpress.request import table_to_requestset
+
+# GeoTIFFs are re-encoded with the 13 Sentinel-2 L1C bands
+BANDS = ["B1", "B2", "B3", "B4", "B5", "B6", "B7", "B8", "B8A", "B9", "B10", "B11", "B12"]
+
+
+class FakeTransport:
+    """In-memory :class:`cubexpress.aio.Transport`.
+
+    Every image has one scene per month with a fixed cloud score and uniform
+    pixels equal to the position of its asset id in *images*. Requests listed
+    in *failing* (asset ids, or ``(asset id, tile origin)`` pairs) raise
+    instead.
+    """
+
+    def __init__(self, images=(), max_pixels=None, failing=()):
+        self.images = list(images)
+        self.max_pixels = max_pixels
+        self.failing = set(failing)
+        self.windows = collections.Counter()
+        self.pixel_calls = 0
+
+    async def cloud_scores(self, lon, lat, edge_size, start, end):
+        self.windows[(start, end)] += 1
+        await asyncio.sleep(0)  # let concurrent callers interleave
+        dates = pd.date_range(start, end, freq="MS", inclusive="left").strftime("%Y-%m-%d")
+        return pd.DataFrame(
+            {
+                "id": [f"scene_{d}" for d in dates],
+                "cs_cdf": 0.9,
+                "date": list(dates),
+                "null_flag": 0,
+            }
+        )
+
+    async def pixels(self, manifest):
+        self.pixel_calls += 1
+        await asyncio.sleep(0)
+        grid = manifest["grid"]
+        width, height = grid["dimensions"]["width"], grid["dimensions"]["height"]
+        aff = grid["affineTransform"]
+        origin = (aff["translateX"], aff["translateY"])
+        if self.max_pixels is not None and width * height > self.max_pixels:
+            raise aio.ee.ee_exception.EEException(
+                f"Total request size ({width * height} pixels) must be less than "
+                f"or equal to {self.max_pixels} pixels."
+            )
+        if {manifest["assetId"], (manifest["assetId"], origin)} & self.failing:
+            raise RuntimeError("tile failed")
+
+        value = self.images.index(manifest["assetId"])
+        with MemoryFile() as memfile:
+            with memfile.open(
+                driver="GTiff",
+                width=width,
+                height=height,
+                count=len(manifest["bandIds"]),
+                dtype="uint16",
+                crs=grid["crsCode"],
+                transform=Affine(aff["scaleX"], 0, origin[0], 0, aff["scaleY"], origin[1]),
+            ) as dst:
+                dst.write(np.full((len(manifest["bandIds"]), height, width), value, "uint16"))
+            return memfile.read()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Point the process-wide metadata store at a temporary folder."""
+    store = cache.MetadataStore(tmp_path / "cache")
+    monkeypatch.setattr(cache, "_STORE", store)
+    return store
+
+
+def _cloud_table(transport, start, end, **kwargs):
+    return aio.async_s2_cloud_table(
+        -76.5, -9.2, 64, start, end, verbose=False, chunk=None, transport=transport, **kwargs
+    )
+
+
+def _image_table(n_days, edge_size=64):
+    dates = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    table = pd.DataFrame(
+        {
+            "id": [f"{d:%Y%m%dT153621}_{d:%Y%m%dT153621}_T18LVN" for d in dates],
+            "cs_cdf": 0.9,
+            "date": dates.strftime("%Y-%m-%d"),
+        }
+    )
+    table.attrs.update(
+        lon=-76.5,
+        lat=-9.2,
+        edge_size=edge_size,
+        scale=10,
+        bands=BANDS,
+        collection="COPERNICUS/S2_HARMONIZED",
+    )
+    return table
+
+
+def _asset_ids(table):
+    return [f"{table.attrs['collection']}/{i}" for i in table["id"]]
+
+
+# ─── cloud tables ─────────────────────────────────────────────────────────
+def test_cloud_table_fetches_only_cache_gaps(store):
+    transport = FakeTransport()
+
+    first = asyncio.run(_cloud_table(transport, "2020-01-01", "2020-03-01", cache=True))
+    second = asyncio.run(_cloud_table(transport, "2020-01-01", "2020-05-01", cache=True))
+    third = asyncio.run(_cloud_table(transport, "2020-02-01", "2020-03-15", cache=True))
+
+    assert list(transport.windows) == [("2020-01-01", "2020-03-01"), ("2020-03-01", "2020-05-01")]
+    assert first["date"].tolist() == ["2020-01-01", "2020-02-01"]
+    assert second["date"].tolist() == ["2020-01-01", "2020-02-01", "2020-03-01", "2020-04-01"]
+    assert third["date"].tolist() == ["2020-02-01", "2020-03-01"]
+
+
+def test_concurrent_same_key_calls_fetch_once(store):
+    transport = FakeTransport()
+
+    async def main():
+        calls = [_cloud_table(transport, "2020-01-01", "2021-01-01", cache=True) for _ in range(32)]
+        return await asyncio.wait_for(asyncio.gather(*calls), timeout=30)
+
+    results = asyncio.run(main())
+
+    assert transport.windows == {("2020-01-01", "2021-01-01"): 1}
+    assert all(len(r) == 12 for r in results)
+
+
+def test_cloud_table_without_cache_leaves_store_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_STORE", None)
+    monkeypatch.setattr(cache, "_CACHE_DIR", tmp_path / "cache")
+    transport = FakeTransport()
+
+    full = asyncio.run(_cloud_table(transport, "2020-01-01", "2020-03-01"))
+    empty = asyncio.run(_cloud_table(transport, "2020-03-01", "2020-01-01"))
+
+    assert len(full) == 2
+    assert empty.empty and list(empty.columns) == ["id", "cs_cdf", "date", "null_flag"]
+    assert list(transport.windows) == [("2020-01-01", "2020-03-01")]
+    assert cache._STORE is None and not (tmp_path / "cache").exists()
+
+
+# ─── cubes ────────────────────────────────────────────────────────────────
+def test_get_cube_reports_failed_images_and_keeps_going(tmp_path):
+    table = _image_table(3)
+    images = _asset_ids(table)
+    transport = FakeTransport(images, failing={images[1]})
+
+    result = asyncio.run(
+        aio.async_get_cube(table, tmp_path, mosaic=False, verbose=False, transport=transport)
+    )
+
+    written = [path.exists() for path in result["full_outname"]]
+    assert written == [True, False, True]
+    with rio.open(result["full_outname"][2]) as src:
+        assert (src.read() == 2).all()
+
+    # cached outputs are not requested again
+    calls = transport.pixel_calls
+    asyncio.run(aio.async_get_cube(table, tmp_path, mosaic=False, verbose=False, transport=transport))
+    assert transport.pixel_calls == calls + 1
+
+
+def test_split_image_is_assembled_in_its_windows(tmp_path):
+    table = _image_table(2)
+    transport = FakeTransport(_asset_ids(table), max_pixels=32 * 32)
+
+    result = asyncio.run(
+        aio.async_get_cube(table, tmp_path, mosaic=False, verbose=False, transport=transport)
+    )
+
+    assert transport.pixel_calls == 2 * (1 + 4)
+    for value, path in enumerate(result["full_outname"]):
+        with rio.open(path) as src:
+            assert (src.width, src.height) == (64, 64)
+            assert (src.read() == value).all()
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(p.name for p in result["full_outname"])
+
+
+def test_split_image_with_failing_tile_is_not_published(tmp_path):
+    table = _image_table(2)
+    images = _asset_ids(table)
+    aff = table_to_requestset(table, mosaic=False).manifest(0)["grid"]["affineTransform"]
+    # the upper-left tile of the first image
+    failing = {(images[0], (aff["translateX"], aff["translateY"]))}
+    transport = FakeTransport(images, max_pixels=32 * 32, failing=failing)
+
+    result = asyncio.run(
+        aio.async_get_cube(table, tmp_path, mosaic=False, verbose=False, transport=transport)
+    )
+
+    assert [path.exists() for path in result["full_outname"]] == [False, True]
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_split_image_with_vrt_join_keeps_its_tiles(tmp_path):
+    table = _image_table(1)
+    transport = FakeTransport(_asset_ids(table), max_pixels=32 * 32)
+
+    result = asyncio.run(
+        aio.async_get_cube(
+            table, tmp_path, mosaic=False, join="vrt", verbose=False, transport=transport
+        )
+    )
+
+    vrt = result["full_outname"][0]
+    assert vrt.suffix == ".vrt"
+    assert len(list((tmp_path / vrt.stem).glob("*.tif"))) == 4
+    with rio.open(vrt) as src:
+        assert (src.width, src.height) == (64, 64)
+        assert (src.read() == 0).all()
+
+
+def test_unknown_join_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="join must be"):
+        asyncio.run(
+            aio.async_get_cube(
+                _image_table(1), tmp_path, join="mosaic", verbose=False, transport=FakeTransport()
+            )
+        )
+
+
+def test_split_image_with_vrt_join_waits_for_every_tile(tmp_path):
+    table = _image_table(1)
+    images = _asset_ids(table)
+    aff = table_to_requestset(table, mosaic=False).manifest(0)["grid"]["affineTransform"]
+    transport = FakeTransport(
+        images, max_pixels=32 * 32, failing={(images[0], (aff["translateX"], aff["translateY"]))}
+    )
+
+    def run():
+        return asyncio.run(
+            aio.async_get_cube(
+                table, tmp_path, mosaic=False, join="vrt", verbose=False, transport=transport
+            )
+        )
+
+    path = run()["full_outname"][0]
+    assert path.suffix == ".tif" and not path.exists()
+    assert not list(tmp_path.glob("*.vrt"))
+    assert len(list((tmp_path / path.stem).glob("*.tif"))) == 3
+
+    # the retry only asks for the missing tile
+    transport.failing.clear()
+    calls = transport.pixel_calls
+    vrt = run()["full_outname"][0]
+    assert transport.pixel_calls == calls + 2  # the full image, then its missing tile
+    with rio.open(vrt) as src:
+        assert (src.read() == 0).all()
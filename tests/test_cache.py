@@ -0,0 +1,212 @@
+"""Tests of the partitioned metadata store and its SQLite index."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from cubexpress import cache
+
+COLLECTION = "COPERNICUS/S2_HARMONIZED"
+
+
+def _key(i: int) -> cache.CacheKey:
+    # neighbouring sites share one partition
+    return cache._cache_key(-76.5 + i * 0.001, -9.2, 64, 10, COLLECTION)
+
+
+def _rows(dates, prefix="s"):
+    return pd.DataFrame(
+        {
+            "id": [f"{prefix}_{d}" for d in dates],
+            "cs_cdf": 0.8,
+            "date": list(dates),
+            "null_flag": 0,
+        }
+    )
+
+
+def _fill(store, key, start="2020-01-01", end="2020-01-04", prefix="s"):
+    dates = pd.date_range(start, end, freq="D", inclusive="left").strftime("%Y-%m-%d")
+    store.append([(key, _rows(dates, prefix), [(start, end)])])
+
+
+def _set_access(store, digest, when):
+    store.index.flush()
+    with store.index._connect() as con:
+        con.execute("UPDATE entries SET last_access = ? WHERE key = ?", (when, digest))
+
+
+def _stored_rows(store, partition):
+    return sum(
+        pq.read_metadata(f).num_rows for f in (store.root / "metadata" / partition).glob("*.parquet")
+    )
+
+
+def _stored_bytes(store, partition):
+    return sum(
+        f.stat().st_size
+        for dataset in ("metadata", "coverage")
+        for f in (store.root / dataset / partition).glob("*.parquet")
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return cache.MetadataStore(tmp_path / "cache")
+
+
+# ─── intervals ────────────────────────────────────────────────────────────
+def test_missing_intervals_skip_merged_coverage():
+    covered = cache._merge_intervals(
+        [("2020-03-01", "2020-04-01"), ("2020-01-01", "2020-02-01"), ("2020-01-15", "2020-02-15")]
+    )
+    assert covered == [("2020-01-01", "2020-02-15"), ("2020-03-01", "2020-04-01")]
+    assert cache._missing_intervals(covered, "2019-12-01", "2020-05-01") == [
+        ("2019-12-01", "2020-01-01"),
+        ("2020-02-15", "2020-03-01"),
+        ("2020-04-01", "2020-05-01"),
+    ]
+    assert cache._missing_intervals(covered, "2020-01-10", "2020-02-01") == []
+
+
+# ─── store ────────────────────────────────────────────────────────────────
+def test_append_then_read_by_key_and_date(store):
+    a, b = _key(0), _key(1)
+    _fill(store, a, "2020-01-01", "2020-01-11")
+    _fill(store, b, "2020-01-01", "2020-01-04", prefix="t")
+
+    both = store.read([a, b])
+    assert both.groupby("key").size().to_dict() == {a.digest: 10, b.digest: 3}
+    window = store.read([a], "2020-01-03", "2020-01-05")
+    assert window["date"].tolist() == ["2020-01-03", "2020-01-04", "2020-01-05"]
+    assert list(window.columns) == ["key", "id", "cs_cdf", "date", "null_flag"]
+
+
+def test_coverage_merges_appended_intervals(store):
+    key = _key(0)
+    _fill(store, key, "2020-01-01", "2020-02-01")
+    store.append([(key, _rows([]), [("2020-02-01", "2020-03-01")])])  # queried, no scenes
+    _fill(store, key, "2020-04-01", "2020-05-01")
+
+    assert store.coverage([key]) == {
+        key.digest: [("2020-01-01", "2020-03-01"), ("2020-04-01", "2020-05-01")]
+    }
+    assert store.coverage([_key(1)]) == {}
+
+
+def test_read_drops_duplicate_ids(store):
+    key = _key(0)
+    _fill(store, key, "2020-01-01", "2020-01-06")
+    _fill(store, key, "2020-01-03", "2020-01-08")
+
+    rows = store.read([key])
+    assert rows["id"].is_unique
+    assert len(rows) == 7
+    # the same answer from disk, bypassing the in-memory memo
+    assert cache.MetadataStore(store.root).read([key]).equals(rows)
+
+
+def test_compaction_merges_fragments_without_losing_data(store):
+    key, other = _key(0), _key(1)
+    for day in range(1, 6):
+        _fill(store, key, f"2020-01-{day:02d}", f"2020-01-{day + 2:02d}")
+    _fill(store, other)
+    before = store.read([key, other])
+
+    store.compact()
+
+    for dataset in ("metadata", "coverage"):
+        assert len(list((store.root / dataset / key.partition).glob("*.parquet"))) == 1
+    assert store.read([key, other]).equals(before)
+    assert store.coverage([key]) == {key.digest: [("2020-01-01", "2020-01-07")]}
+    assert _stored_rows(store, key.partition) == 6 + 3
+
+
+def test_cloud_table_round_trip_through_the_cache(tmp_path, monkeypatch):
+    from cubexpress import cloud_utils
+
+    monkeypatch.setattr(cache, "_STORE", cache.MetadataStore(tmp_path / "cache"))
+    queried = []
+
+    def fake_query(lon, lat, edge_size, start, end):
+        queried.append((start, end))
+        dates = pd.date_range(start, end, freq="D", inclusive="left").strftime("%Y-%m-%d")
+        return _rows(dates).assign(cs_cdf=[0.2, 0.9] * (len(dates) // 2) + [0.2] * (len(dates) % 2))
+
+    monkeypatch.setattr(cloud_utils, "_cloud_table_single_range", fake_query)
+
+    def table(start, end, **kwargs):
+        return cloud_utils.s2_cloud_table(-76.5, -9.2, 64, start, end, cache=True, verbose=False, **kwargs)
+
+    first = table("2020-01-01", "2020-01-11")
+    second = table("2020-01-01", "2020-01-11", min_cscore=0.5)
+    third = table("2020-01-05", "2020-01-21")
+
+    assert queried == [("2020-01-01", "2020-01-11"), ("2020-01-11", "2020-01-21")]
+    assert len(first) == 10 and (second["cs_cdf"] >= 0.5).all() and len(second) == 5
+    assert third["date"].iloc[0] == "2020-01-05" and len(third) == 16
+    assert third.attrs["lon"] == -76.5
+    counters = cache._STORE.index.counters()
+    assert (counters["hits"], counters["misses"]) == (1, 2)
+
+def test_evict_drops_least_recently_used_first(store):
+    keys = [_key(i) for i in range(3)]
+    for key in keys:
+        _fill(store, key)
+    now = time.time()
+    for age, key in zip((10, 30, 20), keys):
+        _set_access(store, key.digest, now - age)
+
+    entries = store.index.entries().set_index("key")
+    budget = int(entries["bytes"].sum() - entries.loc[keys[1].digest, "bytes"])
+
+    assert store.evict(max_bytes=budget) == [keys[1].digest]
+    assert store.coverage(keys) == {
+        keys[0].digest: [("2020-01-01", "2020-01-04")],
+        keys[2].digest: [("2020-01-01", "2020-01-04")],
+    }
+    assert set(store.read(keys)["key"]) == {keys[0].digest, keys[2].digest}
+    assert store.index.counters()["evictions"] == 1
+
+
+def test_ttl_expires_entries_on_append_under_budget(store, monkeypatch):
+    monkeypatch.setattr(cache, "_TTL", 3600.0)
+    old, fresh, new = _key(0), _key(1), _key(2)
+    _fill(store, old)
+    _fill(store, fresh)
+    _set_access(store, old.digest, time.time() - 7200)
+
+    _fill(store, new)
+
+    assert set(store.index.entries()["key"]) == {fresh.digest, new.digest}
+    assert old.digest not in store.coverage([old, fresh])
+    assert store.read([old]).empty
+
+
+def test_compaction_between_fragment_and_index_write_keeps_sizes_exact(store, monkeypatch):
+    key = _key(0)
+    for month in (1, 2):
+        _fill(store, key, f"2020-{month:02d}-01", f"2020-{month + 1:02d}-01")
+    record_write = store.index.record_write
+    compactions = []
+
+    def racing_record_write(sizes):
+        # another thread compacts the partition right after the fragment is written
+        thread = threading.Thread(target=store.compact, args=(key.partition,))
+        thread.start()
+        thread.join(timeout=0.5)
+        compactions.append(thread)
+        record_write(sizes)
+
+    monkeypatch.setattr(store.index, "record_write", racing_record_write)
+    _fill(store, key, "2020-03-01", "2020-04-01")
+    compactions[0].join()
+
+    entry = store.index.entries().set_index("key").loc[key.digest]
+    assert entry["rows"] == _stored_rows(store, key.partition) == 91
+    assert abs(entry["bytes"] - _stored_bytes(store, key.partition)) <= 2
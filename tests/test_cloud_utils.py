@@ -0,0 +1,92 @@
+"""Tests of the batched cloud tables with the Earth Engine query stubbed out."""
+
+from __future__ import annotations
+
+import datetime as dt
+import threading
+
+import pandas as pd
+import pytest
+
+from cubexpress import cache, cloud_utils
+
+COLUMNS = ["site", "lon", "lat", "edge_size", "id", "cs_cdf", "date", "null_flag"]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Point the process-wide metadata store at a temporary folder."""
+    store = cache.MetadataStore(tmp_path / "cache")
+    monkeypatch.setattr(cache, "_STORE", store)
+    return store
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    """Stub the multi-site query: one scene per site and month.
+
+    Windows longer than 200 days fail with an Earth Engine timeout, as a large
+    collection would. Every window asked for is recorded in the returned list.
+    """
+    asked = []
+    lock = threading.Lock()
+
+    def fake_query(sites, edge_size, start, end):
+        with lock:
+            asked.append((start, end))
+        if (dt.date.fromisoformat(end) - dt.date.fromisoformat(start)).days > 200:
+            raise cloud_utils.ee.ee_exception.EEException("Computation timed out.")
+        dates = pd.date_range(start, end, freq="MS", inclusive="left").strftime("%Y-%m-%d")
+        return pd.DataFrame(
+            {
+                "row": [row for row in range(len(sites)) for _ in dates],
+                "id": [f"{d}_{row}" for row in range(len(sites)) for d in dates],
+                "cs_cdf": 0.9,
+                "date": [d for _ in range(len(sites)) for d in dates],
+                "null_flag": 0,
+            }
+        )
+
+    monkeypatch.setattr(cloud_utils, "_cloud_scores_multi_query", fake_query)
+    return asked
+
+
+def _points(n):
+    return pd.DataFrame(
+        {"site": [f"s{i}" for i in range(n)], "lon": [-76.5 + 0.01 * i for i in range(n)], "lat": -9.2}
+    )
+
+
+def test_empty_points_give_an_empty_long_table(windows):
+    result = cloud_utils.s2_cloud_tables(_points(0), 64, "2020-01-01", "2021-01-01", verbose=False)
+
+    assert result.empty and list(result.columns) == COLUMNS
+    assert result.attrs["edge_size"] == 64
+    assert windows == []
+
+
+def test_long_ranges_are_chunked_and_halved_on_limit_errors(windows):
+    result = cloud_utils.s2_cloud_tables(_points(2), 64, "2019-01-01", "2021-01-01", verbose=False)
+
+    # one window per year, each failing once and retried as two halves
+    assert sorted(windows) == [
+        ("2019-01-01", "2019-07-02"),
+        ("2019-01-01", "2020-01-01"),
+        ("2019-07-02", "2020-01-01"),
+        ("2020-01-01", "2020-07-02"),
+        ("2020-01-01", "2021-01-01"),
+        ("2020-07-02", "2021-01-01"),
+    ]
+    assert list(result.columns) == COLUMNS
+    for _, group in result.groupby("site"):
+        assert len(group) == 24 and group["date"].is_unique
+
+
+def test_cached_sites_are_not_queried_again(store, windows):
+    first = cloud_utils.s2_cloud_tables(_points(2), 64, "2020-01-01", "2020-06-01", cache=True, verbose=False)
+    asked = len(windows)
+    second = cloud_utils.s2_cloud_tables(_points(2), 64, "2020-01-01", "2020-06-01", cache=True, verbose=False)
+
+    assert len(windows) == asked
+    pd.testing.assert_frame_equal(first, second)
+    assert len(second) == 2 * 5
@@ -0,0 +1,112 @@
+"""Tests of :func:`cubexpress.cube.get_cube` outputs, without Earth Engine."""
+
+import numpy as np
+import pandas as pd
+
+from cubexpress import cube
+
+BANDS = ["B2", "B3", "B4"]
+
+
+def _image_table(n_days):
+    dates = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    table = pd.DataFrame(
+        {
+            "id": [f"{d:%Y%m%dT153621}_{d:%Y%m%dT153621}_T18LVN" for d in dates],
+            "cs_cdf": 0.9,
+            "date": dates.strftime("%Y-%m-%d"),
+        }
+    )
+    table.attrs.update(
+        lon=-76.5, lat=-9.2, edge_size=16, scale=10, bands=BANDS,
+        collection="COPERNICUS/S2_HARMONIZED",
+    )
+    return table
+
+
+def test_memmap_cube_leaves_failed_slots_as_nodata(tmp_path, monkeypatch):
+    table = _image_table(3)
+    slots = {f"{table.attrs['collection']}/{i}": slot for slot, i in enumerate(table["id"])}
+    failing = {1}
+    calls = []
+
+    def fake_get_array(manifest, out, nworks=4):
+        slot = slots[manifest["assetId"]]
+        calls.append(slot)
+        if slot in failing:
+            raise RuntimeError("download failed")
+        out[:] = slot
+        return True
+
+    monkeypatch.setattr(cube, "get_array", fake_get_array)
+
+    result = cube.get_cube(table, tmp_path, mosaic=False, verbose=False, output="memmap")
+
+    pixels = np.load(tmp_path / "cube.npy", mmap_mode="r")
+    assert pixels.shape == (3, 3, 16, 16)
+    assert (pixels[1] == 65535).all()
+    assert (pixels[0] == 0).all() and (pixels[2] == 2).all()
+    assert result["complete"].tolist() == [True, False, True]
+    assert pd.read_parquet(tmp_path / "cube.parquet")["complete"].tolist() == [True, False, True]
+    assert not list(tmp_path.glob("*.part"))
+
+    # only the failed slot is fetched again
+    failing.clear()
+    cube.get_cube(table, tmp_path, mosaic=False, verbose=False, output="memmap")
+    assert sorted(calls[3:]) == [1]
+    assert (np.load(tmp_path / "cube.npy")[1] == 1).all()
+
+
+def _fake_downloads(table, monkeypatch, interrupt_at=None):
+    """Patch get_array to fill each date with its position; return the call log."""
+    slots = {f"{table.attrs['collection']}/{i}": slot for slot, i in enumerate(table["id"])}
+    calls = []
+
+    def fake_get_array(manifest, out, nworks=4):
+        slot = slots[manifest["assetId"]]
+        calls.append(slot)
+        if slot == interrupt_at:
+            raise KeyboardInterrupt
+        out[:] = slot
+        return True
+
+    monkeypatch.setattr(cube, "get_array", fake_get_array)
+    return calls
+
+
+def test_zarr_space_chunks_are_written_once_per_batch(tmp_path, monkeypatch):
+    from cubexpress.zarrstore import ZarrStore
+
+    table = _image_table(5)
+    _fake_downloads(table, monkeypatch)
+    writes = []
+    write_chunk = ZarrStore._write_chunk
+    monkeypatch.setattr(
+        ZarrStore, "_write_chunk", lambda self, key, chunk: (writes.append(key), write_chunk(self, key, chunk))
+    )
+
+    result = cube.get_cube(table, tmp_path, mosaic=False, verbose=False, output="zarr", chunks="space")
+
+    assert sorted(writes) == sorted(set(writes))  # every shared chunk written once
+    assert result["complete"].all()
+    store = ZarrStore(tmp_path / "cube.zarr")
+    assert store.read_series(3, 7)[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+
+def test_zarr_dates_are_flagged_as_they_are_written(tmp_path, monkeypatch):
+    from cubexpress.zarrstore import ZarrStore
+
+    table = _image_table(4)
+    _fake_downloads(table, monkeypatch, interrupt_at=2)
+
+    try:
+        cube.get_cube(table, tmp_path, mosaic=False, nworks=1, verbose=False, output="zarr")
+    except KeyboardInterrupt:
+        pass
+
+    assert ZarrStore(tmp_path / "cube.zarr").index()["complete"].tolist() == [True, True, False, False]
+
+    calls = _fake_downloads(table, monkeypatch)
+    result = cube.get_cube(table, tmp_path, mosaic=False, nworks=1, verbose=False, output="zarr")
+    assert sorted(calls) == [2, 3]
+    assert result["complete"].all()
@@ -0,0 +1,116 @@
+"""Tests of the columnar :class:`cubexpress.geotyping.RequestSet`."""
+
+import numpy as np
+import pytest
+
+from cubexpress.geotyping import RequestSet
+
+# in GEOTRANSFORM_KEYS order: scaleX, shearX, translateX, scaleY, shearY, translateY
+GEOTRANSFORM = np.array([10.0, 0.0, 500000.0, -10.0, 0.0, 9000000.0])
+
+
+def _requests(n, prefix="r", validate="full"):
+    # ids follow the {date}_{site}_{cs_cdf} layout of table_to_requestset
+    return RequestSet.from_columns(
+        ids=[f"2020-01-{i + 1:02d}_{prefix}_90" for i in range(n)],
+        crs="EPSG:32718",
+        width=64,
+        height=64,
+        geotransform=GEOTRANSFORM,
+        images=[f"COPERNICUS/S2_HARMONIZED/{prefix}{i}" for i in range(n)],
+        bands=["B2", "B3", "B4"],
+        validate=validate,
+    )
+
+
+def _ids(requests):
+    return requests.to_frame(manifests=False)["id"].tolist()
+
+
+# ─── persistence ──────────────────────────────────────────────────────────
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+@pytest.mark.parametrize("level", ["full", "fast"])
+def test_round_trip_keeps_content_and_validation_level(tmp_path, fmt, level):
+    requests = _requests(3, validate=level)
+    path = tmp_path / f"requests.{fmt}"
+    getattr(requests, f"to_{fmt}")(path)
+
+    loaded = getattr(RequestSet, f"from_{fmt}")(path)
+    assert loaded.validation == level
+    assert _ids(loaded) == _ids(requests)
+    assert loaded.manifest(2) == requests.manifest(2)
+
+    # a trusted load stays trusted after another round trip
+    again = tmp_path / f"again.{fmt}"
+    getattr(loaded, f"to_{fmt}")(again)
+    assert getattr(RequestSet, f"from_{fmt}")(again).validation == level
+
+
+def test_trusted_load_still_checks_extended_ids(tmp_path):
+    _requests(3).to_parquet(tmp_path / "requests.parquet")
+    loaded = RequestSet.from_parquet(tmp_path / "requests.parquet")
+
+    with pytest.raises(ValueError, match="already present"):
+        loaded.extend(loaded[:1])
+
+
+# ─── selection and growth ─────────────────────────────────────────────────
+def test_getitem_take_and_filter_select_by_position():
+    requests = _requests(5)
+    ids = _ids(requests)
+
+    assert requests[1].id == ids[1]
+    assert _ids(requests[1:3]) == ids[1:3]
+    assert _ids(requests[[4, 0]]) == [ids[4], ids[0]]
+    assert _ids(requests.take([-1])) == [ids[-1]]
+    assert _ids(requests.filter([True, False, True, False, False])) == [ids[0], ids[2]]
+    assert _ids(requests[np.array([False, True, False, False, True])]) == [ids[1], ids[4]]
+    with pytest.raises(IndexError):
+        requests.take([5])
+    with pytest.raises(ValueError, match="unique"):
+        requests.take([0, 0])
+    with pytest.raises(ValueError, match="Mask"):
+        requests.filter([True])
+
+
+def test_take_slices_a_built_frame():
+    requests = _requests(4)
+    frame = requests.to_frame()
+
+    subset = requests.take([3, 1])
+    assert subset.to_frame()["id"].tolist() == frame["id"].iloc[[3, 1]].tolist()
+    assert subset.manifest(0) == requests.manifest(3)
+
+
+@pytest.mark.parametrize("level", ["full", "fast", "off"])
+def test_extend_appends_and_rejects_repeated_ids(level):
+    requests = _requests(2, validate=level)
+    requests.to_frame()  # the built frame is extended too
+
+    requests.extend(_requests(2, prefix="s"))
+    assert len(requests) == 4
+    assert requests.to_frame()["id"].tolist() == _ids(requests)
+
+    with pytest.raises(ValueError, match="already present"):
+        requests.extend(requests[:1])
+    new = _requests(1, prefix="t")[0]
+    with pytest.raises(ValueError, match="repeated"):
+        requests.extend([new, new])
+    assert len(requests) == 4
+
+
+def test_extend_accepts_request_objects():
+    requests = _requests(1)
+    requests.extend([_requests(1, prefix="s")[0]])
+    assert _ids(requests) == [_ids(_requests(1))[0], _ids(_requests(1, prefix="s"))[0]]
+
+
+def test_concat_joins_sets_and_rejects_shared_ids():
+    left, right = _requests(2), _requests(3, prefix="s")
+
+    joined = RequestSet.concat([left, right])
+    assert _ids(joined) == _ids(left) + _ids(right)
+    assert joined.validation == "full"
+    assert RequestSet.concat([left, _requests(1, prefix="t", validate="off")]).validation == "off"
+    with pytest.raises(ValueError, match="repeated"):
+        RequestSet.concat([left, left])
@@ -0,0 +1,14 @@
+"""Tests of the lazy top-level namespace."""
+
+import cubexpress
+
+
+def test_all_matches_lazy_exports():
+    assert sorted(cubexpress.__all__) == sorted(cubexpress._EXPORTS)
+
+
+def test_dir_lists_each_name_once():
+    cubexpress.lonlat2rt  # cached in the module globals from now on
+    names = dir(cubexpress)
+    assert len(names) == len(set(names))
+    assert set(cubexpress.__all__) <= set(names)
@@ -0,0 +1,42 @@
+"""Tests of :func:`cubexpress.request.table_to_requestset`."""
+
+import pandas as pd
+import pytest
+
+from cubexpress.request import table_to_requestset
+
+
+def _cloud_table():
+    dates = pd.date_range("2020-01-01", periods=6, freq="D")
+    table = pd.DataFrame(
+        {
+            "id": [f"{d:%Y%m%dT153621}_{d:%Y%m%dT153621}_T18LVN" for d in dates],
+            "cs_cdf": [0.1, 0.5, 0.2, 0.9, 0.4, 0.8],
+            "date": dates.strftime("%Y-%m-%d"),
+        }
+    )
+    table.attrs.update(
+        lon=-76.5,
+        lat=-9.2,
+        edge_size=64,
+        scale=10,
+        bands=["B2", "B3", "B4"],
+        collection="COPERNICUS/S2_HARMONIZED",
+    )
+    return table
+
+
+@pytest.mark.parametrize("mosaic", [False, True])
+def test_filtered_table_keeps_tiles_and_ids(mosaic):
+    table = _cloud_table()
+    filtered = table[table["cs_cdf"] > 0.3]  # index 1, 3, 4, 5
+
+    requests = table_to_requestset(filtered, mosaic=mosaic)
+    frame = requests.to_frame(manifests=False)
+
+    assert len(frame) == 4
+    assert frame["id"].notna().all()
+    assert frame["id"].str.contains("_18LVN_").all()
+    assert frame["id"].tolist() == table_to_requestset(
+        filtered.reset_index(drop=True), mosaic=mosaic
+    ).to_frame(manifests=False)["id"].tolist()
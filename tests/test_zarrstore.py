@@ -0,0 +1,26 @@
+"""Tests of the hand-written Zarr v2 store."""
+
+import json
+import math
+
+from cubexpress.zarrstore import ZarrStore
+
+
+def test_non_finite_scores_keep_attrs_valid_json(tmp_path):
+    store = ZarrStore.open(
+        tmp_path / "cube.zarr",
+        bands=["B2"],
+        height=4,
+        width=4,
+        crs="EPSG:32718",
+        transform=(10.0, 0.0, 0.0, 0.0, -10.0, 0.0),
+    )
+
+    store.register(["a", "b"], ["2020-01-01", "2020-01-02"], [0.5, math.nan])
+
+    def _reject(token):
+        raise AssertionError(f"non-standard JSON token {token}")
+
+    text = (tmp_path / "cube.zarr" / ".zattrs").read_text()
+    assert json.loads(text, parse_constant=_reject)["index"]["cs_cdf"] == [0.5, None]
+    assert math.isnan(store.index()["cs_cdf"][1])